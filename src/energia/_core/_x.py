@@ -75,6 +75,7 @@ class _X(ABC, _Hash):
         """Constraints"""
         # this gets the actual constraint objects from the program
         # based on the pname (attribute name) in the program
+        self.program.finalize()
         return [getattr(self.program, c) for c in self.constraints]
 
     @property
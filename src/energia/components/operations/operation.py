@@ -142,7 +142,7 @@ class Operation(_Component):
 
         if self not in self.capacity_aspect.bound_spaces:
             # ensure that the bound_spaces dict is initialized
-            self.capacity_aspect.bound_spaces[self] = {"ub": [], "lb": []}
+            self.capacity_aspect.bound_spaces[self] = {"ub": set(), "lb": set()}
 
         if space not in self.capacity_aspect.bound_spaces[self]["ub"]:
             # check if operational capacity has been bound
@@ -158,17 +158,15 @@ class Operation(_Component):
         """Check if operate is bounded in space"""
         if self not in self.operate_aspect.bound_spaces:
             # ensure that the bound_spaces dict is initialized
-            self.operate_aspect.bound_spaces[self] = {"ub": [], "lb": []}
+            self.operate_aspect.bound_spaces[self] = {"ub": set(), "lb": set()}
 
         if space not in self.operate_aspect.bound_spaces[self]["ub"]:
             # check if operate has been bound
             # if not just write opr_{pro, space, horizon} <= capacity_{pro, space, horizon}
 
-            if (
-                self in self.operate_aspect.dispositions
-                and space in self.operate_aspect.dispositions[self]
-            ):
-                time = min(self.operate_aspect.dispositions[self][space])
+            times = self.model.dispositions.times(self.operate_aspect, self, space)
+            if times:
+                time = min(times)
             else:
                 time = self.horizon
             _ = self.operate_sample(space, time) <= 1
@@ -185,21 +183,19 @@ class Operation(_Component):
             spaces = (self.model.network,)
 
         # get location, time tuples where operation is defined
-        space_times: list[tuple[Location | Linkage, Periods]] = []
+        # (ordered set, in the order the operation was sampled)
+        space_times: dict[tuple[Location | Linkage, Periods], None] = {}
         for space in spaces:
 
             self._check_capacity_bound(space)
 
             self._check_operate_bound(space)
 
-            # check if the process is being operated at the location
-            for d in self.operate_aspect.domains:
-                if d.space == space:
-                    space_time = (space, d.time)
-                    if space_time not in space_times:
-                        space_times.append(space_time)
+            # periods over which operations are sampled at the location
+            for time in self.model.dispositions.at(self.operate_aspect, space):
+                space_times[(space, time)] = None
 
-        self.write_primary_conversion(space_times)
+        self.write_primary_conversion(list(space_times))
 
         if self.construction is not None:
             self.write_construction(self.space_times)
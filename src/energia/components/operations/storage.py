@@ -175,6 +175,7 @@ class Storage(_Component):
         # This overwrites the Component cons property
         # this gets the actual constraint objects from the program
         # based on the pname (attribute name) in the program
+        self.program.finalize()
         return (
             [getattr(self.program, c) for c in self.constraints]
             + self.charge.cons
@@ -188,7 +189,7 @@ class Storage(_Component):
 
         if self not in self.capacity_aspect.bound_spaces:
             # ensure that the bound spaces dict exists
-            self.capacity_aspect.bound_spaces[self.stored] = {"ub": [], "lb": []}
+            self.capacity_aspect.bound_spaces[self.stored] = {"ub": set(), "lb": set()}
 
         if space not in self.capacity_aspect.bound_spaces[self.stored]["ub"]:
             # check if the storage capacity has been bound at that location
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from ...modeling.parameters.conversions import Production, Transportation
 from ...utils.decorators import timer
+from ..spatial.location import Location
 from .operation import Operation
 
 logger = logging.getLogger("energia")
@@ -14,7 +15,6 @@ logger = logging.getLogger("energia")
 if TYPE_CHECKING:
     # from ..commodities.resource import Resource
     from ..spatial.linkage import Linkage
-    from ..spatial.location import Location
     from ..temporal.periods import Periods
 
 
@@ -56,6 +56,8 @@ class Transport(Operation):
 
         Operation.__init__(self, *args, label=label, citations=citations, **kwargs)
         self.linkages: list[Linkage] = []
+        # linkages balanced, for quick lookups
+        self._linked: set[Linkage] = set()
 
         self.primary_conversion = Transportation(
             operation=self,
@@ -80,6 +82,23 @@ class Transport(Operation):
         """Locations at which the process is balanced"""
         return self.linkages
 
+    def locate(self, *spaces: Location | Linkage):
+        """
+        Locate the transport on linkages.
+        A location passed stands for all linkages leaving it
+
+        :param spaces: Linkages, or Locations to transport out of
+        :type spaces: Location | Linkage
+        """
+        linkages: list[Linkage] = []
+        for space in spaces:
+            if isinstance(space, Location):
+                linkages.extend(self.model.space.out_edges(space))
+            else:
+                linkages.append(space)
+
+        return Operation.locate(self, *linkages)
+
     @timer(logger, kind="production")
     def write_primary_conversion(self, space_times: list[tuple[Location, Periods]]):
         """Write the production constraints for the process"""
@@ -118,7 +137,7 @@ class Transport(Operation):
 
         for space, time in space_times:
 
-            if space in self.spaces:
+            if space in self._linked:
                 # if the process is already balanced for the space , Skip
                 continue
 
@@ -129,6 +148,7 @@ class Transport(Operation):
 
             # update the locations at which the process exists
             self.spaces.append(space)
+            self._linked.add(space)
             self.space_times.append((space, time))
 
         return self, self.spaces
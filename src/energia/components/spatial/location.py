@@ -29,6 +29,8 @@ class Location(_X):
     :type has: tuple[IsLocation]
     :param label: Label of the Location. Defaults to None.
     :type label: str, optional
+    :param coords: (latitude, longitude) of the Location. Defaults to None.
+    :type coords: tuple[float, float], optional
 
     :ivar model: Model to which the Location belongs.
     :vartype model: Model
@@ -51,10 +53,18 @@ class Location(_X):
     :vartype hierarchy: int, optional
     """
 
-    def __init__(self, *has: Self, label: str = "", citations: str = ""):
+    def __init__(
+        self,
+        *has: Self,
+        label: str = "",
+        citations: str = "",
+        coords: tuple[float, float] | None = None,
+    ):
 
         # the other locations contained in this location
         self.has: tuple[Self] = has
+        # geographic position, in degrees
+        self.coords: tuple[float, float] | None = coords
 
         _X.__init__(self, label=label, citations=citations)
 
@@ -160,13 +170,13 @@ class Location(_X):
 
     def sink(self):
         """Tells whether the location is a sink"""
-        if self in self.space.sinks:
+        if self.space.ins.get(self):
             return True
         return False
 
     def source(self):
         """Tells whether the location is a source"""
-        if self in self.space.sources:
+        if self.space.outs.get(self):
             return True
         return False
 
@@ -183,21 +193,11 @@ class Location(_X):
         :rtype: list[Linkage]
         """
         # this prints out all the links between the two locations
-        links = []
-        for link in self.space.linkages:
-            source, sink = False, False
-
-            if is_(self, link.source) and is_(location, link.sink):
-                source, sink = self, location
-
-            if is_(self, link.sink) and is_(location, link.source):
-                source, sink = location, self
-
-            if source and sink:
-                links.append(link)
-                if print_link:
-                    print(f"{source} is source and {sink} is sink in {link}")
-                continue
+        # in the order they were added
+        links = list(self.space.pairs.get(frozenset((self, location)), []))
+        if print_link:
+            for link in links:
+                print(f"{link.source} is source and {link.sink} is sink in {link}")
         return links
 
     def connected(self, location, print_link: bool = False) -> bool:
@@ -243,8 +243,7 @@ class Location(_X):
         # alternatively Model.Link can be used
         # for multiple links across the same two locations
         # declare Link() objects
-        links = self.links(location, print_link=False)
-        links = [link for link in links if link.source == self]
+        links = self.space.edges.get((self, location), [])
         if len(links) > 1:
             warn(
                 f"Multiple links found between ({self}, {location})\n"
@@ -0,0 +1,248 @@
+"""Time Series Aggregation"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from operator import is_
+from typing import TYPE_CHECKING
+
+import numpy as np
+from gana import I, V
+
+logger = logging.getLogger("energia")
+
+if TYPE_CHECKING:
+    from ...modeling.constraints.balance import Balance
+    from ...represent.ations.program import Program
+    from .periods import Periods
+
+
+@dataclass
+class Aggregation:
+    """
+    Representative periods (e.g. days) that stand in for the horizon
+
+    The horizon of n periods is clustered into k representative periods,
+    each of length (dense) periods. Representative periods follow one another
+    in the reduced horizon, and each is weighted by the number of periods it stands for.
+
+    :param periods: Dense periods of the representative periods, e.g. hours
+    :type periods: Periods
+    :param length: Number of dense periods in a representative period, e.g. 24
+    :type length: int
+    :param labels: Representative period (cluster) of each period of the horizon
+    :type labels: np.ndarray
+
+    :ivar k: Number of representative periods.
+    :vartype k: int
+    :ivar counts: Number of periods each representative period stands for.
+    :vartype counts: np.ndarray
+    :ivar linked: Inventory balances linked across periods, by name.
+    :vartype linked: set[str]
+
+    .. note::
+        - inventory is carried across the original sequence of periods,
+          as in Kotzur et al. (2018), through a level at the start of each period
+          and the change over its representative period
+    """
+
+    periods: Periods
+    length: int
+    labels: np.ndarray
+
+    k: int = field(init=False)
+    counts: np.ndarray = field(init=False, repr=False)
+    linked: set[str] = field(init=False, repr=False, default_factory=set)
+
+    def __post_init__(self):
+        self.k = int(self.labels.max()) + 1
+        self.counts = np.bincount(self.labels, minlength=self.k)
+
+    @property
+    def size(self) -> int:
+        """Number of dense periods in the full horizon"""
+        return len(self.labels) * self.length
+
+    @property
+    def weights(self) -> list[float]:
+        """Weight of each dense period of the representative periods"""
+        return np.repeat(self.counts, self.length).astype(float).tolist()
+
+    def reduce(self, values: list) -> list:
+        """
+        Values over the full horizon, as values over the representative periods.
+        Each representative period takes the mean of the periods it stands for
+
+        :param values: a value per dense period of the full horizon
+        :type values: list
+
+        :returns: a value per dense period of the representative periods
+        :rtype: list
+        """
+        if len(values) != self.size or not all(
+            isinstance(v, (int, float)) for v in values
+        ):
+            return values
+
+        periods = np.asarray(values, dtype=float).reshape(-1, self.length)
+        means = np.zeros((self.k, self.length))
+        np.add.at(means, self.labels, periods)
+        means /= self.counts[:, None]
+        return means.ravel().tolist()
+
+    # -----------------------------------------------------
+    #                    Storage
+    # -----------------------------------------------------
+
+    def link(self, program: Program):
+        """
+        Links inventory across the periods of the horizon,
+        for inventory balances written over the representative periods
+
+        :param program: Program to write the constraints to
+        :type program: Program
+        """
+        balances = program.model.balances
+        for spaces in list(balances.values()):
+            for times in list(spaces.values()):
+                for balance in list(times.get(self.periods, [])):
+                    if (
+                        balance.aspect.name == "inventory"
+                        and getattr(balance, "_name", None)
+                        and balance._name not in self.linked
+                    ):
+                        self._link(program, balance)
+
+    def _link(self, program: Program, balance: Balance):
+        """
+        Within a representative period, inventory starts from a free level (start).
+        Across the horizon, the level at the start of period n is carried:
+            level[n+1] = level[n] + inventory[end of c] - start[c], c = labels[n]
+        and bounded with the lowest and highest inventory of c
+
+        :param program: Program to write the constraints to
+        :type program: Program
+        :param balance: Inventory balance over the representative periods
+        :type balance: Balance
+        """
+        L, k, n_periods = self.length, self.k, len(self.labels)
+        name = balance._name
+        aspect = balance.aspect.name
+        index = balance.domain.I
+
+        if not is_(index[-1], self.periods.i):
+            return
+
+        self.linked.add(name)
+
+        inventory = getattr(program, aspect)(*index)
+        # bound on inventory, rewritten for the level across periods
+        bound = self._bound(inventory._[0])
+
+        # free start of each representative period, added to the balance
+        setattr(program, f"{aspect}_start", V(*index, nn=False, mutable=True))
+        start = getattr(program, f"{aspect}_start")(*index)
+        program.model.balances.add(name, (1, start))
+
+        # the start is only taken at the first period of each representative period
+        for c in range(k):
+            if L > 1:
+                setattr(
+                    program,
+                    f"{name}_start{c}",
+                    getattr(program, f"{aspect}_start")(
+                        *index[:-1], index[-1][c * L + 1 : (c + 1) * L]
+                    )
+                    == 0,
+                )
+
+        setattr(program, f"{name}_n", I(size=n_periods))
+        setattr(program, f"{name}_c", I(size=k))
+        setattr(
+            program,
+            f"{aspect}_level",
+            V(*index[:-1], getattr(program, f"{name}_n"), mutable=True),
+        )
+        setattr(
+            program,
+            f"{aspect}_low",
+            V(*index[:-1], getattr(program, f"{name}_c"), nn=False, mutable=True),
+        )
+        setattr(
+            program,
+            f"{aspect}_high",
+            V(*index[:-1], getattr(program, f"{name}_c"), nn=False, mutable=True),
+        )
+        level = getattr(program, f"{aspect}_level")(
+            *index[:-1], getattr(program, f"{name}_n")
+        )
+        low = getattr(program, f"{aspect}_low")(
+            *index[:-1], getattr(program, f"{name}_c")
+        )
+        high = getattr(program, f"{aspect}_high")(
+            *index[:-1], getattr(program, f"{name}_c")
+        )
+
+        def _start(c: int):
+            """Level before the first period of c, in the frame of c"""
+            first = c * L
+            if c == 0:
+                return start._[first]
+            return inventory._[first - 1] + start._[first]
+
+        for c in range(k):
+            for t in range(c * L, (c + 1) * L):
+                setattr(program, f"{name}_low{t}", inventory._[t] - low._[c] >= 0)
+                setattr(program, f"{name}_high{t}", inventory._[t] - high._[c] <= 0)
+
+        for n, c in enumerate(self.labels.tolist()):
+            after = (n + 1) % n_periods
+            setattr(
+                program,
+                f"{name}_link{n}",
+                level._[after] - level._[n] - inventory._[(c + 1) * L - 1] + _start(c)
+                == 0,
+            )
+            setattr(
+                program,
+                f"{name}_floor{n}",
+                level._[n] + low._[c] - _start(c) >= 0,
+            )
+            if bound is not None:
+                a, rest, B = bound
+                lhs = a * (level._[n] + high._[c] - _start(c))
+                for coefficient, v in rest:
+                    lhs = lhs + coefficient * v
+                setattr(program, f"{name}_ceiling{n}", lhs <= B)
+
+        logger.info(
+            "🔗  Inventory in %s linked across %d periods through %d representative periods",
+            name,
+            n_periods,
+            k,
+        )
+
+    @staticmethod
+    def _bound(v: V) -> tuple[float, list[tuple[float, V]], float] | None:
+        """
+        Upper bound on an inventory variable, e.g. inventory <= invcapacity
+
+        :returns: (coefficient of the variable, other terms, constant), None if unbound
+        """
+        for row in v.cons_by:
+            f = row.function
+            if (
+                not row.leq
+                or not f.P
+                or f.P[0] != v.n
+                or f.A[0] <= 0
+                or any(u.parent is v.parent for u in f.variables[1:])
+            ):
+                continue
+            return (
+                f.A[0],
+                list(zip(f.A[1:], f.variables[1:])),
+                f.B or 0.0,
+            )
+        return None
@@ -66,6 +66,7 @@ class Modes(_X):
         # overwrite X.cons property
         # this gets the actual constraint objects from the program
         # based on the pname (attribute name) in the program
+        self.program.finalize()
         if self.parent:
             return [getattr(self.program, c) for c in self.constraints]
         return list(
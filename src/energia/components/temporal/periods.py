@@ -11,7 +11,6 @@ from gana import I as Idx
 
 from ..._core._x import _X
 from ...modeling.parameters.value import Value
-from ...utils.dictionary import NotFoundError, compare
 from .lag import Lag
 
 if TYPE_CHECKING:
@@ -51,6 +50,8 @@ class Periods(_X):
     :vartype domains: list[Domain]
     :ivar aspects: Aspects associated with the Periods.
     :vartype aspects: dict[Aspect, list[Domain]]
+    :ivar weights: Weight of each period when summed up, e.g. representative days. Defaults to None.
+    :vartype weights: list[float] | None
     """
 
     def __init__(
@@ -84,6 +85,10 @@ class Periods(_X):
 
         self.modes: list[Modes] = []
 
+        # weights of periods when summed to sparser periods
+        # these are set for representative periods (see Time.aggregate)
+        self.weights: list[float] | None = None
+
         if self.of is not None and self.size:
             # self.tree = {self.of: self.of.tree}
             self.name = f"{self.size}{self.of}"
@@ -106,6 +111,7 @@ class Periods(_X):
     @property
     def cons(self) -> list[C]:
         """Constraints"""
+        self.program.finalize()
         return [getattr(self.program, c) for c in self.constraints]
 
     @property
@@ -154,24 +160,49 @@ class Periods(_X):
 
         return self.size * self.of.true_size
 
+    @cached_property
+    def ancestry(self) -> list[tuple[Periods, float]]:
+        """
+        Periods down the tree (self, self.of, self.of.of, ...),
+        with how many of each make this period
+        """
+        chain = [self]
+        while isinstance(chain[-1].of, Periods):
+            chain.append(chain[-1].of)
+
+        ancestry = []
+        for j, periods in enumerate(chain):
+            # multiplied in the order the tree is walked
+            n = 1
+            for above in reversed(chain[:j]):
+                n = above.size * n
+            ancestry.append((periods, n))
+        return ancestry
+
+    def down(self, of: Periods) -> float | None:
+        """How many of make this period, if of is down the tree, else None"""
+        for periods, n in self.ancestry:
+            if is_(periods, of):
+                return n
+        return None
+
     def howmany(self, of: Periods):
         """How many periods make this period"""
         try:
             return self._howmany[of]
         except KeyError:
-            try:
-                _return = compare(self.tree, of)
-            except NotFoundError:
-                try:
-                    _return = 1 / compare(of.tree, self)
-                except NotFoundError:
-                    try:
-                        _return = self.size / compare(of.tree, self.of)
-                    except NotFoundError:
-                        try:
-                            _return = compare(self.tree, of.of) / of.size
-                        except NotFoundError:
-                            raise ValueError(f"No common basis between {self} and {of}")
+            pass
+
+        if (n := self.down(of)) is not None:
+            _return = n
+        elif (n := of.down(self)) is not None:
+            _return = 1 / n
+        elif self.of is not None and (n := of.down(self.of)) is not None:
+            _return = self.size / n
+        elif of.of is not None and (n := self.down(of.of)) is not None:
+            _return = n / of.size
+        else:
+            raise ValueError(f"No common basis between {self} and {of}")
 
         self._howmany[of] = _return
         return _return
@@ -225,22 +256,22 @@ class Periods(_X):
 
     def __ge__(self, other: Self):
         if isinstance(other, Periods):
-            return self.time.horizon.howmany(self) <= self.time.horizon.howmany(other)
+            return self.time.count(self) <= self.time.count(other)
         raise NotImplementedError
 
     def __gt__(self, other: Self):
         if isinstance(other, Periods):
-            return self.time.horizon.howmany(self) < self.time.horizon.howmany(other)
+            return self.time.count(self) < self.time.count(other)
         raise NotImplementedError
 
     def __le__(self, other: Self):
         if isinstance(other, Periods):
-            return self.time.horizon.howmany(self) >= self.time.horizon.howmany(other)
+            return self.time.count(self) >= self.time.count(other)
         raise NotImplementedError
 
     def __lt__(self, other: Self):
         if isinstance(other, Periods):
-            return self.time.horizon.howmany(self) > self.time.horizon.howmany(other)
+            return self.time.count(self) > self.time.count(other)
         raise NotImplementedError
 
     def __getitem__(self, key: int | slice):
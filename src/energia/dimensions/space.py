@@ -1,10 +1,12 @@
 """Space"""
 
 from dataclasses import dataclass
+from typing import Iterator, Literal
 
 from .._core._dimension import _Dimension
 from ..components.spatial.linkage import Linkage
 from ..components.spatial.location import Location
+from ..utils.math import neighbours
 
 
 @dataclass
@@ -40,6 +42,20 @@ class Space(_Dimension):
     :vartype tree: dict
     :ivar hierarchy: position on tree.
     :vartype hierarchy: dict[int, list[Loc]]
+    :ivar parents: Location one hierarchy above, by location.
+    :vartype parents: dict[Loc, Loc]
+    :ivar children: Locations one hierarchy below, by location.
+    :vartype children: dict[Loc, list[Loc]]
+    :ivar descendants: All locations within, by location.
+    :vartype descendants: dict[Loc, list[Loc]]
+    :ivar outs: Linkages leaving, by source location.
+    :vartype outs: dict[Loc, list[Link]]
+    :ivar ins: Linkages arriving, by sink location.
+    :vartype ins: dict[Loc, list[Link]]
+    :ivar edges: Linkages from source to sink, by (source, sink).
+    :vartype edges: dict[tuple[Loc, Loc], list[Link]]
+    :ivar pairs: Linkages in either direction, by the two locations.
+    :vartype pairs: dict[frozenset[Loc], list[Link]]
 
 
     .. note::
@@ -47,6 +63,7 @@ class Space(_Dimension):
         - locations, sources, sinks, and linkages are populated as model is defined
         - label is fixed
         - default is set to None initially and is updated when needed (see network property)
+        - the tree is compiled once, and again only when locations or linkages are added
     """
 
     def __post_init__(self):
@@ -55,6 +72,19 @@ class Space(_Dimension):
         self.sinks: list[Location] = []
         self.linkages: list[Linkage] = []
 
+        # adjacency of locations, kept as linkages are added
+        self.outs: dict[Location, list[Linkage]] = {}
+        self.ins: dict[Location, list[Linkage]] = {}
+        self.edges: dict[tuple[Location, Location], list[Linkage]] = {}
+        self.pairs: dict[frozenset[Location], list[Linkage]] = {}
+
+        # spatial index, compiled from the tree
+        self.parents: dict[Location, Location] = {}
+        self.children: dict[Location, list[Location]] = {}
+        self.descendants: dict[Location, list[Location]] = {}
+        # number of locations and linkages when the tree was last compiled
+        self._compiled: tuple[int, int] = (0, 0)
+
         _Dimension.__post_init__(self)
 
     # -----------------------------------------------------
@@ -71,16 +101,132 @@ class Space(_Dimension):
 
         return tree_
 
+    def adjoin(self, link: Linkage):
+        """
+        Adds a linkage to the adjacency of its source and sink
+
+        :param link: Linkage being added to the model
+        :type link: Linkage
+        """
+        self.sources.append(link.source)
+        self.sinks.append(link.sink)
+        self.outs.setdefault(link.source, []).append(link)
+        self.ins.setdefault(link.sink, []).append(link)
+        self.edges.setdefault((link.source, link.sink), []).append(link)
+        self.pairs.setdefault(frozenset((link.source, link.sink)), []).append(link)
+
+    def connect(
+        self,
+        locations: list[Location] | None = None,
+        k: int | None = None,
+        radius: float | None = None,
+        metric: Literal["haversine", "euclidean"] = "haversine",
+        bi: bool = False,
+    ) -> list[Linkage]:
+        """
+        Links neighbouring locations, found from their coordinates,
+        the k nearest to each, those within a radius, or the k nearest within a radius.
+        Locations already linked are skipped
+
+        :param locations: Locations with coordinates. Defaults to all that have them.
+        :type locations: list[Location], optional
+        :param k: Number of nearest locations to link to each. Defaults to None.
+        :type k: int, optional
+        :param radius: Largest distance to link over (km for haversine). Defaults to None.
+        :type radius: float, optional
+        :param metric: haversine (coordinates are latitude, longitude) or euclidean.
+            Defaults to "haversine".
+        :type metric: Literal["haversine", "euclidean"], optional
+        :param bi: Whether the linkages are bidirectional. Defaults to False.
+        :type bi: bool, optional
+
+        :returns: the Linkages added, reverse linkages not included
+        :rtype: list[Linkage]
+        """
+        if locations is None:
+            locations = [loc for loc in self.locations if loc.coords is not None]
+
+        missing = [loc for loc in locations if loc.coords is None]
+        if missing:
+            raise ValueError(f"No coordinates given for {missing}")
+
+        if len(locations) < 2:
+            return []
+
+        pairs, distances = neighbours(
+            [loc.coords for loc in locations], k=k, radius=radius, metric=metric
+        )
+
+        sources, sinks, dists = [], [], []
+        for (i, j), dist in zip(pairs.tolist(), distances.tolist()):
+            source, sink = locations[i], locations[j]
+            if self.pairs.get(frozenset((source, sink))):
+                # already linked
+                continue
+            sources.append(source)
+            sinks.append(sink)
+            dists.append(dist)
+
+        return self.model.add_links(sources, sinks, dist=dists, bi=bi)
+
+    def out_edges(self, loc: Location) -> Iterator[Linkage]:
+        """Linkages leaving a location"""
+        yield from self.outs.get(loc, [])
+
+    def in_edges(self, loc: Location) -> Iterator[Linkage]:
+        """Linkages arriving at a location"""
+        yield from self.ins.get(loc, [])
+
+    def compile(self):
+        """
+        Compiles the tree of locations: the network, the position of each
+        spatial component on the tree, and the parent, children and descendants
+        of each location.
+        Compiled again only when locations or linkages are added
+        """
+        if self._compiled == (len(self.locations), len(self.linkages)):
+            return
+
+        # the network may be made here, which adds a location
+        network = self._find_network()
+        network.update_hierarchy()
+
+        hierarchy_: dict[int, list[Location | Linkage]] = {}
+        for spc in self.s:
+            hierarchy_.setdefault(spc.hierarchy, []).append(spc)
+
+        parents: dict[Location, Location] = {}
+        descendants: dict[Location, list[Location]] = {}
+
+        def _walk(loc: Location) -> list[Location]:
+            """Records the parent of each location within, returns them all"""
+            within = []
+            # linkages can be within locations, but have none within
+            for child in getattr(loc, "has", ()):
+                parents[child] = loc
+                within.append(child)
+                within.extend(_walk(child))
+            descendants[loc] = within
+            return within
+
+        _walk(network)
+
+        children: dict[Location, list[Location]] = {}
+        for spc in self.s:
+            parent = parents.get(spc)
+            if parent is not None:
+                children.setdefault(parent, []).append(spc)
+
+        self._network = network
+        self._hierarchy = hierarchy_
+        self.parents, self.children, self.descendants = parents, children, descendants
+        self._compiled = (len(self.locations), len(self.linkages))
+
     @property
     def hierarchy(self) -> dict[int, list[Location]]:
         """gives position in tree"""
-        self.network.update_hierarchy()
-        hierarchy_ = {}
-        for spc in self.s:
-            if spc.hierarchy not in hierarchy_:
-                hierarchy_[spc.hierarchy] = []
-            hierarchy_[spc.hierarchy].append(spc)
-        return hierarchy_
+        self.compile()
+        return self._hierarchy
 
     # -----------------------------------------------------
     #                    Superlative
@@ -94,6 +240,12 @@ class Space(_Dimension):
         if not self.locations:
             return self.model._l0()
 
+        self.compile()
+        return self._network
+
+    def _find_network(self) -> Location:
+        """Finds (or makes) the network from the locations"""
+
         # if only one location is available, return it
         if len(self.locations) == 1:
             return self.locations[0]
@@ -119,22 +271,7 @@ class Space(_Dimension):
         """List of spatial components"""
         return self.locations + self.linkages
 
-    def split(self, loc: Location) -> tuple[list[Location], list[Location]]:
-        """Gives a list of locations at a higher and lower hierarchy than loc"""
-        hierarchy = self.hierarchy
-
-        loc_pos = loc.hierarchy
-
-        if loc_pos + 1 in hierarchy:
-            lower = [l for l in hierarchy[loc_pos + 1] if l in loc.has]
-        else:
-            lower = []
-
-        if loc_pos - 1 in hierarchy:
-            upper = [l for l in hierarchy[loc_pos - 1] if loc in l.has]
-
-            upper = upper[0] if upper else None
-        else:
-            upper = None
-
-        return lower, upper
+    def split(self, loc: Location) -> tuple[list[Location], Location | None]:
+        """Gives a list of locations at a lower hierarchy than loc, and the location above"""
+        self.compile()
+        return list(self.children.get(loc, [])), self.parents.get(loc)
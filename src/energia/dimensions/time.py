@@ -2,10 +2,15 @@
 
 import logging
 from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
 
 from .._core._dimension import _Dimension
+from ..components.temporal.aggregation import Aggregation
 from ..components.temporal.modes import Modes
 from ..components.temporal.periods import Periods
+from ..utils.math import cluster
 
 logger = logging.getLogger("energia")
 
@@ -26,6 +31,8 @@ class Time(_Dimension):
     :vartype periods: list[Periods]
     :ivar modes: List of modes. Defaults to [].
     :vartype modes: list[Modes]
+    :ivar aggregation: Representative periods, if the horizon is aggregated. Defaults to None.
+    :vartype aggregation: Aggregation | None
 
     .. note::
         - name is generated based on the Class and Model name
@@ -36,21 +43,71 @@ class Time(_Dimension):
     def __post_init__(self):
         self.periods: list[Periods] = []
         self.modes: list[Modes] = []
+        self.aggregation: Aggregation | None = None
+        # number of periods when the tree was last compiled
+        self._compiled: int = 0
         _Dimension.__post_init__(self)
 
     # -----------------------------------------------------
     #                    Helpers
     # -----------------------------------------------------
 
+    def compile(self):
+        """
+        Compiles the tree of periods: the sorted order,
+        the densest and sparsest periods, and how many of each make the horizon.
+        Compiled again only when periods are added
+        """
+        if self._compiled == len(self.periods):
+            return
+
+        densest = min(self.periods, key=lambda x: x.true_size)
+        sparsest = max(self.periods, key=lambda x: x.true_size)
+
+        for prd in self.periods:
+            # how many make the horizon, kept on the periods for comparisons
+            try:
+                prd._count = sparsest.howmany(prd)
+            except ValueError:
+                # no common basis with the horizon
+                prd._count = None
+
+        self._densest, self._sparsest = densest, sparsest
+        if all(prd._count is not None for prd in self.periods):
+            self._sorted = sorted(self.periods, key=lambda x: -x._count)
+            self._tree = {int(prd._count): prd for prd in self.periods}
+        else:
+            # ordered only when asked for, and raises as comparisons do
+            self._sorted = self._tree = None
+        self._compiled = len(self.periods)
+
+    def count(self, periods: Periods) -> float:
+        """How many periods make the horizon"""
+        if self.periods:
+            self.compile()
+            # only periods in the tree are counted when compiled
+            count = getattr(periods, "_count", None)
+            if count is not None:
+                return count
+        return self.horizon.howmany(periods)
+
     @property
     def tree(self) -> dict[int | float, Periods]:
         """Return the tree of periods"""
+        if self.periods:
+            self.compile()
+            if self._tree is not None:
+                return self._tree
         hrz = self.horizon
         return {int(hrz.howmany(prd)): prd for prd in self.periods}
 
     @property
     def sorted_periods(self) -> list[Periods]:
         """Sorted periods from densest to sparsest"""
+        if self.periods:
+            self.compile()
+            if self._sorted is not None:
+                return list(self._sorted)
         return sorted(self.periods)
 
     # -----------------------------------------------------
@@ -61,14 +118,16 @@ class Time(_Dimension):
     def densest(self) -> Periods:
         """The densest period"""
         if self.periods:
-            return min(self.periods, key=lambda x: x.true_size)
+            self.compile()
+            return self._densest
         return self.horizon
 
     @property
     def sparsest(self) -> Periods:
         """The sparsest period"""
         if self.periods:
-            return max(self.periods, key=lambda x: x.true_size)
+            self.compile()
+            return self._sparsest
         return self.horizon
 
     @property
@@ -99,3 +158,82 @@ class Time(_Dimension):
         periods = self.sorted_periods
         index = periods.index(period)
         return periods[:index], periods[index + 1 :]
+
+    # -----------------------------------------------------
+    #                    Aggregation
+    # -----------------------------------------------------
+
+    def aggregate(
+        self,
+        profiles: dict[str, list[float]],
+        k: int,
+        length: int = 24,
+        method: Literal["kmeans", "hierarchical"] = "kmeans",
+        names: tuple[str, str] = ("t1", "t0"),
+    ) -> Aggregation:
+        """
+        Clusters the periods (e.g. days) of the horizon into representative periods.
+        Periods are made for the representative periods, dense periods (e.g. hours)
+        weighted by the number of periods they stand for, and the reduced horizon.
+        Lists of values over the full horizon passed to binds after this
+        are reduced to the representative periods.
+        Inventory is linked across the full horizon.
+        Only the dense periods and the horizon are made,
+        periods nested between (or under) these can not be declared after
+
+        :param profiles: Values over the full horizon (e.g. 8760 hours), by name
+        :type profiles: dict[str, list[float]]
+        :param k: Number of representative periods
+        :type k: int
+        :param length: Dense periods in a period, e.g. 24 hours in a day. Defaults to 24.
+        :type length: int
+        :param method: kmeans or hierarchical (keeps chronology). Defaults to "kmeans".
+        :type method: Literal["kmeans", "hierarchical"]
+        :param names: Names of the dense periods and the horizon. Defaults to ("t1", "t0").
+        :type names: tuple[str, str]
+
+        :returns: the representative periods
+        :rtype: Aggregation
+
+        :raises ValueError: if periods have been declared, or the profiles do not split into periods
+        """
+        if self.periods:
+            raise ValueError(
+                f"{self.model} already has periods, aggregate before declaring any"
+            )
+
+        values = np.array([list(p) for p in profiles.values()], dtype=float)
+        if values.shape[1] % length:
+            raise ValueError(
+                f"Profiles of {values.shape[1]} values can not be split into periods of {length}"
+            )
+
+        # profiles are scaled alike, then the periods are clustered
+        scale = np.abs(values).max(axis=1, keepdims=True)
+        scale[scale == 0] = 1
+        features = np.hstack([p.reshape(-1, length) for p in values / scale])
+
+        labels = cluster(features, k, method)
+
+        setattr(self.model, names[0], Periods())
+        dense = self.periods[-1]
+        aggregation = Aggregation(dense, length, labels)
+        dense.weights = aggregation.weights
+        setattr(self.model, names[1], (aggregation.k * length) * dense)
+        # no periods can be declared after this
+        self.aggregation = aggregation
+
+        logger.info(
+            "🧩  %d periods of %s clustered (%s) into %d representative periods",
+            len(labels),
+            dense,
+            method,
+            self.aggregation.k,
+        )
+        return self.aggregation
+
+    def reduce(self, values: list) -> list:
+        """Values over the full horizon, reduced to the representative periods if aggregated"""
+        if self.aggregation is None or not isinstance(values, list):
+            return values
+        return self.aggregation.reduce(values)
@@ -36,8 +36,12 @@ def seattle_topeka():
         m.sandiego: {m.newyork: 2.5, m.chicago: 1.8, m.topeka: 1.4},
     }
 
-    for i, j in product([m.seattle, m.sandiego], [m.newyork, m.chicago, m.topeka]):
-        m.Link(i, j, dist=dist_dict[i][j])
+    pairs = list(product([m.seattle, m.sandiego], [m.newyork, m.chicago, m.topeka]))
+    m.add_links(
+        [i for i, _ in pairs],
+        [j for _, j in pairs],
+        dist=[dist_dict[i][j] for i, j in pairs],
+    )
 
     m.channel = Transport()
     _ = m.channel(m.r) == 1.0  # 100% efficient
@@ -14,8 +14,6 @@ from ...utils.decorators import timer
 logger = logging.getLogger("energia")
 
 if TYPE_CHECKING:
-    from gana.sets.constraint import C
-
     from ..._core._x import _X
     from ...components.spatial.linkage import Linkage
     from ...components.spatial.location import Location
@@ -37,8 +35,8 @@ class Balance(_Hash):
     :vartype model: Model
     :ivar program: The program to which the constraint belongs.
     :vartype program: Program
-    :ivar grb: The general resource balance dictionary.t
-    :vartype grb: dict[Commodity, dict[Location, dict[Periods, list[Aspect]]]]
+    :ivar balances: The general resource balance (GRB) ledger of the model.
+    :vartype balances: Balances
     """
 
     def __init__(self, aspect: Aspect, domain: Domain):
@@ -81,7 +79,7 @@ class Balance(_Hash):
 
         # -add aspect to GRB if not added already ----
 
-        return self._update_constraint(stored, getattr(self.program, self._name))
+        return self._update_constraint(stored)
 
     @cached_property
     def space(self) -> Location | Linkage | None:
@@ -175,18 +173,14 @@ class Balance(_Hash):
         return self.domain
 
     @timer(logger, "balance-update")
-    def _update_constraint(
-        self,
-        stored: bool,
-        cons_grb: C,
-    ) -> bool:
+    def _update_constraint(self, stored: bool) -> bool:
         """
         Updates an existing GRB constraint with the new aspect
+        The signed terms are collected and added to the constraint
+        (all at once) when the balances are emitted
 
         :param stored: If the commodity is stored
         :type stored: bool
-        :param cons_grb: The existing GRB constraint
-        :type cons_grb: C
 
         :returns: If the constraint was updated
         :rtype: bool
@@ -199,20 +193,15 @@ class Balance(_Hash):
             # if inventory is being add to GRB
             lagged_domain = self.domain.change({"lag": -1 * self.time, "periods": None})
 
-            setattr(
-                self.program,
+            self.balances.add(
                 self._name,
-                cons_grb + self(*lagged_domain).V() - self(*self.domain).V(),
+                (1, self(*lagged_domain).V().copy()),
+                (-1, self(*self.domain).V().copy()),
             )
         else:
-            setattr(
-                self.program,
+            self.balances.add(
                 self._name,
-                (
-                    cons_grb + self(*self.domain).V()
-                    if self.aspect.ispos
-                    else cons_grb - self(*self.domain).V()
-                ),
+                (1 if self.aspect.ispos else -1, self(*self.domain).V().copy()),
             )
 
         self._inform()
@@ -6,7 +6,10 @@ import logging
 from functools import cached_property
 from typing import TYPE_CHECKING
 
+from gana.sets.constraint import C
+
 from ...utils.decorators import timer
+from ...utils.functions import set_coefficient, set_constant
 # from ...components.temporal.modes import Modes
 from ...utils.math import normalize
 
@@ -14,11 +17,11 @@ logger = logging.getLogger("energia")
 
 if TYPE_CHECKING:
     from gana import P, V
-    from gana.sets.constraint import C
     from gana.sets.function import F
 
     from ..._core._component import _Component
     from ..._core._x import _X
+    from ..indices.domain import Domain
     from ..indices.sample import Sample
 
 
@@ -37,6 +40,8 @@ class Bind:
     :type eq: bool
     :param forall: If provided, the constraint is applied for all elements in this list
     :type forall: list[_X | _Component] | None
+    :param written: If True, the constraint has been written already, nothing is written
+    :type written: bool
 
     :ivar model: The model to which the component belongs.
     :vartype model: Model
@@ -69,6 +74,8 @@ class Bind:
         eq: bool = False,
         forall: list[_X | _Component] | None = None,
         parameter_name: str = "",
+        *,
+        written: bool = False,
     ):
         self.sample = sample
         self._parameter, self.parameter_name = parameter, parameter_name
@@ -77,6 +84,10 @@ class Bind:
 
         self._handshake()
 
+        if written:
+            # only to update the constraint (.rewrite)
+            return
+
         if self.forall:
             # if as set is passed
             # write the constraint 'for all' elements in it
@@ -127,9 +138,120 @@ class Bind:
         # returned for @timer
         return self.sample, self.rel
 
+    @classmethod
+    def existing(
+        cls,
+        sample: Sample,
+        parameter: float | list[float],
+        rel: str,
+    ) -> Bind:
+        """
+        A Bind over a constraint that has been written,
+        nothing is written, use .rewrite to update the constraint
+
+        :param sample: The sample variable that was bound
+        :type sample: Sample
+        :param parameter: The new parameter
+        :type parameter: float | list[float]
+        :param rel: Kind of bind, one of ub, lb, eq, calc, inc_calc
+        :type rel: str
+        """
+        return cls(
+            sample,
+            parameter,
+            leq=rel == "ub",
+            geq=rel == "lb",
+            eq=rel in ("eq", "calc", "inc_calc"),
+            written=True,
+        )
+
+    def changes(self) -> list[tuple[C, float | None, float | None]]:
+        """
+        New values of the rows of the constraint that has been written,
+        nothing is changed.
+        Rows read sum(A x) <= B, with the sample variable first,
+        the parameter is either the constant (v <= p)
+        or the coefficient of the second variable (v <= p * x),
+        as recorded on the aspect when the constraint was written
+
+        :returns: (row, B, coefficient of the second variable), None if it stays
+        :rtype: list[tuple[C, float | None, float | None]]
+
+        :raises ValueError: if the sample has no such bind, the values do not fit,
+            or the coefficient was zero when written
+        """
+        # resolves the domain, as when written
+        _ = self.lhs
+
+        cons = getattr(self.program, self.cons_name, None)
+        if not isinstance(cons, C):
+            raise ValueError(f"{self.sample} has no {self.rel} bind to update")
+
+        parameter = self.parameter
+        if self.of and self.aspect.use_multiplier:
+            parameter = (
+                [p * self.domain.space.multiplier for p in parameter]
+                if isinstance(parameter, list)
+                else parameter * self.domain.space.multiplier
+            )
+        if not isinstance(parameter, list):
+            parameter = [parameter] * len(cons._)
+
+        if len(parameter) != len(cons._):
+            raise ValueError(
+                f"{self.cons_name} has {len(cons._)} rows, {len(parameter)} values given",
+            )
+
+        coefficient = self.cons_name in self.aspect.coefficients
+
+        changes = []
+        for row, p in zip(cons._, parameter):
+            if isinstance(p, tuple):
+                raise ValueError("Parametric (theta) bounds can not be updated")
+            f = row.function
+            # the sample variable has a coefficient of 1, or -1 if flipped
+            if coefficient:
+                if len(f.P) < 2:
+                    # a zero coefficient drops the variable from the row
+                    raise ValueError(
+                        f"{row} was written with a zero coefficient, "
+                        "bind a nonzero value to be able to update it",
+                    )
+                changes.append((row, None, -f.A[0] * p))
+            else:
+                changes.append((row, f.A[0] * p, None))
+        return changes
+
+    @timer(logger, kind="rebind")
+    def rewrite(self):
+        """
+        Overwrites the parameter in the constraint that has been written,
+        and in the compiled forms of the program.
+        The constraint is not written again
+        """
+        changes = self.changes()
+
+        for row, B, a in changes:
+            if B is not None:
+                set_constant(row.function, B)
+            if a is not None:
+                # the parameter scales the second variable (v <= p * x)
+                set_coefficient(row.function, 1, a)
+
+        self.program.refresh([row for row, _, _ in changes])
+        self.model.scenario.update(self.sample, self.rel, self.parameter, replace=True)
+
+        # returned for @timer
+        return self.sample, self.rel
+
     @cached_property
     def parameter(self):
         """Parameter bound of the bind constraint"""
+        # values over the full horizon are reduced to the representative periods
+        return self.model.time.reduce(self._scaled())
+
+    def _scaled(self):
+        """Parameter, scaled by the nominal value if given"""
 
         if self.nominal:
             # if a nominal value for the self.parameter is passed
@@ -164,6 +286,21 @@ class Bind:
         # .X(), .Vb() need time and space
         return self.sample.V(self.parameter)
 
+    @property
+    def domain(self) -> Domain:
+        """Domain of the sample, which changes (not mutates) it as it is indexed"""
+        return self.sample.domain
+
+    @property
+    def scales(self) -> bool:
+        """Does the parameter scale a variable (v <= p * x), else it is the constant (v <= p)"""
+        return bool(
+            self.of
+            or self.aspect.bound
+            or self.report
+            or self.domain.modes is not None
+        )
+
     @property
     def rhs(self) -> V | F | P:
         """Right hand side of the bind constraint"""
@@ -300,7 +437,7 @@ class Bind:
             ) and not self.domain.modes:
                 return True
 
-            self.aspect.bound_spaces[self.domain.primary][self.rel].append(
+            self.aspect.bound_spaces[self.domain.primary][self.rel].add(
                 (self.domain.space, self.domain.time)
             )
         return False
@@ -320,6 +457,10 @@ class Bind:
         if self.cons_name not in self.aspect.constraints:
             self.aspect.constraints.append(self.cons_name)
 
+        # and what the parameter is in it, to update it later
+        if self.scales:
+            self.aspect.coefficients.add(self.cons_name)
+
         # let all objects in the domain know that
         # a constraint with this name contains it
         self.domain.inform_indices(self.cons_name)
@@ -332,7 +473,6 @@ class Bind:
         self.model = self.sample.model
         self.nominal = self.sample.nominal
         self.norm = self.sample.norm
-        self.domain = self.sample.domain
         self.aspect = self.sample.aspect
         self.report = self.sample.report
         self.program = self.sample.program
@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING
 from gana import sigma
 
 from ...utils.decorators import timer
+from ...utils.functions import weigh
 
 logger = logging.getLogger("energia")
 
@@ -106,6 +107,12 @@ class Map:
         v_lower = self(*to_domain).X() if self.reporting else self(*to_domain).V()
 
         if not tsum and not msum and exists:
+            if self.model.defer_maps:
+                # the parent sum is updated once, with all children, on finalize
+                self.model.mappings.add(self.cons_name, self.rhs(from_domain))
+                self._inform(from_domain)
+                return (self.aspect, from_domain, to_domain)
+
             cons_existing: C = getattr(self.program, self.cons_name)
             setattr(
                 self.program,
@@ -333,7 +340,11 @@ class Map:
             # if the domain has been mapped to but this is a time sum
             # we need to first map time
             # and then add it to an existing map at a lower domain
-            return sigma(v(*domain.I), domain.time.i)
+            _sum = sigma(v(*domain.I), domain.time.i)
+            if domain.time.weights:
+                # e.g. representative days stand for many days
+                weigh(_sum, domain.time.weights)
+            return _sum
         if msum:
             # if the domain has been mapped to but this is a mode sum
             # we need to first map modes
@@ -376,3 +387,4 @@ class Map:
 
     def __call__(self, *index: _X):
         return self.aspect(*index)
+
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import FrozenInstanceError, dataclass, field
 from functools import cached_property
 from operator import is_, is_not
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, ClassVar, Self
+from weakref import WeakValueDictionary
 
 from ..._core._hash import _Hash
 
@@ -68,6 +69,10 @@ class Domain(_Hash):
     :ivar model: Model to which the Domain belongs.
     :vartype model: Model
 
+    .. note::
+        - Domains made through ``intern`` (and thus ``change``) are shared
+          between identical arguments, and are frozen. ``change`` or ``copy`` them.
+        - Mutating a Domain that is not shared clears its cached indices.
     """
 
     # the reason I keep these individual
@@ -96,6 +101,18 @@ class Domain(_Hash):
     # These can be summed over
     samples: list[Sample] = field(default_factory=list)
 
+    # Domains shared between identical arguments
+    _interned: ClassVar[WeakValueDictionary[tuple, Domain]] = WeakValueDictionary()
+    # indices computed once per instance, cleared if the Domain is mutated
+    _cached: ClassVar[tuple[str, ...]] = (
+        "name",
+        "key",
+        "idxname",
+        "index",
+        "index_primary",
+        "tree",
+    )
+
     def __post_init__(self):
         # Domains are structured something like this:
         # (primary_component ...aspect_n, secondary_component_n....,decision-makers, space, time
@@ -108,6 +125,53 @@ class Domain(_Hash):
         # primary index being modeled in some spatiotemporal context
         self.model: Model = next((i.model for i in self.index_short if i), None)
 
+    def __setattr__(self, name: str, value):
+        if name in self.__dataclass_fields__ and name in self.__dict__:
+            if "_ikey" in self.__dict__:
+                # shared by every sample made with the same arguments
+                raise FrozenInstanceError(
+                    f"Domain {self} is shared, use change or copy to set {name}",
+                )
+            # the domain is being changed in place
+            for attr in self._cached:
+                self.__dict__.pop(attr, None)
+        object.__setattr__(self, name, value)
+
+    @staticmethod
+    def identity(**args) -> tuple:
+        """
+        Identity of the components passed as arguments
+
+        Lags are made afresh when needed, so they are identified
+        by the periods they lag and by how much.
+        Samples are identified by the samples in the list, not the list
+        """
+        ikey = []
+        for attr, comp in args.items():
+            if comp is None:
+                continue
+            if attr == "lag":
+                ikey.append((attr, id(comp.of), comp.periods))
+            elif attr == "samples":
+                ikey.append((attr, tuple(id(sample) for sample in comp)))
+            else:
+                ikey.append((attr, id(comp)))
+        return tuple(sorted(ikey))
+
+    @classmethod
+    def intern(cls, **args) -> Self:
+        """
+        Gives the Domain made from the arguments,
+        made once and reused for identical arguments
+        """
+        ikey = cls.identity(**args)
+        domain = cls._interned.get(ikey)
+        if domain is None:
+            domain = cls(**args)
+            domain.__dict__["_ikey"] = ikey
+            cls._interned[ikey] = domain
+        return domain
+
     # @property
     # def I(self) -> tuple[Idx, ...]:
     #     """Compound index"""
@@ -213,12 +277,17 @@ class Domain(_Hash):
     #                    Naming
     # -----------------------------------------------------
 
-    @property
+    @cached_property
     def name(self):
         """Name"""
         return f"{tuple(self.index)}"
 
-    @property
+    @cached_property
+    def key(self) -> tuple[str, ...]:
+        """Canonical hashable key of the index"""
+        return tuple(str(i) for i in self.index)
+
+    @cached_property
     def idxname(self):
         """Name of the index"""
         return "_" + "_".join(f"{i}" for i in self.index)
@@ -227,23 +296,25 @@ class Domain(_Hash):
     #                    Dictionaries
     # -----------------------------------------------------
 
-    @property
-    def index(self) -> list[Aspect | _X]:
-        """list of _Index elements"""
-        return self.index_primary + self.index_binds + self.index_modes
+    @cached_property
+    def index(self) -> tuple[Aspect | _X, ...]:
+        """_Index elements, shared by all who ask, so a tuple"""
+        return (
+            self.index_primary + tuple(self.index_binds) + tuple(self.index_modes)
+        )
 
-    @property
+    @cached_property
     def index_primary(
         self,
-    ) -> list[Indicator | Commodity | Process | Storage | Transport]:
+    ) -> tuple[Indicator | Commodity | Process | Storage | Transport, ...]:
         """Primary index
 
-        :returns: list of primary indices
-        :rtype: list[X]
+        :returns: primary indices
+        :rtype: tuple[X, ...]
         """
-        return [self.primary] + [
+        return (self.primary,) + tuple(
             i for i in [self.space, self.periods, self.lag] if i is not None
-        ]
+        )
 
     @property
     def index_spatiotemporal(self) -> list[Aspect | _X]:
@@ -252,7 +323,7 @@ class Domain(_Hash):
         :returns: list of indices with modes
         :rtype: list[X]
         """
-        return self.index_primary[1:] + self.index_modes
+        return list(self.index_primary[1:]) + self.index_modes
 
     @property
     def index_binds(self) -> list[Aspect | _X]:
@@ -273,9 +344,9 @@ class Domain(_Hash):
         self,
     ) -> list[Indicator | Commodity | Process | Storage | Transport | Sample | Modes]:
         """Set of indices"""
-        return self.index_primary + self.samples + self.index_modes
+        return list(self.index_primary) + self.samples + self.index_modes
 
-    @property
+    @cached_property
     def tree(self) -> dict:
         """Convert index into tree"""
         tree = {}
@@ -438,12 +509,12 @@ class Domain(_Hash):
                     j.aspects[aspect].append(self)
 
     def copy(self) -> Self:
-        """Make a copy of self"""
+        """Make a copy of self, which can be mutated"""
         return Domain(**self.args)
 
     def change(self, what: dict[str, _X]) -> Self:
-        """Change some aspects and return a new Domain"""
-        return Domain(**{**self.args, **what})
+        """Change some aspects and return the (interned) Domain"""
+        return Domain.intern(**{**self.args, **what})
 
     # -----------------------------------------------------
     #                    Vector
@@ -506,7 +577,13 @@ class Domain(_Hash):
         for i, j in self._.items():
             # append if disposition is same but value is not
             if i in other._:
-                if is_not(other._[i], j):
+                if i == "samples":
+                    # samples are told apart by the samples in the list
+                    if len(j) != len(other._[i]) or any(
+                        is_not(a, b) for a, b in zip(j, other._[i])
+                    ):
+                        notcommon.append(i)
+                elif is_not(other._[i], j):
                     notcommon.append(i)
             else:
                 # append if disposition is not in other
@@ -526,6 +603,10 @@ class Domain(_Hash):
     # -----------------------------------------------------
 
     def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, Domain):
+            return self.key == other.key
         return self.name == str(other)
 
     def __lt__(self, other: Self) -> bool:
@@ -5,21 +5,22 @@ from __future__ import annotations
 import logging
 from functools import cached_property
 from itertools import chain
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Literal, Self
 
 from gana import I as Idx
 from gana import V, inf, sigma, sup
 
-from ...utils.dictionary import merge_trees
 from ..constraints.bind import Bind
 
 logger = logging.getLogger("energia")
 
 
 if TYPE_CHECKING:
+    import numpy as np
     from gana import P, Prg
     from gana.sets.constraint import C
     from gana.sets.function import F
+    from gana.sets.objective import O
 
     from ..._core._component import _Component
     from ..._core._x import _X
@@ -127,7 +128,7 @@ class Sample:
         return f"{self.domain.primary}.{self.aspect.name}"
 
     @property
-    def index(self) -> list[_Component]:
+    def index(self) -> tuple[_Component, ...]:
         """_Index"""
         return self.domain.index
 
@@ -173,6 +174,7 @@ class Sample:
         """Pretty print the component"""
         constraints = list(chain.from_iterable(i.constraints for i in self.index))
 
+        self.program.finalize()
         for c in constraints:
             if c in self.aspect.constraints:
                 cons: C = getattr(self.program, c)
@@ -186,20 +188,23 @@ class Sample:
             if isinstance(self.parameter, list):
                 # if list is given, find using length of the list
                 if self.domain.modes is not None:
-                    self.domain.periods = self.aspect.time.find(
+                    periods = self.aspect.time.find(
                         len(self.parameter) / len(self.domain.modes),
                     )
                 else:
-                    self.domain.periods = self.aspect.time.find(len(self.parameter))
+                    periods = self.aspect.time.find(len(self.parameter))
 
             elif isinstance(self.length, int):
                 # if length is given, use it directly
-                self.domain.periods = self.aspect.time.find(self.length)
+                periods = self.aspect.time.find(self.length)
             else:
                 # else the size of parameter set is exactly one
                 # or nothing is given, meaning the variable is not time dependent
                 # thus, index by horizon
-                self.domain.periods = self.aspect.horizon
+                periods = self.aspect.horizon
+
+            # domains are shared, so the domain is changed, not mutated
+            self.domain = self.domain.change({"periods": periods})
 
         return self.domain.periods
 
@@ -209,7 +214,7 @@ class Sample:
         if not self.spaced:
             # if spatial index is not explicity given
             # default to the network
-            self.domain.location = self.aspect.network
+            self.domain = self.domain.change({"location": self.aspect.network})
 
         return self.domain.location
 
@@ -218,19 +223,12 @@ class Sample:
         # with lag it is assumed that the variable of which this is a lagged subset is
         # already defined
         # for example, if opr_t = opr_t-1 + x_t, then opr_t is already defined
-        try:
-            return getattr(self.program, self.aspect.name)(*self.domain.I)
-
-        except AttributeError:
-            _ = self == True
-            return getattr(self.program, self.aspect.name)(*self.domain.I)
+        lag = self.domain.lag
+        domain = self.domain.change({"lag": None, "periods": lag.of})
 
-        except KeyError:
+        if domain.key not in self.aspect.declared["V"]:
             # the variable has not been defined yet
-            lag = self.domain.lag
-            self.domain = self.domain.change(
-                {"lag": None, "periods": self.domain.lag.of},
-            )
+            self.domain = domain
             args = (self.parameter, self.length)
 
             if self.hasinc:
@@ -243,7 +241,8 @@ class Sample:
                 _ = self.V(*args)
 
             self.domain = self.domain.change({"lag": lag, "periods": None})
-            return getattr(self.program, self.aspect.name)(*self.domain.I)
+
+        return getattr(self.program, self.aspect.name)(*self.domain.I)
 
     def _inform(self):
         """Informs the aspect and domain about the sample"""
@@ -251,6 +250,7 @@ class Sample:
         # we can be confident that the self.I is unique
         # because of the check above
         self.aspect.indices.append(self.I)
+        self.aspect.declared["V"].add(self.domain.key)
 
         # this updates the balanced dictionary, by adding the commodity as a key
 
@@ -265,12 +265,8 @@ class Sample:
 
         # ------Update the disposition ---------------
 
-        # get the primary component
-        # update the disposition dictionary
-        self.model.dispositions = merge_trees(
-            self.model.dispositions,
-            {self.aspect: self.domain.tree},
-        )
+        # graft the domain onto the disposition ledger (in place)
+        self.model.dispositions.add(self.aspect, self.domain)
         # for the same aspect, map variables with higher order indices
         # to variables with lower order indices
         self.aspect.update(self.domain)
@@ -285,9 +281,9 @@ class Sample:
 
         if self.domain.primary not in self.aspect.bound_spaces:
             self.aspect.bound_spaces[self.domain.primary] = {
-                "ub": [],
-                "lb": [],
-                "eq": [],
+                "ub": set(),
+                "lb": set(),
+                "eq": set(),
             }
 
         # Sample will figure these out if needed
@@ -332,13 +328,10 @@ class Sample:
         if self.domain.lag:
             return self.Vlag()
 
-        # the reason we check by string is that:
+        # the reason we check by key (names) is that:
         # some variables can serve as indices, a normal check ends by
         # creating a constraint variable == variable
-
-        # TODO: run this check for all V types.
-        # TODO: Will require separate aspect.indices lists
-        if str(self.I) not in [str(i) for i in self.aspect.indices]:
+        if self.domain.key not in self.aspect.declared["V"]:
 
             # if a variable has not been created for the self.I
             # create a variable
@@ -385,12 +378,15 @@ class Sample:
         else:
             ltx = self.aspect.name + r"^{inc}"
 
-        # create an incidental variable (continuous)
-        setattr(
-            self.program,
-            f"{self.aspect.name}_incidental",
-            V(*self.I, mutable=True, ltx=ltx),
-        )
+        if self.domain.key not in self.aspect.declared["Vinc"]:
+            # create an incidental variable (continuous)
+            setattr(
+                self.program,
+                f"{self.aspect.name}_incidental",
+                V(*self.I, mutable=True, ltx=ltx),
+            )
+            self.aspect.declared["Vinc"].add(self.domain.key)
+
         return getattr(self.program, f"{self.aspect.name}_incidental")(*self.I)
 
     def Vb(self) -> V:
@@ -417,10 +413,11 @@ class Sample:
         if bound_aspect not in self.model.dispositions:
             return 1
 
-        if (
-            self.domain.space
-            not in self.model.dispositions[bound_aspect][self.domain.primary]
-        ):
+        times = self.model.dispositions.times(
+            bound_aspect, self.domain.primary, self.domain.space
+        )
+
+        if not times:
 
             # if the bound variable has not been defined at the given space
             logger.info(
@@ -434,9 +431,6 @@ class Sample:
 
         else:
             # if the bound variable has been defined for the given space
-            times = self.model.dispositions[bound_aspect][self.domain.primary][
-                self.domain.space
-            ]
             time = max(list(times))
             if time >= self.domain.periods:
                 domain = self.domain.change({"periods": time})
@@ -475,17 +469,20 @@ class Sample:
             ltx = r"{\breve{" + self.aspect.latex + r"}}"
         else:
             ltx = r"{\breve{" + self.aspect.name + r"}}"
-        # create a binary variable
-        setattr(
-            self.program,
-            f"x_{self.aspect.name}",
-            V(
-                *self.I,
-                mutable=True,
-                ltx=ltx,
-                bnr=True,
-            ),
-        )
+        if self.domain.key not in self.aspect.declared["X"]:
+            # create a binary variable
+            setattr(
+                self.program,
+                f"x_{self.aspect.name}",
+                V(
+                    *self.I,
+                    mutable=True,
+                    ltx=ltx,
+                    bnr=True,
+                ),
+            )
+            self.aspect.declared["X"].add(self.domain.key)
+
         v_rpt = getattr(self.program, f"x_{self.aspect.name}")
         self.aspect.reporting = v_rpt
         return v_rpt(*self.I)
@@ -494,15 +491,29 @@ class Sample:
         """
         Set the sample itself as the objective
 
+        :param max: if maximization, defaults to False
+        :type max: bool, optional
+        """
+        if maximize:
+            setattr(self.program, f"max{self.aspect.name})", self.objective(maximize))
+        else:
+            setattr(self.program, f"min({self.aspect.name})", self.objective())
+
+        self.program.renumber()
+
+    def objective(self, maximize: bool = False) -> O:
+        """
+        The sample as an objective, not set on the program
+
         :param max: if maximization, defaults to False
         :type max: bool, optional
         """
         if not self.timed:
             # if the temporal index is not passed
-            self.domain.periods = self.model.horizon
+            self.domain = self.domain.change({"periods": self.model.horizon})
         if not self.spaced:
             # if the spatial index is not passed
-            self.domain.location = self.model.network
+            self.domain = self.domain.change({"location": self.model.network})
 
         # consider all of self.domain
         v = self.V()
@@ -523,22 +534,32 @@ class Sample:
                 _obj += sigma(v_inc)
 
         if maximize:
-            setattr(self.program, f"max{self.aspect.name})", sup(_obj))
-        else:
-            setattr(self.program, f"min({self.aspect.name})", inf(_obj))
+            return sup(_obj)
+        return inf(_obj)
 
-        self.program.renumber()
-
-    def opt(self, maximize: bool = False):
+    def opt(
+        self,
+        maximize: bool = False,
+        using: Literal["gurobi", "highs"] | None = None,
+        warm: bool | None = None,
+    ):
         """
         Optimize
 
         :param max: if maximization, defaults to False
         :type max: bool, optional
+        :param using: Solver backend. Defaults to None, which uses Model.solver.
+        :type using: Literal["gurobi", "highs"] | None, optional
+        :param warm: Warm start from the last solve. Defaults to None, which uses Model.warm.
+        :type warm: bool | None, optional
+
+        :returns: the program and the solver, False if no solution was found.
+            None if solved cold through gurobi, which gana does not report
+        :rtype: tuple[Program, str] | bool | None
         """
         self.obj(maximize)
         # optimize!
-        self.program.opt()
+        return self.program.opt(using=using, warm=warm)
 
     def bounds(self):
         """Finds the bounds of the variable"""
@@ -575,14 +596,38 @@ class Sample:
         """
         return self.V().output(aslist=aslist, asdict=asdict, compare=compare)
 
-    def eval(self, *values: float):
+    def eval(self, *values: float, n_sol: int = 0):
         """
         Evaluate the variable using parametric variable values
 
         :param values: values for the parametric variables
         :type values: float
+        :param n_sol: solution number, defaults to 0
+        :type n_sol: int, optional
+        """
+        if values not in self.program.evaluation.get(n_sol, {}):
+            # locates the critical region through the index of the solution
+            self.program.eval(*values, n_sol=n_sol)
+        return self.V().eval(*values, n_sol=n_sol)
+
+    def eval_many(
+        self, thetas: np.ndarray, n_sol: int = 0, workers: int = 1
+    ) -> np.ndarray:
         """
-        return self.V().eval(*values)
+        Evaluate the variable at many parametric variable values at once
+
+        :param thetas: values for the parametric variables, one point per row
+        :type thetas: np.ndarray
+        :param n_sol: solution number, defaults to 0
+        :type n_sol: int, optional
+        :param workers: number of processes to split the points across, defaults to 1
+        :type workers: int, optional
+
+        :returns: values of the variable, one row per point
+        :rtype: np.ndarray
+        """
+        x = self.program.eval_many(thetas, n_sol=n_sol, workers=workers)
+        return x[:, [v.n for v in self.V()._]]
 
     def forall(self, index) -> Self:
         """Returns the function at the given index"""
@@ -731,12 +776,25 @@ class FuncOfSamples:
         setattr(self.program, f"ge_{self.F.name}", func)
         return func
 
-    def opt(self, maximize=False):
+    def opt(
+        self,
+        maximize=False,
+        using: Literal["gurobi", "highs"] | None = None,
+        warm: bool | None = None,
+    ):
         """Optimize the function
 
         :param max: if maximization, defaults to False
         :type max: bool, optional
+        :param using: Solver backend. Defaults to None, which uses Model.solver.
+        :type using: Literal["gurobi", "highs"] | None, optional
+        :param warm: Warm start from the last solve. Defaults to None, which uses Model.warm.
+        :type warm: bool | None, optional
+
+        :returns: the program and the solver, False if no solution was found.
+            None if solved cold through gurobi, which gana does not report
+        :rtype: tuple[Program, str] | bool | None
         """
 
         setattr(self.program, f"min_{self.F.name}", inf(self.F))
-        self.program.opt()
+        return self.program.opt(using=using, warm=warm)
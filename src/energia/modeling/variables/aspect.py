@@ -82,9 +82,11 @@ class Aspect:
     :ivar indices: List of indices (Location, Periods) associated with the Aspect.
     :vartype indices: list[Location | Linkage, Periods]
     :ivar bound_spaces: Spaces where the Aspect has been already bound.
-    :vartype bound_spaces: dict[Commodity | Process | Storage | Transport, list[Location | Linkage]]
+    :vartype bound_spaces: dict[Commodity | Process | Storage | Transport, dict[str, set[tuple[Location | Linkage, Periods]]]]
     :ivar domains: List of domains associated with the Aspect.
     :vartype domains: list[Domain]
+    :ivar coefficients: Bind constraints in which the parameter scales a variable (v <= p * x), not the constant.
+    :vartype coefficients: set[str]
 
 
     :raises ValueError: If `primary_type` is not defined.
@@ -112,6 +114,13 @@ class Aspect:
             else:
                 self.label += " [-]"
         self.indices: list[Location | Linkage | Periods] = []
+        # keys of the domains over which each type of variable has been declared
+        # V (variable), Vinc (incidental), X (binary reporting)
+        self.declared: dict[str, set[tuple[str, ...]]] = {
+            "V": set(),
+            "Vinc": set(),
+            "X": set(),
+        }
 
         # # if a decision is bounded by another decision
         # self.bound: Self = None
@@ -119,7 +128,7 @@ class Aspect:
         # spaces where the aspect has been already bound
         self.bound_spaces: dict[
             Commodity | Process | Storage | Transport,
-            list[Location | Linkage],
+            dict[str, set[tuple[Location | Linkage, Periods]]],
         ] = {}
 
         # upper/lower/exact bounds are set on these locations/periods
@@ -136,6 +145,8 @@ class Aspect:
         self.reporting: Var | None = None
 
         self.constraints: list[str] = []
+        # bind constraints where the parameter is a coefficient (v <= p * x)
+        self.coefficients: set[str] = set()
 
         # this keeps track of whether GRB has already been added
         self.balances: dict[tuple[Idx, ...], bool] = {}
@@ -220,6 +231,7 @@ class Aspect:
     @property
     def cons(self) -> list[C]:
         """Constraints"""
+        self.program.finalize()
         return [getattr(self.program, c) for c in self.constraints]
 
     @property
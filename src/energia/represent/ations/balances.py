@@ -0,0 +1,81 @@
+"""Balances"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from gana.sets.constraint import C
+
+if TYPE_CHECKING:
+    from gana import V
+
+    from .program import Program
+
+
+class Balances(defaultdict):
+    """
+    Ledger of general resource balances (GRB).
+
+    Reads like the nested dictionary it replaces, i.e.
+    {commodity: {space: {time: [Balance, ...]}}}.
+    A GRB constraint is written when the first aspect is added.
+    The signed terms of the aspects added after are collected, and
+    the constraint is updated once, with all of them, when emitted.
+
+    :ivar pending: Signed terms yet to be written, keyed by the name of the GRB,
+        which is unique to (commodity, space, time).
+    :vartype pending: dict[str, list[tuple[int, V]]]
+    """
+
+    def __init__(self):
+        defaultdict.__init__(self, _spaces)
+        self.pending: dict[str, list[tuple[int, V]]] = {}
+
+    def __reduce__(self):
+        return (Balances, (), self.__dict__, None, iter(self.items()))
+
+    def add(self, name: str, *terms: tuple[int, V]):
+        """
+        Adds signed terms to a GRB
+
+        :param name: Name of the GRB constraint
+        :type name: str
+        :param terms: (sign, variable) pairs, sign is 1 or -1
+        :type terms: tuple[int, V]
+        """
+        self.pending.setdefault(name, []).extend(terms)
+
+    def emit(self, program: Program):
+        """
+        Adds the pending terms to the GRB constraints in the program,
+        each constraint is set once with all its terms
+
+        :param program: Program to write the constraints to
+        :type program: Program
+        """
+        pending, self.pending = self.pending, {}
+
+        for name, terms in pending.items():
+            cons_grb: C = getattr(program, name)
+            # terms are summed into the function,
+            # the constraint is made from it once
+            function = cons_grb.function
+            for sign, v in terms:
+                function = function + v if sign > 0 else function - v
+            setattr(
+                program,
+                name,
+                C(function=function, leq=cons_grb.leq, category=cons_grb.category),
+            )
+
+
+def _spaces() -> defaultdict:
+    """{space: {time: []}}"""
+    return defaultdict(_times)
+
+
+def _times() -> defaultdict:
+    """{time: []}"""
+    return defaultdict(list)
+
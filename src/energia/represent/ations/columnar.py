@@ -0,0 +1,283 @@
+"""Columnar"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from gana import I
+from pandas import DataFrame, read_parquet
+
+if TYPE_CHECKING:
+    from gana import V
+    from gana.block.solution import Solution
+
+# arrays written by to_npy, a file each
+ARRAYS = ("values", "solutions", "aspects", "n", "positions", "index")
+
+
+@dataclass
+class Columnar:
+    """
+    Solutions of a Model, stored column-wise
+
+    Every variable (entry) of every aspect has a column,
+    the entries of an aspect are contiguous.
+    Every solution has a row, values that a solution does not have are nan.
+
+    :param values: Values, a row per solution, a column per entry.
+    :type values: np.ndarray
+    :param solutions: Number of the solution in each row.
+    :type solutions: np.ndarray
+    :param aspects: Aspect of each entry.
+    :type aspects: np.ndarray
+    :param n: Number of the variable (in the program) of each entry.
+    :type n: np.ndarray
+    :param positions: Position of the variable in its aspect, of each entry.
+    :type positions: np.ndarray
+    :param index: Index of each entry, as JSON.
+    :type index: np.ndarray
+
+    :ivar spans: Columns of each aspect, as a slice.
+    :vartype spans: dict[str, slice]
+    """
+
+    values: np.ndarray
+    solutions: np.ndarray
+    aspects: np.ndarray
+    n: np.ndarray
+    positions: np.ndarray
+    index: np.ndarray
+
+    spans: dict[str, slice] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.spans = {}
+        for column, aspect in enumerate(self.aspects.tolist()):
+            start = self.spans[aspect].start if aspect in self.spans else column
+            self.spans[aspect] = slice(start, column + 1)
+
+    @classmethod
+    def gather(cls, solutions: dict[int, Solution]) -> Columnar:
+        """
+        Gathers the values of the solutions into columns
+
+        :param solutions: Solutions (gana) keyed by number
+        :type solutions: dict[int, Solution]
+        """
+        # an entry per (aspect, variable), in order of first appearance
+        entries: dict[str, dict[int, tuple[int, str]]] = {}
+        for solution in solutions.values():
+            for aspect, data in solution._.items():
+                columns = entries.setdefault(aspect, {})
+                for n, pos, idx in zip(data["n"], data["positions"], data["index"]):
+                    if n not in columns:
+                        columns[n] = (pos, json.dumps(idx))
+
+        aspects, n, positions, index = [], [], [], []
+        for aspect, columns in entries.items():
+            for _n, (pos, idx) in columns.items():
+                aspects.append(aspect)
+                n.append(_n)
+                positions.append(pos)
+                index.append(idx)
+
+        column = {key: c for c, key in enumerate(zip(aspects, n))}
+
+        values = np.full((len(solutions), len(column)), np.nan)
+        for row, solution in enumerate(solutions.values()):
+            for aspect, data in solution._.items():
+                for _n, val in zip(data["n"], data["values"]):
+                    if val is not None:
+                        values[row, column[(aspect, _n)]] = val
+
+        return cls(
+            values=values,
+            solutions=np.array(list(solutions), dtype=np.int64),
+            aspects=np.array(aspects, dtype=str),
+            n=np.array(n, dtype=np.int64),
+            positions=np.array(positions, dtype=np.int64),
+            index=np.array(index, dtype=str),
+        )
+
+    @classmethod
+    def of(
+        cls,
+        variables: list[V],
+        values: np.ndarray,
+        solutions: list[int],
+    ) -> Columnar:
+        """
+        Columns of the variables, from full solution vectors
+
+        :param variables: Variables of the program, in order of their number
+        :type variables: list[V]
+        :param values: Values, a row per solution, a column per variable (number)
+        :type values: np.ndarray
+        :param solutions: Number (or ID) of the solution in each row
+        :type solutions: list[int]
+        """
+        # entries of an aspect are kept together
+        grouped: dict[str, list[V]] = {}
+        for v in variables:
+            if v.parent is not None:
+                grouped.setdefault(v.parent.name, []).append(v)
+        ordered = [v for vs in grouped.values() for v in vs]
+
+        return cls(
+            values=values[:, [v.n for v in ordered]],
+            solutions=np.array(solutions, dtype=np.int64),
+            aspects=np.array([v.parent.name for v in ordered], dtype=str),
+            n=np.array([v.n for v in ordered], dtype=np.int64),
+            positions=np.array([v.pos for v in ordered], dtype=np.int64),
+            index=np.array(
+                [
+                    json.dumps(
+                        {
+                            idx.name: {
+                                par.name: pos for par, pos in zip(idx.parent, idx.pos)
+                            }
+                            for idx in v.index
+                            if isinstance(idx, I)
+                        },
+                    )
+                    for v in ordered
+                ],
+                dtype=str,
+            ),
+        )
+
+    def __call__(self, aspect: str) -> np.ndarray:
+        """
+        Values of an aspect, a row per solution
+
+        :param aspect: Name of the aspect
+        :type aspect: str
+        """
+        return self.values[:, self.spans[aspect]]
+
+    def __getitem__(self, n_sol: int) -> dict[str, dict[str, list]]:
+        """
+        A solution laid out as in Solution._ (gana)
+
+        :param n_sol: Number of the solution
+        :type n_sol: int
+        """
+        row = self.values[int(np.flatnonzero(self.solutions == n_sol)[0])]
+        return {
+            aspect: {
+                "positions": self.positions[span].tolist(),
+                "n": self.n[span].tolist(),
+                "values": row[span],
+                "index": [json.loads(idx) for idx in self.index[span]],
+            }
+            for aspect, span in self.spans.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.solutions)
+
+    # -----------------------------------------------------
+    #                    Writing
+    # -----------------------------------------------------
+
+    def to_npy(self, path: str):
+        """
+        Writes each array to a .npy file in a directory,
+        so that values can be memory-mapped
+
+        :param path: Directory to write to
+        :type path: str
+        """
+        os.makedirs(path, exist_ok=True)
+        for key in ARRAYS:
+            np.save(os.path.join(path, f"{key}.npy"), getattr(self, key))
+
+    def to_parquet(self, path: str):
+        """
+        Writes a table, a row per entry, a column per solution
+
+        :param path: File to write to
+        :type path: str
+        """
+        table = DataFrame(
+            {
+                "aspect": self.aspects,
+                "n": self.n,
+                "position": self.positions,
+                "index": self.index,
+            },
+        )
+        for row, n_sol in enumerate(self.solutions.tolist()):
+            table[str(n_sol)] = self.values[row]
+        table.to_parquet(path, index=False)
+
+    # -----------------------------------------------------
+    #                    Reading
+    # -----------------------------------------------------
+
+    @classmethod
+    def from_npy(cls, path: str, mmap: bool = True) -> Columnar:
+        """
+        Reads the arrays written by to_npy
+
+        :param path: Directory to read
+        :type path: str
+        :param mmap: Memory-map the values instead of reading them. Defaults to True.
+        :type mmap: bool
+        """
+        table = {
+            key: np.load(os.path.join(path, f"{key}.npy"))
+            for key in ARRAYS
+            if key != "values"
+        }
+        values = np.load(
+            os.path.join(path, "values.npy"),
+            mmap_mode="r" if mmap else None,
+        )
+        return cls(values=values, **table)
+
+    @classmethod
+    def from_parquet(cls, path: str, mmap: bool = True) -> Columnar:
+        """
+        Reads the table written by to_parquet
+
+        :param path: File to read
+        :type path: str
+        :param mmap: Memory-map the file while reading. Defaults to True.
+        :type mmap: bool
+        """
+        table = read_parquet(path, memory_map=mmap)
+        solutions = [
+            c for c in table.columns if c not in ("aspect", "n", "position", "index")
+        ]
+        return cls(
+            values=table[solutions].to_numpy(dtype=float).T,
+            solutions=np.array([int(s) for s in solutions], dtype=np.int64),
+            aspects=table["aspect"].to_numpy(dtype=str),
+            n=table["n"].to_numpy(dtype=np.int64),
+            positions=table["position"].to_numpy(dtype=np.int64),
+            index=table["index"].to_numpy(dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Columnar:
+        """
+        Reads solutions, a directory is read as .npy files,
+        else the format is told by the extension
+
+        :param path: Directory or file to read (.parquet)
+        :type path: str
+        :param mmap: Memory-map the values. Defaults to True.
+        :type mmap: bool
+        """
+        if os.path.isdir(path):
+            return cls.from_npy(path, mmap=mmap)
+        if path.endswith(".parquet"):
+            return cls.from_parquet(path, mmap=mmap)
+        raise ValueError(
+            f"Unknown format of {path}, expected a directory of .npy files or .parquet",
+        )
@@ -0,0 +1,118 @@
+"""Dispositions"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..._core._x import _X
+    from ...components.spatial.linkage import Linkage
+    from ...components.spatial.location import Location
+    from ...components.temporal.periods import Periods
+    from ...modeling.indices.domain import Domain
+    from ...modeling.variables.aspect import Aspect
+
+
+class Dispositions(dict):
+    """
+    Ledger of the dispositions at which aspects have been sampled.
+
+    Reads like the nested dictionary it replaces, i.e.
+    {aspect: {primary: {space: {time: {...}}}}}, but is updated in place
+    and keeps a flat index of the temporal nodes so that
+    (aspect, primary, space, time) lookups do not walk the tree.
+
+    :ivar spaces: Temporal nodes keyed by (aspect, primary, space).
+    :vartype spaces: dict[tuple[Aspect, _X, Location | Linkage], dict[Periods, dict]]
+    :ivar located: Periods sampled at a space, of any primary, keyed by (aspect, space).
+    :vartype located: dict[tuple[Aspect, Location | Linkage], dict[Periods, None]]
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.spaces: dict[tuple[Aspect, _X, Location | Linkage], dict] = {}
+        self.located: dict[tuple[Aspect, Location | Linkage], dict] = {}
+
+    def add(self, aspect: Aspect, domain: Domain):
+        """
+        Grafts the index of the domain under the aspect
+
+        :param aspect: Aspect that was sampled
+        :type aspect: Aspect
+        :param domain: Domain over which the aspect was sampled
+        :type domain: Domain
+        """
+        node = self.setdefault(aspect, {})
+        index = domain.index
+        for n, key in enumerate(index):
+            node = node.setdefault(key, {})
+            if n == 1:
+                # the node under the space holds the temporal indices
+                self.spaces[(aspect, index[0], key)] = node
+        # ordered set, periods in the order they were sampled
+        self.located.setdefault((aspect, domain.space), {})[domain.time] = None
+
+    def times(
+        self,
+        aspect: Aspect,
+        primary: _X,
+        space: Location | Linkage,
+    ) -> dict[Periods, dict]:
+        """
+        Periods over which the aspect of the primary has been sampled at the space
+
+        :param aspect: Aspect
+        :type aspect: Aspect
+        :param primary: Primary component
+        :type primary: _X
+        :param space: Location or Linkage
+        :type space: Location | Linkage
+
+        :returns: temporal node, empty if never sampled there
+        :rtype: dict[Periods, dict]
+        """
+        return self.spaces.get((aspect, primary, space), {})
+
+    def at(
+        self,
+        aspect: Aspect,
+        space: Location | Linkage,
+    ) -> list[Periods]:
+        """
+        Periods over which the aspect, of any primary, has been sampled at the space
+
+        :param aspect: Aspect
+        :type aspect: Aspect
+        :param space: Location or Linkage
+        :type space: Location | Linkage
+
+        :returns: periods in the order they were sampled, empty if never sampled there
+        :rtype: list[Periods]
+        """
+        return list(self.located.get((aspect, space), ()))
+
+    def has(
+        self,
+        aspect: Aspect,
+        primary: _X,
+        space: Location | Linkage,
+        time: Periods | None = None,
+    ) -> bool:
+        """
+        Checks if the aspect of the primary has been sampled at the space (and time)
+
+        :param aspect: Aspect
+        :type aspect: Aspect
+        :param primary: Primary component
+        :type primary: _X
+        :param space: Location or Linkage
+        :type space: Location | Linkage
+        :param time: Periods, any if not given. Defaults to None.
+        :type time: Periods | None, optional
+        """
+        times = self.spaces.get((aspect, primary, space))
+        if times is None:
+            return False
+        if time is None:
+            return True
+        return time in times
@@ -0,0 +1,57 @@
+"""Mappings"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from gana.sets.constraint import C
+
+if TYPE_CHECKING:
+    from gana import V
+
+    from .program import Program
+
+
+class Mappings(dict):
+    """
+    Ledger of deferred map (aggregation) constraints.
+
+    A map constraint is written when the first child domain is mapped to
+    the parent domain. The children mapped after are recorded here,
+    and each parent sum is updated once, with all its children, when emitted.
+
+    Reads as {constraint name: [V, ...]}.
+    """
+
+    def add(self, name: str, v: V):
+        """
+        Records a child to be subtracted from a map constraint
+
+        :param name: Name of the map constraint
+        :type name: str
+        :param v: Variable over the child domain
+        :type v: V
+        """
+        self.setdefault(name, []).append(v)
+
+    def emit(self, program: Program):
+        """
+        Subtracts the recorded children from the map constraints in the program,
+        each constraint is set once with all its children
+
+        :param program: Program to write the constraints to
+        :type program: Program
+        """
+        for name, vs in self.items():
+            cons_map: C = getattr(program, name)
+            # children are summed into the function,
+            # the constraint is made from it once
+            function = cons_map.function
+            for v in vs:
+                function = function - v
+            setattr(
+                program,
+                name,
+                C(function=function, leq=cons_map.leq, category=cons_map.category),
+            )
+        self.clear()
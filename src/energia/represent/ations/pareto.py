@@ -0,0 +1,154 @@
+"""Pareto"""
+
+from __future__ import annotations
+
+import logging
+from itertools import product
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pandas import DataFrame
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix, vstack
+
+from .sparse import Sparse
+from .workers import held, spawn
+
+logger = logging.getLogger("energia")
+
+if TYPE_CHECKING:
+    from ...modeling.indices.sample import Sample
+    from ...modeling.variables.aspect import Aspect
+    from ..model import Model
+
+
+def _solve(epsilon: np.ndarray) -> np.ndarray | None:
+    """
+    Minimizes the primary objective with the other objectives bounded by epsilon
+
+    :param epsilon: upper bounds on the secondary objectives
+    :type epsilon: np.ndarray
+
+    :returns: values of the variables, None if infeasible
+    :rtype: np.ndarray | None
+    """
+    c, A, row_lb, row_ub, lb, ub, integrality = held["compiled"]
+    n = len(epsilon)
+    result = milp(
+        c,
+        constraints=LinearConstraint(
+            A,
+            np.concatenate([row_lb, np.full(n, -np.inf)]),
+            np.concatenate([row_ub, epsilon]),
+        ),
+        bounds=Bounds(lb, ub),
+        integrality=integrality,
+    )
+    return result.x
+
+
+def pareto(
+    model: Model,
+    objectives: list[Sample],
+    points: int = 10,
+    outputs: list[Aspect] | None = None,
+    workers: int = 1,
+) -> DataFrame:
+    """
+    Generates the Pareto front using the epsilon-constraint method
+
+    The first objective is minimized, the others are bounded from above.
+    The bounds are spread evenly between the ideal and nadir values
+    read from the payoff table.
+    The program is solved in its sparse form using HiGHS.
+
+    :param model: Model to generate the front for
+    :type model: Model
+    :param objectives: Samples to minimize, e.g. [m.usd.spend, m.co2_vent.release]
+    :type objectives: list[Sample]
+    :param points: Number of epsilon values per secondary objective. Defaults to 10.
+    :type points: int
+    :param outputs: Aspects whose values are added to the frame. Defaults to None.
+    :type outputs: list[Aspect] | None
+    :param workers: Number of processes to solve the grid with. Defaults to 1 (serial).
+    :type workers: int
+
+    :returns: a row per feasible grid point, a column per objective and output
+    :rtype: DataFrame
+    """
+    if len(objectives) < 2:
+        raise ValueError("At least two objectives are needed for a Pareto front")
+
+    # objectives may declare variables, do this before compiling
+    _objectives = [sample.objective() for sample in objectives]
+    sparse = model.program.sparse()
+    n_columns = len(sparse.columns)
+    C = np.vstack([Sparse.objective(o, n_columns) for o in _objectives])
+
+    bounds = Bounds(sparse.lb, sparse.ub)
+    constraints = LinearConstraint(sparse.A, sparse.row_lb, sparse.row_ub)
+
+    # payoff table, the value of each objective (columns)
+    # when each objective (rows) is minimized
+    payoff = np.empty((len(C), len(C)))
+    for n, c in enumerate(C):
+        result = milp(
+            c,
+            constraints=constraints,
+            bounds=bounds,
+            integrality=sparse.integrality,
+        )
+        if result.x is None:
+            raise ValueError(
+                f"{objectives[n]} could not be minimized: {result.message}",
+            )
+        payoff[n] = C @ result.x
+
+    ideal, nadir = payoff.diagonal(), payoff.max(axis=0)
+    logger.info("🎯  Payoff table for %s computed", ", ".join(map(str, objectives)))
+
+    grid = [
+        np.array(epsilon)
+        for epsilon in product(
+            *[np.linspace(ideal[n], nadir[n], points) for n in range(1, len(C))],
+        )
+    ]
+
+    # the secondary objectives are added as rows, c @ x <= epsilon
+    compiled = (
+        C[0],
+        vstack([sparse.A, csr_matrix(C[1:])], format="csr"),
+        sparse.row_lb,
+        sparse.row_ub,
+        sparse.lb,
+        sparse.ub,
+        sparse.integrality,
+    )
+
+    with spawn(workers, {"compiled": compiled}) as pool:
+        if pool is None:
+            solutions = [_solve(epsilon) for epsilon in grid]
+        else:
+            solutions = list(pool.map(_solve, grid))
+
+    columns = {}
+    if outputs:
+        for aspect in outputs:
+            for v in getattr(model.program, aspect.name)._:
+                columns[v.longname] = v.n
+
+    rows = []
+    for x in solutions:
+        if x is None:
+            continue
+        row = dict(zip(map(str, objectives), C @ x))
+        row.update({name: x[n] for name, n in columns.items()})
+        rows.append(row)
+
+    logger.info(
+        "🎯  Pareto front with %d of %d points generated",
+        len(rows),
+        len(grid),
+    )
+
+    return DataFrame(rows)
@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
-from gana import I, Prg
+import numpy as np
+from gana import I, P, Prg, T, V
+from gana.sets.constraint import C
+from gana.sets.function import F
+from gurobipy import LinExpr
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from ...utils.decorators import timer
+from .regions import Regions
+from .rolling import rolling
+from .sparse import Sparse
+
+logger = logging.getLogger("energia")
 
 if TYPE_CHECKING:
+    from gurobipy import Model as GPModel
+    from ppopt.mplp_program import MPLP_Program
+
+    from ...components.temporal.periods import Periods
     from ..model import Model
 
 
@@ -57,9 +74,20 @@ class Program(Prg):
     :vartype streams: I
     :ivar consequences: Consequences index set
     :vartype consequences: I
+    :ivar growing: Members of component index sets, not yet in the index sets
+    :vartype growing: dict[str, list[str]]
+    :ivar stale: Component index sets set aside while they grow
+    :vartype stale: dict[str, I]
 
     .. note::
         - all the index sets are generated post initialization
+        - deferred constraints (general resource balances, map updates)
+          are written by finalize, which is called before the program is read whole
+        - compiled forms (sparse matrices, solver models) are kept until
+          a constraint or variable is set, so re-solving for a new objective is cheap
+        - component index sets (resources, processes, locations, ...) grow
+          as components are added, and are frozen into an index set (I)
+          when next read, or by finalize
     """
 
     model: Model = None
@@ -67,11 +95,407 @@ class Program(Prg):
     def __post_init__(self):
         Prg.__post_init__(self)
 
+        # compiled (solver) forms of the program
+        # kept until the constraints or variables change
+        self.cache: dict[str, Sparse | GPModel] = {}
+
+        # members of component index sets, appended as components are added
+        self.growing: dict[str, list[str]] = {}
+        # index sets that have grown, set aside so that reading them freezes them
+        self.stale: dict[str, I] = {}
+
         # Component Index Sets
         self.name = f"Program({self.model})"
 
+    def grow(self, collection: str, members: list[str]):
+        """
+        Appends members to a component index set,
+        the index set is updated once, when next read (or finalized)
+
+        :param collection: Name of the index set, e.g. processes
+        :type collection: str
+        :param members: Names of the elements
+        :type members: list[str]
+        """
+        if collection not in self.growing and collection in self.__dict__:
+            # off the instance, the next read goes through __getattr__ and freezes
+            self.stale[collection] = self.__dict__.pop(collection)
+        self.growing.setdefault(collection, []).extend(members)
+
+    def freeze(self, *collections: str):
+        """
+        Updates component index sets with the members grown since
+
+        :param collections: Names of the index sets, all that have grown if none given
+        :type collections: str
+        """
+        for collection in collections or list(self.growing):
+            members = self.growing.pop(collection, None)
+            if members is None:
+                continue
+            if collection in self.stale:
+                self.__dict__[collection] = self.stale.pop(collection)
+            index: I = getattr(self, collection)
+            # components have unique names, so the members are all new
+            setattr(
+                self,
+                collection,
+                index.birth_index(index.name, [*index.members, *members]),
+            )
+
+    def finalize(self):
+        """Writes the deferred constraints to the program"""
+        self.freeze()
+        if self.model.time.aggregation is not None:
+            # inventory across representative periods
+            self.model.time.aggregation.link(self)
+        self.model.balances.emit(self)
+        self.model.mappings.emit(self)
+
+    def cons(self, n: bool = False) -> list[int | C]:
+        self.finalize()
+        return Prg.cons(self, n)
+
+    def mps(self, name: str = None):
+        self.finalize()
+        return Prg.mps(self, name)
+
+    def ppopt(self) -> MPLP_Program:
+        self.finalize()
+        return Prg.ppopt(self)
+
+    def show(self, *args, **kwargs):
+        self.finalize()
+        return Prg.show(self, *args, **kwargs)
+
+    def latex(self, *args, **kwargs) -> str:
+        self.finalize()
+        return Prg.latex(self, *args, **kwargs)
+
+    def opt(
+        self,
+        using: Literal["gurobi", "highs"] | None = None,
+        warm: bool | None = None,
+    ):
+        """
+        Determine the optimal solution to the program
+
+        :param using: Solver backend, gurobi (through an MPS file) or
+            highs (through scipy, from the sparse form).
+            Defaults to None, which uses the solver set on the Model.
+        :type using: Literal["gurobi", "highs"] | None, optional
+        :param warm: If only the objective has changed since the last solve,
+            keep the solver model and warm start it. Defaults to None,
+            which uses the setting on the Model.
+        :type warm: bool | None, optional
+
+        :returns: the program and the solver, False if no solution was found.
+            None if solved cold through gurobi, which gana does not report
+        :rtype: tuple[Program, str] | bool | None
+        """
+        using = using or self.model.solver
+        warm = self.model.warm if warm is None else warm
+
+        if using == "highs":
+            return self.highs()
+
+        if warm and "gurobi" in self.cache:
+            return self.gurobi_warm()
+
+        result = Prg.opt(self, using=using)
+        if warm:
+            # keep the solver model for the next objective
+            self.cache["gurobi"] = self.formulation[self.n_formulation - 1]
+        return result
+
+    def sparse(self) -> Sparse:
+        """
+        The sparse form of the program, compiled only if the constraints
+        or variables have changed since it was last compiled.
+        The objective vector is always refreshed
+
+        :returns: objective, CSR constraint matrix, bounds and index maps
+        :rtype: Sparse
+        """
+        self.finalize()
+
+        if "sparse" not in self.cache:
+            self.cache["sparse"] = self.to_sparse()
+            return self.cache["sparse"]
+
+        sparse = self.cache["sparse"]
+        sparse.c = Sparse.objective(
+            self.objectives[-1] if self.objectives else None, len(sparse.columns)
+        )
+        return sparse
+
+    def refresh(self, rows: list[C]):
+        """
+        Updates rows whose coefficients or constant have changed
+        in the compiled forms kept from the last solve,
+        so that these need not be compiled (built) again
+
+        :param rows: Constraints (rows) that have changed
+        :type rows: list[C]
+        """
+        sparse: Sparse | None = self.cache.get("sparse")
+        gp: GPModel | None = self.cache.get("gurobi")
+
+        for row in rows:
+            matrix = {p: a for p, a in row.matrix.items() if p is not None}
+            B = row.B or 0.0
+
+            if sparse is not None and row.name in sparse.row_index:
+                r = sparse.row_index[row.name]
+                # only existing entries change, the structure is kept
+                for p, a in matrix.items():
+                    sparse.A[r, p] = a
+                sparse.row_ub[r] = B
+                if not row.leq:
+                    sparse.row_lb[r] = B
+
+            if gp is not None:
+                constr = gp.getConstrByName(row.mps())
+                if constr is None:
+                    continue
+                constr.RHS = B
+                for p, a in matrix.items():
+                    gp.chgCoeff(constr, gp.getVarByName(self.variables[p].mps()), a)
+
+    @timer(logger, kind="optimize")
+    def highs(self):
+        """
+        Solves the sparse form of the program using HiGHS (scipy.optimize.milp).
+        The solution is stored as it is for other solvers
+
+        :returns: the program and the solver, False if no solution was found
+        :rtype: tuple[Program, str] | bool
+        """
+        sparse = self.sparse()
+
+        result = milp(
+            sparse.c,
+            constraints=LinearConstraint(sparse.A, sparse.row_lb, sparse.row_ub),
+            bounds=Bounds(sparse.lb, sparse.ub),
+            integrality=sparse.integrality,
+        )
+
+        self.formulation[self.n_formulation] = sparse
+        self.n_formulation += 1
+
+        if result.x is None:
+            logger.warning("🛑 No solution found (%s). Check the model 🛑", result.message)
+            return False
+
+        # as with gurobi, only variables that feature in constraints
+        _variables = [v for v in self.variables if v.cons_by]
+        self._store([float(result.x[v.n]) for v in _variables], float(result.fun))
+
+        return self, "highs"
+
+    @timer(logger, kind="optimize")
+    def rolling(self, window: int, overlap: int = 0, periods: Periods | None = None):
+        """
+        Solves the sparse form of the program over a rolling horizon using HiGHS.
+        The stitched solution is stored as it is for other solvers
+
+        :param window: Periods in a window
+        :type window: int
+        :param overlap: Periods solved again by the next window. Defaults to 0.
+        :type overlap: int, optional
+        :param periods: Periods to roll over. Defaults to None, the densest periods.
+        :type periods: Periods | None, optional
+
+        :returns: the program and the solver, False if a window is infeasible
+        :rtype: tuple[Program, str] | bool
+        """
+        periods = periods or self.model.time.densest
+
+        solved = rolling(self, periods, window, overlap)
+        if solved is None:
+            return False
+
+        x, objective = solved
+        _variables = [v for v in self.variables if v.cons_by]
+        self._store([float(x[v.n]) for v in _variables], objective)
+
+        return self, f"highs (rolling over {periods}, window of {window})"
+
+    @timer(logger, kind="optimize")
+    def gurobi_warm(self):
+        """
+        Swaps the objective of the gurobipy model kept from the last solve
+        and re-optimizes it, starting from the previous basis (or incumbent)
+        """
+        gp = self.cache["gurobi"]
+        objective = self.objectives[-1]
+
+        columns = [gp.getVarByName(v.mps()) for v in objective.variables]
+        if any(col is None for col in columns):
+            # the objective has variables that feature in no constraint
+            # these are not in the model, build it again
+            self.cache.pop("gurobi")
+            return self.opt(using="gurobi", warm=True)
+
+        gp.setObjective(LinExpr(objective.C, columns))
+
+        self.formulation[self.n_formulation] = gp
+        self.n_formulation += 1
+
+        gp.optimize()
+
+        try:
+            values = [v.X for v in gp.getVars()]
+        except AttributeError:
+            logger.warning("🛑 No solution found. Check the model 🛑")
+            return False
+
+        self._store(values, gp.ObjVal)
+
+        return self, "gurobi (warm)"
+
+    def _store(self, values: list[float], objective: float):
+        """
+        Stores a solution, as gana does after a solve
+
+        :param values: values of the variables that feature in constraints
+        :type values: list[float]
+        :param objective: value of the objective
+        :type objective: float
+        """
+        self.X[self.n_solution] = values
+
+        _variables = [v for v in self.variables if v.cons_by]
+        for v, val in zip(_variables, values):
+            v.X[self.n_solution] = val
+
+        for c in self.constraint_sets:
+            c.function.solution(n_sol=self.n_solution)
+
+        self.objectives[-1].X = objective
+        self.optimized = True
+
+        self._birth_solution()
+
+    def regions(self, n_sol: int = 0) -> Regions:
+        """
+        Stacked critical regions of a multiparametric solution,
+        made once and kept with the solution
+
+        :param n_sol: solution number, defaults to 0
+        :type n_sol: int, optional
+        """
+        solution = self.solution[n_sol]
+        if not hasattr(solution, "regions"):
+            solution.regions = Regions(solution)
+        return solution.regions
+
+    def solve(self, using: str = "combinatorial", **kwargs):
+        """
+        Solves the multiparametric program and indexes
+        the critical regions of the solution for point location
+
+        :param using: ppopt algorithm. Defaults to "combinatorial".
+        :type using: str, optional
+        """
+        solution = super().solve(using=using, **kwargs)
+        if solution.critical_regions:
+            self.regions(self.n_solution - 1)
+        return solution
+
+    def eval(
+        self, *theta_vals: float, n_sol: int = 0, roundoff: int = 4
+    ) -> dict[V, float]:
+        """
+        Evaluates the variable values as a function of parametric variables,
+        the region is located through the index of the solution
+
+        :param theta_vals: values of the parametric variables
+        :type theta_vals: float
+        :param n_sol: solution number, defaults to 0
+        :type n_sol: int, optional
+        :param roundoff: round off the evaluated value, defaults to 4
+        :type roundoff: int, optional
+
+        :returns: value of each variable
+        :rtype: dict[V, float]
+
+        :raises ValueError: if the number of theta values does not match the number of thetas
+        :raises ValueError: if the point is in no critical region
+        """
+        if len(theta_vals) != self.n_thetas:
+            raise ValueError(
+                f"Problem has {self.n_thetas} thetas, provided {len(theta_vals)} values",
+            )
+
+        sol = self.regions(n_sol).evaluate_point(np.array(theta_vals, dtype=float))
+        if sol is None:
+            raise ValueError(f"{theta_vals} is in no critical region of solution {n_sol}")
+
+        sol = [round(float(val), roundoff) for val in sol]
+
+        self.evaluation.setdefault(n_sol, {})
+        self.n_evaluation.setdefault(n_sol, 0)
+        self.evaluation[n_sol][theta_vals] = sol
+        self.n_evaluation[n_sol] += 1
+
+        for n, v in enumerate(self.variables):
+            v.evaluation.setdefault(n_sol, {})[theta_vals] = sol[n]
+
+        return {v: sol[n] for n, v in enumerate(self.variables)}
+
+    def eval_many(
+        self, thetas: np.ndarray, n_sol: int = 0, workers: int = 1
+    ) -> np.ndarray:
+        """
+        Evaluates the multiparametric solution at many theta points at once
+
+        :param thetas: values of the parametric variables, one point per row
+        :type thetas: np.ndarray
+        :param n_sol: solution number, defaults to 0
+        :type n_sol: int, optional
+        :param workers: Number of processes to split the points across. Defaults to 1.
+        :type workers: int, optional
+
+        :returns: values of the variables, one row per point (nan if infeasible)
+        :rtype: np.ndarray
+
+        :raises ValueError: if the points do not have a value for each theta
+        """
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=float))
+        if thetas.shape[1] != self.n_thetas:
+            raise ValueError(
+                f"Problem has {self.n_thetas} thetas, provided {thetas.shape[1]} values",
+            )
+        return self.regions(n_sol).evaluate_many(thetas, workers=workers)
+
+    def to_sparse(self, categories: tuple[str, ...] | None = None) -> Sparse:
+        """
+        Compiles the program into sparse matrices
+
+        :param categories: Only compile constraints in these categories,
+            e.g. ("Binds", "Balance"). Defaults to None (all).
+        :type categories: tuple[str, ...] | None, optional
+
+        :returns: objective, CSR constraint matrix, bounds and index maps
+        :rtype: Sparse
+        """
+        return Sparse.compile(self, categories)
+
+    def __setattr__(self, name, value):
+        if isinstance(value, (V, P, T, F, C)):
+            # the constraints or variables change, the compiled forms are stale
+            # objectives (O) only swap the objective vector
+            self.__dict__["cache"] = {}
+        Prg.__setattr__(self, name, value)
+
     def __getattr__(self, item):
 
+        if item in self.__dict__.get("growing", ()):
+            # a component index set is read while stale
+            self.freeze(item)
+            return getattr(self, item)
+
         if item in self.model.ancestry:
             index = I(mutable=True)
             setattr(self, item, index)
@@ -0,0 +1,485 @@
+"""Regions"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+from scipy.optimize import linprog
+
+from .workers import held, spawn
+
+if TYPE_CHECKING:
+    from ppopt.solution import Solution as MPSolution
+
+
+class BoxTree:
+    """
+    Static bounding volume hierarchy over axis aligned boxes,
+    bulk loaded by splitting the boxes at the median of their centers
+    along the widest dimension, until a leaf holds a few boxes
+
+    A query only descends into nodes whose box meets the one queried,
+    so stabbing disjoint boxes with a point visits O(log n) nodes
+
+    :param lo: Lower corner of each box, one per row
+    :type lo: np.ndarray
+    :param hi: Upper corner of each box, one per row
+    :type hi: np.ndarray
+    :param leaf: Largest number of boxes in a leaf. Defaults to 8.
+    :type leaf: int
+
+    :ivar items: Boxes, ordered so that each node holds a contiguous range.
+    :vartype items: np.ndarray
+    :ivar visited: Number of nodes visited by the last query.
+    :vartype visited: int
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, leaf: int = 8):
+        self.lo, self.hi = lo, hi
+        n = len(lo)
+        self.items = np.arange(n)
+        self.visited = 0
+
+        # unbounded sides do not place a box, its bounded side does
+        lo_ = np.where(np.isfinite(lo), lo, np.where(np.isfinite(hi), hi, 0.0))
+        hi_ = np.where(np.isfinite(hi), hi, lo_)
+        centers = (lo_ + hi_) / 2
+
+        node_lo, node_hi, first, last, left, right = [], [], [], [], [], []
+        stack = (
+            [(0, n, self._node(node_lo, node_hi, first, last, left, right))]
+            if n
+            else []
+        )
+
+        while stack:
+            start, end, k = stack.pop()
+            segment = self.items[start:end]
+            node_lo[k], node_hi[k] = lo[segment].min(axis=0), hi[segment].max(axis=0)
+            first[k], last[k] = start, end
+
+            if end - start <= leaf:
+                continue
+
+            # split at the median along the widest spread of centers
+            dim = int(np.ptp(centers[segment], axis=0).argmax())
+            mid = (end - start) // 2
+            self.items[start:end] = segment[np.argpartition(centers[segment, dim], mid)]
+            left[k] = self._node(node_lo, node_hi, first, last, left, right)
+            right[k] = self._node(node_lo, node_hi, first, last, left, right)
+            stack.append((start, start + mid, left[k]))
+            stack.append((start + mid, end, right[k]))
+
+        n_t = lo.shape[1]
+        self.node_lo = np.array(node_lo).reshape(-1, n_t)
+        self.node_hi = np.array(node_hi).reshape(-1, n_t)
+        self.first, self.last = np.array(first, dtype=int), np.array(last, dtype=int)
+        self.left, self.right = np.array(left, dtype=int), np.array(right, dtype=int)
+
+    @staticmethod
+    def _node(*columns: list) -> int:
+        """Appends an empty node, a leaf until split"""
+        for column in columns:
+            column.append(-1)
+        return len(columns[0]) - 1
+
+    def query(self, lo: np.ndarray, hi: np.ndarray, tol: float = 0.0) -> np.ndarray:
+        """
+        Boxes that meet the box [lo, hi], a point if lo is hi
+
+        :param lo: Lower corner
+        :type lo: np.ndarray
+        :param hi: Upper corner
+        :type hi: np.ndarray
+        :param tol: Tolerance by which boxes are grown. Defaults to 0.
+        :type tol: float
+
+        :returns: the boxes, in ascending order
+        :rtype: np.ndarray
+        """
+        found = []
+        stack = [0] if len(self.node_lo) else []
+        self.visited = 0
+
+        while stack:
+            k = stack.pop()
+            self.visited += 1
+            if (self.node_lo[k] - tol > hi).any() or (lo > self.node_hi[k] + tol).any():
+                continue
+            if self.left[k] < 0:
+                boxes = self.items[self.first[k] : self.last[k]]
+                meets = np.all(
+                    (self.lo[boxes] - tol <= hi) & (lo <= self.hi[boxes] + tol),
+                    axis=1,
+                )
+                found.append(boxes[meets])
+            else:
+                stack.extend((self.left[k], self.right[k]))
+
+        if not found:
+            return np.empty(0, dtype=int)
+        return np.sort(np.concatenate(found))
+
+
+class Stacked(NamedTuple):
+    """
+    The arrays needed to locate and evaluate points,
+    all that a worker of the pool is given
+
+    :param E: Inequalities of all regions, stacked
+    :type E: np.ndarray
+    :param f: Right hand sides of all regions, stacked
+    :type f: np.ndarray
+    :param offsets: First row of each region in E and f, and the total last
+    :type offsets: np.ndarray
+    :param A: Slope of x(θ) in each region
+    :type A: list[np.ndarray]
+    :param b: Intercept of x(θ) in each region
+    :type b: list[np.ndarray]
+    :param fixations: (fixation, x indices, y indices) of binaries in each region, or None
+    :type fixations: list[tuple | None]
+    :param tree: Index over the bounding boxes of the regions
+    :type tree: BoxTree
+    :param tol: Tolerance for a point to be inside a region
+    :type tol: float
+    :param n_x: Number of variables
+    :type n_x: int
+    :param program: Multiparametric program, to pick between overlapping regions, else None
+    :type program: Any
+    """
+
+    E: np.ndarray
+    f: np.ndarray
+    offsets: np.ndarray
+    A: list[np.ndarray]
+    b: list[np.ndarray]
+    fixations: list[tuple | None]
+    tree: BoxTree
+    tol: float
+    n_x: int
+    program: Any
+
+
+def _x(stacked: Stacked, r: int, thetas: np.ndarray) -> np.ndarray:
+    """x(θ) = A θ + b in region r, one row per point"""
+    values = thetas @ stacked.A[r].T + stacked.b[r].ravel()
+    if stacked.fixations[r] is None:
+        return values
+    fixation, x_indices, y_indices = stacked.fixations[r]
+    x = np.zeros((len(thetas), stacked.n_x))
+    x[:, x_indices] = values
+    x[:, y_indices] = fixation.ravel()
+    return x
+
+
+def _best(stacked: Stacked, theta: np.ndarray, inside: np.ndarray) -> int:
+    """Of overlapping regions, the last with the best objective, as ppopt does"""
+    column = theta.reshape(-1, 1)
+    objectives = [
+        stacked.program.evaluate_objective(
+            _x(stacked, r, theta.reshape(1, -1)).reshape(-1, 1),
+            column,
+        )
+        for r in inside
+    ]
+    best = min(objectives)
+    return int([r for r, o in zip(inside, objectives) if o <= best][-1])
+
+
+def _within(stacked: Stacked, candidates: np.ndarray, thetas: np.ndarray) -> np.ndarray:
+    """Which of the candidate regions hold each point, a column per candidate"""
+    rows = np.concatenate(
+        [np.arange(stacked.offsets[r], stacked.offsets[r + 1]) for r in candidates],
+    )
+    satisfied = thetas @ stacked.E[rows].T - stacked.f[rows] < stacked.tol
+    # inside if all inequalities of the region hold
+    sizes = stacked.offsets[candidates + 1] - stacked.offsets[candidates]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    return np.logical_and.reduceat(satisfied, starts, axis=1)
+
+
+def locate(stacked: Stacked, thetas: np.ndarray, chunk: int) -> np.ndarray:
+    """
+    Finds the region containing each point.
+    Points are sorted along the first theta and taken a chunk at a time,
+    only the regions whose box meets the box of the chunk are checked
+
+    :param stacked: Stacked regions
+    :type stacked: Stacked
+    :param thetas: points, one per row
+    :type thetas: np.ndarray
+    :param chunk: Number of points located at a time
+    :type chunk: int
+
+    :returns: index of the region of each point, -1 if in none
+    :rtype: np.ndarray
+    """
+    located = np.full(len(thetas), -1)
+    if not stacked.A:
+        return located
+
+    order = np.argsort(thetas[:, 0], kind="stable")
+    for start in range(0, len(thetas), chunk):
+        at = order[start : start + chunk]
+        block = thetas[at]
+        candidates = stacked.tree.query(
+            block.min(axis=0),
+            block.max(axis=0),
+            stacked.tol,
+        )
+        if not len(candidates):
+            continue
+
+        inside = _within(stacked, candidates, block)
+        found = inside.any(axis=1)
+        # the first region holding the point, regions are in ascending order
+        regions = np.where(found, candidates[inside.argmax(axis=1)], -1)
+
+        if stacked.program is not None:
+            # overlapping regions, the best objective decides
+            for n in np.flatnonzero(inside.sum(axis=1) > 1):
+                regions[n] = _best(stacked, block[n], candidates[inside[n]])
+
+        located[at] = regions
+
+    return located
+
+
+def evaluate(stacked: Stacked, thetas: np.ndarray, chunk: int) -> np.ndarray:
+    """
+    Evaluates the affine solution at each point
+
+    :param stacked: Stacked regions
+    :type stacked: Stacked
+    :param thetas: points, one per row
+    :type thetas: np.ndarray
+    :param chunk: Number of points located at a time
+    :type chunk: int
+
+    :returns: x(θ), one row per point, nan if the point is in no region
+    :rtype: np.ndarray
+    """
+    located = locate(stacked, thetas, chunk)
+    x = np.full((len(thetas), stacked.n_x), np.nan)
+
+    for r in np.unique(located[located >= 0]):
+        at = located == r
+        # x(θ) = A θ + b, for all points in the region at once
+        x[at] = _x(stacked, r, thetas[at])
+
+    return x
+
+
+def _evaluate(args: tuple[np.ndarray, int]) -> np.ndarray:
+    """Evaluates a batch of points with the regions held by the worker"""
+    thetas, chunk = args
+    return evaluate(held["regions"], thetas, chunk)
+
+
+@dataclass
+class Regions:
+    """
+    Critical regions of a multiparametric solution, stacked
+    so that many theta points are located and evaluated at once
+
+    Each region r holds θ where E_r @ θ <= f_r, and there x(θ) = A_r @ θ + b_r
+
+    Points are located through a tree over the bounding boxes of the regions,
+    only the regions whose box holds the point (or meets the box of a chunk
+    of points) have their inequalities checked
+
+    :param solution: Multiparametric solution (ppopt)
+    :type solution: MPSolution
+    :param chunk: Number of points located at a time, bounds memory. Defaults to 4096.
+    :type chunk: int
+
+    :ivar E: Inequalities of all regions, stacked.
+    :vartype E: np.ndarray
+    :ivar f: Right hand sides of all regions, stacked.
+    :vartype f: np.ndarray
+    :ivar offsets: First row of each region in E and f, and the total last.
+    :vartype offsets: np.ndarray
+    :ivar tol: Tolerance for a point to be inside a region, as in the solution.
+    :vartype tol: float
+    :ivar n_x: Number of variables.
+    :vartype n_x: int
+    :ivar lo: Lower corner of the bounding box of each region.
+    :vartype lo: np.ndarray
+    :ivar hi: Upper corner of the bounding box of each region.
+    :vartype hi: np.ndarray
+    :ivar tree: Index over the bounding boxes.
+    :vartype tree: BoxTree
+    :ivar stacked: The arrays needed to locate and evaluate points.
+    :vartype stacked: Stacked
+    """
+
+    solution: MPSolution
+    chunk: int = 4096
+
+    E: np.ndarray = field(init=False, repr=False)
+    f: np.ndarray = field(init=False, repr=False)
+    offsets: np.ndarray = field(init=False, repr=False)
+    lo: np.ndarray = field(init=False, repr=False)
+    hi: np.ndarray = field(init=False, repr=False)
+    tree: BoxTree = field(init=False, repr=False)
+    stacked: Stacked = field(init=False, repr=False)
+
+    def __post_init__(self):
+        regions = self.solution.critical_regions
+        self.tol: float = self.solution.point_location_tolerance
+        self.n_x: int = self.solution.program.num_x()
+
+        if regions:
+            self.E = np.vstack([cr.E for cr in regions])
+            self.f = np.concatenate([cr.f.ravel() for cr in regions])
+        else:
+            n_t = self.solution.program.num_t()
+            self.E, self.f = np.empty((0, n_t)), np.empty(0)
+        self.offsets = np.cumsum([0] + [len(cr.f) for cr in regions])
+
+        self.lo, self.hi = self._boxes()
+        self.tree = BoxTree(self.lo, self.hi)
+
+        self.stacked = Stacked(
+            E=self.E,
+            f=self.f,
+            offsets=self.offsets,
+            A=[cr.A for cr in regions],
+            b=[cr.b for cr in regions],
+            fixations=[
+                None
+                if cr.y_fixation is None
+                else (cr.y_fixation, cr.x_indices, cr.y_indices)
+                for cr in regions
+            ],
+            tree=self.tree,
+            tol=self.tol,
+            n_x=self.n_x,
+            program=self.solution.program if self.solution.is_overlapping else None,
+        )
+
+    def _boxes(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Bounding box of each region, within the bounds on theta
+        by minimizing and maximizing each theta over the region
+        """
+        program = self.solution.program
+        n_t = program.num_t()
+        regions = self.solution.critical_regions
+
+        lo = np.full((len(regions), n_t), -np.inf)
+        hi = np.full((len(regions), n_t), np.inf)
+
+        for r, cr in enumerate(regions):
+            A_ub = np.vstack([cr.E, program.A_t])
+            b_ub = np.concatenate([cr.f.ravel(), program.b_t.ravel()])
+            for t in range(n_t):
+                c = np.zeros(n_t)
+                for sign, corner in ((1, lo), (-1, hi)):
+                    c[t] = sign
+                    result = linprog(
+                        c,
+                        A_ub=A_ub,
+                        b_ub=b_ub,
+                        bounds=(None, None),
+                        method="highs",
+                    )
+                    if result.status == 0:
+                        corner[r, t] = sign * result.fun
+
+        return lo, hi
+
+    def __len__(self) -> int:
+        return len(self.solution.critical_regions)
+
+    def locate(self, thetas: np.ndarray) -> np.ndarray:
+        """
+        Finds the region containing each point
+
+        :param thetas: points, one per row
+        :type thetas: np.ndarray
+
+        :returns: index of the region of each point, -1 if in none
+        :rtype: np.ndarray
+        """
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=float))
+        return locate(self.stacked, thetas, self.chunk)
+
+    def locate_point(self, theta: np.ndarray) -> int:
+        """
+        Finds the region containing a point, using the tree over the boxes
+
+        :param theta: point
+        :type theta: np.ndarray
+
+        :returns: index of the region, -1 if in none
+        :rtype: int
+        """
+        theta = np.asarray(theta, dtype=float).ravel()
+        candidates = self.tree.query(theta, theta, self.tol)
+        if not len(candidates):
+            return -1
+
+        inside = candidates[_within(self.stacked, candidates, theta.reshape(1, -1))[0]]
+
+        if not len(inside):
+            return -1
+
+        if self.stacked.program is not None and len(inside) > 1:
+            # overlapping regions, the best objective decides
+            return _best(self.stacked, theta, inside)
+
+        return int(inside[0])
+
+    def evaluate_point(self, theta: np.ndarray) -> np.ndarray | None:
+        """
+        Evaluates the affine solution at a point
+
+        :param theta: point
+        :type theta: np.ndarray
+
+        :returns: x(θ), None if the point is in no region
+        :rtype: np.ndarray | None
+        """
+        r = self.locate_point(theta)
+        if r < 0:
+            return None
+        column = np.asarray(theta, dtype=float).reshape(-1, 1)
+        return self.solution.critical_regions[r].evaluate(column).ravel()
+
+    def evaluate(self, thetas: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the affine solution at each point
+
+        :param thetas: points, one per row
+        :type thetas: np.ndarray
+
+        :returns: x(θ), one row per point, nan if the point is in no region
+        :rtype: np.ndarray
+        """
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=float))
+        return evaluate(self.stacked, thetas, self.chunk)
+
+    def evaluate_many(self, thetas: np.ndarray, workers: int = 1) -> np.ndarray:
+        """
+        Evaluates the affine solution at each point,
+        splitting the points across a process pool.
+        Each worker holds the stacked regions, not the solution
+
+        :param thetas: points, one per row
+        :type thetas: np.ndarray
+        :param workers: Number of processes. Defaults to 1 (serial).
+        :type workers: int
+
+        :returns: x(θ), one row per point, nan if the point is in no region
+        :rtype: np.ndarray
+        """
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=float))
+        if workers <= 1 or len(thetas) <= self.chunk:
+            return self.evaluate(thetas)
+
+        batches = [(batch, self.chunk) for batch in np.array_split(thetas, workers)]
+        with spawn(workers, {"regions": self.stacked}) as pool:
+            return np.vstack(list(pool.map(_evaluate, batches)))
@@ -0,0 +1,266 @@
+"""Rolling"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+from gana import I
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix, hstack, vstack
+
+logger = logging.getLogger("energia")
+
+if TYPE_CHECKING:
+    from ...components.temporal.periods import Periods
+    from .program import Program
+    from .sparse import Sparse
+
+
+def positions(sparse: Sparse, periods: Periods, temporal: set[str]) -> np.ndarray:
+    """
+    Position of each column along the periods,
+    the temporal indices of a column (e.g. y[0], q[3]) order it
+
+    :param sparse: Compiled program
+    :type sparse: Sparse
+    :param periods: Periods to roll over, usually the densest
+    :type periods: Periods
+    :param temporal: Names of all periods in the model
+    :type temporal: set[str]
+
+    :returns: position of each column, -1 if the column is not indexed by the periods
+    :rtype: np.ndarray
+    """
+    keys: list[tuple[int, ...] | None] = []
+    for v in sparse.columns:
+        elements = [
+            idx
+            for idx in v.index
+            if isinstance(idx, I) and any(p.name in temporal for p in idx.parent)
+        ]
+        if any(p.name == periods.name for idx in elements for p in idx.parent):
+            keys.append(tuple(pos for idx in elements for pos in idx.pos))
+        else:
+            keys.append(None)
+
+    # coarser periods come first in the index, so tuples sort in time
+    rank = {key: n for n, key in enumerate(sorted({k for k in keys if k is not None}))}
+    return np.array([-1 if k is None else rank[k] for k in keys], dtype=np.int64)
+
+
+def windows(length: int, window: int, overlap: int = 0) -> list[tuple[int, int, int]]:
+    """
+    Windows over the periods
+
+    :param length: Number of periods
+    :type length: int
+    :param window: Periods in a window
+    :type window: int
+    :param overlap: Periods shared by consecutive windows. Defaults to 0.
+    :type overlap: int
+
+    :returns: (start, commit, stop) of each window,
+        decisions in [start, commit) are fixed once the window is solved
+    :rtype: list[tuple[int, int, int]]
+    """
+    if window < 1 or not 0 <= overlap < window:
+        raise ValueError(
+            f"window ({window}) must be at least 1 and overlap ({overlap}) in [0, window)",
+        )
+
+    step = window - overlap
+    _windows = []
+    start = 0
+    while True:
+        stop = min(start + window, length)
+        if stop == length:
+            _windows.append((start, length, length))
+            return _windows
+        _windows.append((start, start + step, stop))
+        start += step
+
+
+class Horizon:
+    """
+    The compiled program, sorted once along the periods
+    so that each window touches only the nonzeros near it.
+
+    Rows without coarse columns (e.g. balances) enter the window that holds
+    their last period. Rows with coarse columns (e.g. sums over the periods)
+    are in every window, what the committed periods add to them is carried forward
+
+    :param A: Constraint matrix
+    :type A: csr_matrix
+    :param position: Position of each column along the periods, -1 if coarse
+    :type position: np.ndarray
+    """
+
+    def __init__(self, A: csr_matrix, position: np.ndarray):
+        self.A = A
+        self.position = position
+        n_rows = A.shape[0]
+
+        # a window is then a contiguous run of the sorted columns
+        self.coarse = np.flatnonzero(position < 0)
+        timed = np.flatnonzero(position >= 0)
+        self.timed = timed[np.argsort(position[timed], kind="stable")]
+        self.timed_at = position[self.timed]
+
+        # the last period each row reaches, and whether it has coarse columns
+        at = position[A.indices]
+        self.counts = np.diff(A.indptr)
+        filled = self.counts > 0
+        last = np.full(n_rows, -1, dtype=np.int64)
+        last[filled] = np.maximum.reduceat(at, A.indptr[:-1][filled])
+        has_coarse = np.zeros(n_rows, dtype=bool)
+        has_coarse[filled] = np.logical_or.reduceat(at < 0, A.indptr[:-1][filled])
+
+        local = np.flatnonzero(~has_coarse & filled)
+        self.local = local[np.argsort(last[local], kind="stable")]
+        self.local_last = last[self.local]
+
+        self.spanning = np.flatnonzero(has_coarse)
+        self.over_coarse = A[self.spanning][:, self.coarse]
+        self.over_timed = A[self.spanning][:, self.timed].tocsc()
+        self.carried = np.zeros(len(self.spanning))
+        # sorted columns already carried
+        self.done = 0
+
+        # position of a column in the window, -1 if not in it
+        self.slot = np.full(A.shape[1], -1, dtype=np.int64)
+
+    def window(
+        self,
+        x: np.ndarray,
+        start: int,
+        stop: int,
+    ) -> tuple[csr_matrix, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Slices a window, windows are taken in order
+
+        :param x: Values of all variables, those before start are fixed
+        :type x: np.ndarray
+        :param start: First period of the window
+        :type start: int
+        :param stop: Period after the last of the window
+        :type stop: int
+
+        :returns: matrix of the window, what the fixed decisions add to each row,
+            the rows and the columns of the window (in the order of the program)
+        :rtype: tuple[csr_matrix, np.ndarray, np.ndarray, np.ndarray]
+        """
+        A = self.A
+        lo, hi = np.searchsorted(self.timed_at, [start, stop])
+        columns = self.timed[lo:hi]
+
+        self.carried += (
+            self.over_timed[:, self.done : lo] @ x[self.timed[self.done : lo]]
+        )
+        self.done = lo
+
+        # nonzeros of the rows that end in the window
+        rows = self.local[slice(*np.searchsorted(self.local_last, [start, stop]))]
+        sizes = self.counts[rows]
+        row = np.repeat(np.arange(len(rows)), sizes)
+        nz = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        nz += np.repeat(A.indptr[rows], sizes)
+        column = A.indices[nz]
+        value = A.data[nz]
+
+        before = self.position[column] < start
+        fixed = np.bincount(
+            row[before],
+            weights=value[before] * x[column[before]],
+            minlength=len(rows),
+        )
+
+        n_coarse = len(self.coarse)
+        self.slot[columns] = n_coarse + np.arange(len(columns))
+        within = csr_matrix(
+            (value[~before], (row[~before], self.slot[column[~before]])),
+            shape=(len(rows), n_coarse + len(columns)),
+        )
+        self.slot[columns] = -1
+
+        # rows and columns are put back in the order of the program
+        rows = np.concatenate([rows, self.spanning])
+        order = np.argsort(rows, kind="stable")
+        columns = np.concatenate([self.coarse, columns])
+        arrange = np.argsort(columns, kind="stable")
+        spanned = hstack([self.over_coarse, self.over_timed[:, lo:hi]])
+        matrix = vstack([within, spanned]).tocsr()[order][:, arrange]
+        fixed = np.concatenate([fixed, self.carried])[order]
+
+        return matrix, fixed, rows[order], columns[arrange]
+
+
+def rolling(
+    program: Program,
+    periods: Periods,
+    window: int,
+    overlap: int = 0,
+) -> tuple[np.ndarray, float] | None:
+    """
+    Solves the program window by window over the periods.
+    The compiled (sparse) program is made once, every window is a slice of it.
+
+    In a window, the decisions of earlier periods are fixed (moved to the right hand side),
+    those of later periods are left out, and so are constraints that reach beyond the window.
+    States (e.g. inventory) are carried forward through the balances that link
+    the first period of a window to the last committed one.
+    Decisions not indexed by the periods (e.g. capacity) are revised in every window,
+    constraints that aggregate over the periods hold for the periods seen so far.
+
+    :param program: Program to solve
+    :type program: Program
+    :param periods: Periods to roll over
+    :type periods: Periods
+    :param window: Periods in a window
+    :type window: int
+    :param overlap: Periods solved again by the next window. Defaults to 0.
+    :type overlap: int
+
+    :returns: values of all variables and the objective, None if a window is infeasible
+    :rtype: tuple[np.ndarray, float] | None
+    """
+    sparse = program.sparse()
+    model = program.model
+
+    position = positions(sparse, periods, {p.name for p in model.periods})
+    length = int(position.max()) + 1 if (position >= 0).any() else 1
+
+    horizon = Horizon(sparse.A.tocsr(), position)
+    x = np.zeros(len(sparse.columns))
+
+    for start, commit, stop in windows(length, window, overlap):
+        # fixed decisions go to the right hand side
+        A, fixed, rows, active = horizon.window(x, start, stop)
+        result = milp(
+            sparse.c[active],
+            constraints=LinearConstraint(
+                A,
+                sparse.row_lb[rows] - fixed,
+                sparse.row_ub[rows] - fixed,
+            ),
+            bounds=Bounds(sparse.lb[active], sparse.ub[active]),
+            integrality=sparse.integrality[active],
+        )
+
+        if result.x is None:
+            logger.warning(
+                "🛑 No solution found for %s (%s). Check the model 🛑",
+                periods[start:stop],
+                result.message,
+            )
+            return None
+
+        x[active] = result.x
+        logger.info(
+            "🪟  Solved %s, committed %d periods",
+            periods[start:stop],
+            commit - start,
+        )
+
+    return x, float(sparse.c @ x)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from ..._core._hash import _Hash
+from ...modeling.constraints.bind import Bind
 from ...utils.dictionary import merge_trees
 
 if TYPE_CHECKING:
@@ -47,28 +48,67 @@ class Scenario(_Hash):
         # domain: Domain,
         rel: str,
         parameter: float | list[float],
+        replace: bool = False,
     ):
-        """Update the scenario representation"""
-
-        if rel == 'ub':
-            self.ubs = merge_trees(
-                self.ubs, {sample.aspect: sample.domain.param_tree(parameter)}
-            )
-
-        elif rel == 'lb':
-            self.lbs = merge_trees(
-                self.lbs, {sample.aspect: sample.domain.param_tree(parameter)}
-            )
-        elif rel == 'eq':
-            self.eqs = merge_trees(
-                self.eqs, {sample.aspect: sample.domain.param_tree(parameter)}
-            )
-
-        elif rel == 'calc':
-            self.calcs = merge_trees(
-                self.calcs, {sample.aspect: sample.domain.param_tree(parameter)}
-            )
-        elif rel == 'inc_calc':
-            self.inc_calcs = merge_trees(
-                self.inc_calcs, {sample.aspect: sample.domain.param_tree(parameter)}
-            )
+        """Update the scenario representation
+
+        :param sample: Sample that is bound
+        :type sample: Sample
+        :param rel: Kind of bind, one of ub, lb, eq, calc, inc_calc
+        :type rel: str
+        :param parameter: Parameter of the bind
+        :type parameter: float | list[float]
+        :param replace: Replace the parameter recorded for the domain. Defaults to False.
+        :type replace: bool
+        """
+
+        attr = {
+            'ub': 'ubs',
+            'lb': 'lbs',
+            'eq': 'eqs',
+            'calc': 'calcs',
+            'inc_calc': 'inc_calcs',
+        }.get(rel)
+
+        if attr is None:
+            return
+
+        if replace:
+            # walk down the tree of the domain, and overwrite the leaf
+            node = getattr(self, attr).setdefault(sample.aspect, {})
+            *keys, last = sample.domain.index
+            for key in keys:
+                node = node.setdefault(key, {})
+            node[last] = parameter
+            return
+
+        setattr(
+            self,
+            attr,
+            merge_trees(
+                getattr(self, attr),
+                {sample.aspect: sample.domain.param_tree(parameter)},
+            ),
+        )
+
+    def set(
+        self,
+        sample: Sample,
+        rel: str,
+        values: float | list[float],
+    ):
+        """
+        Sets new values for a bind that has been written.
+        The existing constraint is updated in place (RHS or coefficients),
+        as is the compiled program, so the model is not built again
+
+        :param sample: Sample that is bound, e.g. m.power.release(m.l0, m.q)
+        :type sample: Sample
+        :param rel: Kind of bind, one of ub, lb, eq, calc, inc_calc
+        :type rel: str
+        :param values: New parameter values
+        :type values: float | list[float]
+
+        :raises ValueError: if the sample has no such bind
+        """
+        Bind.existing(sample, values, rel).rewrite()
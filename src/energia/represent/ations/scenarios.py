@@ -0,0 +1,174 @@
+"""Scenarios"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import as_completed
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix
+
+from ...modeling.constraints.bind import Bind
+from .columnar import Columnar
+from .workers import held, spawn
+
+logger = logging.getLogger("energia")
+
+if TYPE_CHECKING:
+    from ...modeling.indices.sample import Sample
+    from ..model import Model
+    from .sparse import Sparse
+
+
+def _solve(delta: tuple) -> np.ndarray | None:
+    """
+    Solves the compiled program with the values of a scenario
+
+    :param delta: (rows, row_ub, row_lb, positions in A.data, coefficients)
+    :type delta: tuple
+
+    :returns: values of the variables, None if infeasible
+    :rtype: np.ndarray | None
+    """
+    compiled = held["compiled"]
+    c, data, indices, indptr, shape, row_lb, row_ub, lb, ub, integrality = compiled
+    rows, _row_ub, _row_lb, positions, coefficients = delta
+
+    data, row_lb, row_ub = data.copy(), row_lb.copy(), row_ub.copy()
+    data[positions] = coefficients
+    row_ub[rows] = _row_ub
+    row_lb[rows] = _row_lb
+
+    result = milp(
+        c,
+        constraints=LinearConstraint(
+            csr_matrix((data, indices, indptr), shape=shape),
+            row_lb,
+            row_ub,
+        ),
+        bounds=Bounds(lb, ub),
+        integrality=integrality,
+    )
+    return result.x
+
+
+def delta(
+    sparse: Sparse,
+    parameters: dict[tuple[Sample, str], float | list[float]],
+) -> tuple:
+    """
+    Changes a scenario makes to the compiled program
+
+    :param sparse: Compiled program
+    :type sparse: Sparse
+    :param parameters: {(sample, rel): values}
+    :type parameters: dict[tuple[Sample, str], float | list[float]]
+
+    :raises ValueError: if a coefficient to change is not in the compiled program
+    """
+    rows, row_ub, row_lb, positions, coefficients = [], [], [], [], []
+
+    for (sample, rel), values in parameters.items():
+        for row, B, a in Bind.existing(sample, values, rel).changes():
+            r = sparse.row_index[row.name]
+            if B is not None:
+                rows.append(r)
+                row_ub.append(B)
+                row_lb.append(B if not row.leq else -np.inf)
+            if a is not None:
+                start, stop = sparse.A.indptr[r], sparse.A.indptr[r + 1]
+                column = row.function.P[1]
+                at = np.flatnonzero(sparse.A.indices[start:stop] == column)
+                if not at.size:
+                    raise ValueError(
+                        f"The coefficient of {row.function.variables[1]} in {row} "
+                        "is not in the compiled program (pruned as zero), "
+                        "compile the program again",
+                    )
+                positions.append(start + at[0])
+                coefficients.append(a)
+
+    return (
+        np.array(rows, dtype=np.int64),
+        np.array(row_ub, dtype=float),
+        np.array(row_lb, dtype=float),
+        np.array(positions, dtype=np.int64),
+        np.array(coefficients, dtype=float),
+    )
+
+
+def run_scenarios(
+    model: Model,
+    scenarios: (
+        list[dict[tuple[Sample, str], float | list[float]]]
+        | dict[int, dict[tuple[Sample, str], float | list[float]]]
+    ),
+    workers: int = 1,
+) -> Columnar:
+    """
+    Solves the model under many scenarios, sharing one compiled program.
+    Each scenario sets new values for binds that have been written,
+    i.e. constants (demand, availability) or coefficients (prices, factors).
+    The model itself is left as it is.
+    The program is solved in its sparse form using HiGHS.
+
+    :param model: Model to solve
+    :type model: Model
+    :param scenarios: {(sample, rel): values} per scenario, keyed by ID if a dict
+    :type scenarios: list[dict] | dict[int, dict]
+    :param workers: Number of processes to solve with. Defaults to 1 (serial).
+    :type workers: int
+
+    :returns: values of each aspect, a row per scenario (nan if infeasible)
+    :rtype: Columnar
+    """
+    if not isinstance(scenarios, dict):
+        scenarios = dict(enumerate(scenarios))
+
+    sparse = model.program.sparse()
+    compiled = (
+        sparse.c,
+        sparse.A.data,
+        sparse.A.indices,
+        sparse.A.indptr,
+        sparse.shape,
+        sparse.row_lb,
+        sparse.row_ub,
+        sparse.lb,
+        sparse.ub,
+        sparse.integrality,
+    )
+
+    # the changes are found here, only arrays go to the workers
+    ids = list(scenarios)
+    deltas = [delta(sparse, scenarios[n]) for n in ids]
+
+    values = np.full((len(ids), len(sparse.columns)), np.nan)
+    infeasible = 0
+
+    def _keep(row: int, x: np.ndarray | None):
+        nonlocal infeasible
+        if x is None:
+            infeasible += 1
+        else:
+            values[row] = x
+
+    with spawn(workers, {"compiled": compiled}) as pool:
+        if pool is None:
+            for row, d in enumerate(deltas):
+                _keep(row, _solve(d))
+        else:
+            # results are kept as they come in
+            futures = {pool.submit(_solve, d): row for row, d in enumerate(deltas)}
+            for future in as_completed(futures):
+                _keep(futures[future], future.result())
+
+    logger.info(
+        "🎲  %d of %d scenarios solved",
+        len(ids) - infeasible,
+        len(ids),
+    )
+
+    return Columnar.of(sparse.columns, values, ids)
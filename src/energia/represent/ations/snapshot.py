@@ -0,0 +1,209 @@
+"""Snapshot"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict, deque
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from dill import Pickler, Unpickler
+from gurobipy import Model as GPModel
+
+from ...modeling.indices.domain import Domain
+from .program import Program
+
+logger = logging.getLogger("energia")
+
+if TYPE_CHECKING:
+    from ..model import Model
+
+# keys that can be hashed before the objects of the model are restored
+PLAIN = (str, int, float, bool, type(None), type, Enum)
+
+
+def _tracked(obj: Any) -> bool:
+    """True if obj is an energia or gana object, pickled by its __dict__"""
+    cls = type(obj)
+    return (
+        not isinstance(obj, (type, Enum, dict, list, set, frozenset, tuple))
+        and cls.__module__.startswith(("energia.", "gana."))
+        and isinstance(getattr(obj, "__dict__", None), dict)
+    )
+
+
+def _plain(key: Any) -> bool:
+    """True if the key does not hash an object of the model"""
+    if isinstance(key, tuple):
+        return all(_plain(k) for k in key)
+    return isinstance(key, PLAIN)
+
+
+def _deferred(obj: Any) -> bool:
+    """True if obj is a dict or set keyed by objects of the model,
+    these are filled once all the objects are restored"""
+    return isinstance(obj, (dict, set)) and not all(_plain(k) for k in obj)
+
+
+def _state(obj: Any) -> Any:
+    """What is written for an object (or deferred container)"""
+    if isinstance(obj, (dict, set)):
+        return (
+            list(obj.items()) if isinstance(obj, dict) else list(obj),
+            getattr(obj, "__dict__", None),
+            getattr(obj, "default_factory", None),
+        )
+
+    state = obj.__dict__
+    if isinstance(obj, Program):
+        state = dict(state)
+        # solver models can not be pickled, these are built again on solving
+        state["cache"] = {}
+        state["formulation"] = {
+            n: f for n, f in state["formulation"].items() if not isinstance(f, GPModel)
+        }
+    elif isinstance(obj, Domain) and "_ikey" in state:
+        # the intern key is made of ids, which do not survive the round trip
+        state = {k: v for k, v in state.items() if k != "_ikey"}
+    return state
+
+
+def _name(state: Any) -> str | None:
+    """Name of an object, if it is hashed by its name"""
+    if isinstance(state, dict) and isinstance(state.get("name"), str):
+        return state["name"]
+    return None
+
+
+def _revive(cls: type, name: str | None) -> Any:
+    """
+    Makes an empty instance, named if it is hashed by its name,
+    so that it can be hashed (e.g. in a frozenset) before its state is restored
+    """
+    obj = cls.__new__(cls)
+    if name is not None:
+        obj.__dict__["name"] = name
+    return obj
+
+
+def _walk(root: Any) -> tuple[list[Any], list[Any]]:
+    """
+    Finds the objects of the model reachable from root, without recursing.
+    Each is written once, its references to others are written by position
+
+    :returns: the objects, root first, and the state of each
+    :rtype: tuple[list[Any], list[Any]]
+    """
+    objects, states = [], []
+    seen: set[int] = set()
+    stack = deque([root])
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+
+        if _tracked(obj) or _deferred(obj):
+            seen.add(id(obj))
+            state = _state(obj)
+            objects.append(obj)
+            states.append(state)
+            if isinstance(state, dict):
+                stack.extend(state.values())
+            else:
+                items, attrs, _ = state
+                stack.extend(items)
+                if attrs:
+                    stack.extend(attrs.values())
+
+        elif isinstance(obj, (dict, list, tuple, set, frozenset, deque)):
+            seen.add(id(obj))
+            stack.extend(obj.values() if isinstance(obj, dict) else obj)
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+            if isinstance(getattr(obj, "__dict__", None), dict):
+                stack.extend(obj.__dict__.values())
+
+    return objects, states
+
+
+class _Pickler(Pickler):
+    """Writes the objects of the model by their position"""
+
+    def __init__(self, file, objects: list[Any]):
+        Pickler.__init__(self, file)
+        self.positions = {id(obj): n for n, obj in enumerate(objects)}
+
+    def persistent_id(self, obj: Any) -> int | None:
+        return self.positions.get(id(obj))
+
+
+class _Unpickler(Unpickler):
+    """Reads the objects of the model from their position"""
+
+    def __init__(self, file, objects: list[Any]):
+        Unpickler.__init__(self, file)
+        self.objects = objects
+
+    def persistent_load(self, pid: int) -> Any:
+        return self.objects[pid]
+
+
+def snapshot(model: Model, path: str):
+    """
+    Writes the built model, program and ledgers included, to a file.
+    The object graph of a built model is deep, so the objects are listed
+    first and each is written with references to the others by position
+
+    :param model: Model to write
+    :type model: Model
+    :param path: File to write to
+    :type path: str
+    """
+    objects, states = _walk(model)
+
+    with open(path, "wb") as f:
+        Pickler(f).dump(
+            [(type(obj), _name(state)) for obj, state in zip(objects, states)]
+        )
+        _Pickler(f, objects).dump(states)
+
+    logger.info("📸  Snapshot of %s written to %s", model, path)
+
+
+def restore(path: str) -> Model:
+    """
+    Reads a model written by snapshot
+
+    :param path: File to read
+    :type path: str
+
+    :returns: the model, as it was built
+    :rtype: Model
+    """
+    with open(path, "rb") as f:
+        objects = [_revive(cls, name) for cls, name in Unpickler(f).load()]
+        states = _Unpickler(f, objects).load()
+
+    deferred = []
+    for obj, state in zip(objects, states):
+        if isinstance(obj, (dict, set)):
+            deferred.append((obj, state))
+        else:
+            # components would forward __setstate__ to the model (__getattr__)
+            obj.__dict__.update(state)
+
+    # containers hash the objects, which are whole by now
+    for obj, (items, attrs, factory) in deferred:
+        if attrs:
+            obj.__dict__.update(attrs)
+        if isinstance(obj, defaultdict):
+            obj.default_factory = factory
+        if isinstance(obj, dict):
+            dict.update(obj, items)
+        else:
+            set.update(obj, items)
+
+    model = objects[0]
+    logger.info("📸  %s restored from %s", model, path)
+    return model
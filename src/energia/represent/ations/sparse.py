@@ -0,0 +1,172 @@
+"""Sparse"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+if TYPE_CHECKING:
+    from gana import V
+    from gana.sets.constraint import C
+    from gana.sets.objective import O
+
+    from .program import Program
+
+
+@dataclass
+class Sparse:
+    """
+    Compiled (matrix) form of a Program
+
+        min c @ x
+        s.t. row_lb <= A @ x <= row_ub
+             lb <= x <= ub
+
+    Rows are ordered as in the MPS file, i.e. inequality (<=) constraints
+    followed by equality constraints. Non-negativity constraints are
+    not rows, they are given as bounds on the variables.
+
+    :param c: Objective coefficients, zeros if no objective is set.
+    :type c: np.ndarray
+    :param A: Constraint coefficients.
+    :type A: csr_matrix
+    :param row_lb: Lower bounds of rows, -inf for inequality constraints.
+    :type row_lb: np.ndarray
+    :param row_ub: Upper bounds of rows.
+    :type row_ub: np.ndarray
+    :param lb: Lower bounds of variables.
+    :type lb: np.ndarray
+    :param ub: Upper bounds of variables.
+    :type ub: np.ndarray
+    :param integrality: 1 if the variable is integer (or binary), else 0.
+    :type integrality: np.ndarray
+    :param rows: Constraints in the order of rows.
+    :type rows: list[C]
+    :param columns: Variables in the order of columns.
+    :type columns: list[V]
+    :param categories: Categories of the constraints compiled, all if None.
+    :type categories: tuple[str, ...] | None
+
+    :ivar row_index: Row of each constraint, keyed by name.
+    :vartype row_index: dict[str, int]
+    :ivar column_index: Column of each variable, keyed by name.
+    :vartype column_index: dict[str, int]
+    """
+
+    c: np.ndarray
+    A: csr_matrix
+    row_lb: np.ndarray
+    row_ub: np.ndarray
+    lb: np.ndarray
+    ub: np.ndarray
+    integrality: np.ndarray
+    rows: list[C] = field(default_factory=list)
+    columns: list[V] = field(default_factory=list)
+    categories: tuple[str, ...] | None = None
+
+    def __post_init__(self):
+        self.row_index: dict[str, int] = {
+            c.name: n for n, c in enumerate(self.rows)
+        }
+        self.column_index: dict[str, int] = {
+            v.name: n for n, v in enumerate(self.columns)
+        }
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(number of rows, number of columns)"""
+        return self.A.shape
+
+    @property
+    def eq(self) -> np.ndarray:
+        """Mask of equality rows"""
+        return self.row_lb == self.row_ub
+
+    @staticmethod
+    def objective(objective: O | None, n_columns: int) -> np.ndarray:
+        """
+        Dense vector of objective coefficients
+
+        :param objective: Objective of the program, None gives zeros
+        :type objective: O | None
+        :param n_columns: Number of columns (variables)
+        :type n_columns: int
+        """
+        c = np.zeros(n_columns)
+        if objective is not None:
+            # a variable can appear more than once in the objective
+            np.add.at(c, objective.P, objective.C)
+        return c
+
+    @classmethod
+    def compile(
+        cls, program: Program, categories: tuple[str, ...] | None = None
+    ) -> Sparse:
+        """
+        Compiles the program
+
+        :param program: Program to compile
+        :type program: Program
+        :param categories: Only compile constraints in these categories. Defaults to None (all).
+        :type categories: tuple[str, ...] | None, optional
+        """
+        program.finalize()
+
+        columns: list[V] = list(program.variables)
+        rows: list[C] = [
+            c
+            for c in program.leqcons() + program.eqcons()
+            if categories is None or c.category in categories
+        ]
+
+        n_rows, n_columns = len(rows), len(columns)
+
+        # CSR is assembled directly, each row takes its coefficients
+        # from the (deduplicated) matrix of the constraint
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        indices: list[int] = []
+        data: list[float] = []
+        row_lb = np.full(n_rows, -np.inf)
+        row_ub = np.empty(n_rows)
+
+        for n, cons in enumerate(rows):
+            matrix = {p: a for p, a in cons.matrix.items() if p is not None}
+            indices.extend(matrix)
+            data.extend(matrix.values())
+            indptr[n + 1] = len(indices)
+            row_ub[n] = cons.B or 0.0
+            if not cons.leq:
+                row_lb[n] = row_ub[n]
+
+        A = csr_matrix(
+            (
+                np.asarray(data, dtype=float),
+                np.asarray(indices, dtype=np.int64),
+                indptr,
+            ),
+            shape=(n_rows, n_columns),
+        )
+
+        lb = np.array([0.0 if v.nn or v.bnr else -np.inf for v in columns])
+        ub = np.array([1.0 if v.bnr else np.inf for v in columns])
+        integrality = np.array([int(v.bnr or v.itg) for v in columns], dtype=np.uint8)
+
+        c = cls.objective(
+            program.objectives[-1] if program.objectives else None, n_columns
+        )
+
+        return cls(
+            c=c,
+            A=A,
+            row_lb=row_lb,
+            row_ub=row_ub,
+            lb=lb,
+            ub=ub,
+            integrality=integrality,
+            rows=rows,
+            columns=columns,
+            categories=tuple(categories) if categories is not None else None,
+        )
@@ -0,0 +1,477 @@
+"""Stochastic"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+from scipy.sparse import block_diag, csr_matrix, hstack, identity, vstack
+
+from ..classifiers import Uncertainty
+from .columnar import Columnar
+from .scenarios import delta
+from .workers import held, spawn
+
+logger = logging.getLogger("energia")
+
+if TYPE_CHECKING:
+    from ...modeling.indices.sample import Sample
+    from ..model import Model
+
+# design aspects, decided before the uncertainty is realized
+FIRST_STAGE = ("capacity", "invcapacity", "x_capacity", "x_invcapacity")
+
+# status linprog gives an infeasible program
+INFEASIBLE = 2
+
+
+def _recourse(args: tuple) -> tuple[bool, float, np.ndarray, np.ndarray | None]:
+    """
+    Solves the recourse (second stage) program of a scenario,
+    with the first stage decisions fixed.
+    If infeasible, the infeasibility (sum of artificials) is minimized instead
+
+    :param args: (scenario, first stage values)
+    :type args: tuple
+
+    :returns: (feasible, cost or infeasibility, subgradient w.r.t. the first stage, second stage values)
+    :rtype: tuple[bool, float, np.ndarray, np.ndarray | None]
+
+    :raises ValueError: if the recourse is neither solved nor infeasible (e.g. unbounded),
+        or its infeasibility can not be minimized
+    """
+    s, x = args
+    c, A_F, A_S, row_lb, row_ub, lb, ub = held["recourses"][s]
+
+    # the first stage moves to the right hand side
+    b = row_ub - A_F @ x
+    eq = row_lb == row_ub
+    bounds = np.column_stack([lb, ub])
+
+    result = linprog(
+        c,
+        A_ub=A_S[~eq],
+        b_ub=b[~eq],
+        A_eq=A_S[eq],
+        b_eq=b[eq],
+        bounds=bounds,
+        method="highs",
+    )
+    feasible = result.status == 0
+
+    if not feasible and result.status != INFEASIBLE:
+        # unbounded, or stopped short, gives no cut
+        raise ValueError(
+            f"Recourse of scenario {s} could not be solved: {result.message}",
+        )
+
+    if not feasible:
+        # artificials, -a on inequalities, a+ - a- on equalities
+        n_leq, n_eq = int((~eq).sum()), int(eq.sum())
+        result = linprog(
+            np.concatenate([np.zeros(A_S.shape[1]), np.ones(n_leq + 2 * n_eq)]),
+            A_ub=hstack(
+                [A_S[~eq], -identity(n_leq), csr_matrix((n_leq, 2 * n_eq))],
+            ),
+            b_ub=b[~eq],
+            A_eq=hstack(
+                [
+                    A_S[eq],
+                    csr_matrix((n_eq, n_leq)),
+                    identity(n_eq),
+                    -identity(n_eq),
+                ],
+            ),
+            b_eq=b[eq],
+            bounds=np.vstack([bounds, np.tile([0, np.inf], (n_leq + 2 * n_eq, 1))]),
+            method="highs",
+        )
+        if result.status != 0:
+            raise ValueError(
+                f"Infeasibility of the recourse of scenario {s} "
+                f"could not be minimized: {result.message}",
+            )
+
+    duals = np.empty(len(b))
+    duals[~eq] = result.ineqlin.marginals
+    duals[eq] = result.eqlin.marginals
+
+    # d(value)/dx = d(value)/db @ db/dx
+    return (
+        feasible,
+        result.fun,
+        -(A_F.T @ duals),
+        result.x if feasible else None,
+    )
+
+
+@dataclass
+class Stochastic:
+    """
+    Two-stage stochastic program over scenarios
+
+    The design aspects (first stage) are shared by all scenarios,
+    the other aspects (second stage) are indexed by scenario.
+    Each scenario gives new values to binds, as in Model.run_scenarios.
+    The expected cost is minimized, the second stage costs are weighted by
+    the probability of each scenario.
+
+    :param model: Model, its objective is taken as the cost
+    :type model: Model
+    :param scenarios: {(sample, rel): values} per scenario, keyed by ID if a dict
+    :type scenarios: list[dict] | dict[int, dict]
+    :param probabilities: Probability of each scenario, keyed by ID. Defaults to None (equally likely).
+    :type probabilities: list[float] | dict[int, float] | None
+    :param first_stage: Aspects decided in the first stage. Defaults to FIRST_STAGE.
+    :type first_stage: tuple[str, ...]
+
+    :ivar classifiers: Classifiers of the model, and stochastic uncertainty.
+    :vartype classifiers: dict[str, list[Enum]]
+    :ivar first: Mask of the first stage columns of the program.
+    :vartype first: np.ndarray
+    :ivar second_rows: Mask of the rows written for each scenario.
+    :vartype second_rows: np.ndarray
+    :ivar objective: Expected cost, once solved.
+    :vartype objective: float | None
+    :ivar solution: Values of each aspect, a row per scenario, once solved.
+    :vartype solution: Columnar | None
+    """
+
+    model: Model
+    scenarios: (
+        list[dict[tuple[Sample, str], float | list[float]]]
+        | dict[int, dict[tuple[Sample, str], float | list[float]]]
+    )
+    probabilities: list[float] | dict[int, float] | None = None
+    first_stage: tuple[str, ...] = FIRST_STAGE
+
+    objective: float | None = field(default=None, init=False)
+    solution: Columnar | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.scenarios, dict):
+            self.scenarios = dict(enumerate(self.scenarios))
+
+        if self.probabilities is None:
+            self.probabilities = {s: 1 / len(self.scenarios) for s in self.scenarios}
+        elif not isinstance(self.probabilities, dict):
+            self.probabilities = dict(zip(self.scenarios, self.probabilities))
+
+        if not np.isclose(sum(self.probabilities.values()), 1):
+            raise ValueError("Probabilities of the scenarios do not add up to 1")
+
+        # the model is left as it is, its classifiers are copied
+        self.classifiers = {
+            kind: list(classifiers)
+            for kind, classifiers in self.model.classifiers.items()
+        }
+        if Uncertainty.STOCHASTIC not in self.classifiers["uncertainty"]:
+            self.classifiers["uncertainty"].append(Uncertainty.STOCHASTIC)
+
+        self.sparse = self.model.program.sparse()
+        A = self.sparse.A
+
+        self.first = np.array(
+            [
+                v.parent is not None and v.parent.name in self.first_stage
+                for v in self.sparse.columns
+            ],
+        )
+
+        deltas = {s: delta(self.sparse, sc) for s, sc in self.scenarios.items()}
+
+        # rows with second stage variables, or changed by a scenario,
+        # are written for each scenario
+        self.second_rows = A[:, ~self.first].getnnz(axis=1) > 0
+        for rows, _, _, positions, _ in deltas.values():
+            self.second_rows[rows] = True
+            self.second_rows[np.searchsorted(A.indptr, positions, "right") - 1] = True
+
+        # the program of each scenario, split by stage
+        self.blocks: dict[int, tuple] = {}
+        for s, (rows, row_ub, row_lb, positions, coefficients) in deltas.items():
+            data = A.data.copy()
+            data[positions] = coefficients
+            _row_lb, _row_ub = self.sparse.row_lb.copy(), self.sparse.row_ub.copy()
+            _row_ub[rows] = row_ub
+            _row_lb[rows] = row_lb
+
+            _A = csr_matrix((data, A.indices, A.indptr), shape=A.shape)[
+                self.second_rows
+            ]
+            self.blocks[s] = (
+                _A[:, self.first],
+                _A[:, ~self.first],
+                _row_lb[self.second_rows],
+                _row_ub[self.second_rows],
+            )
+
+    def _values(self, x: np.ndarray, ys: dict[int, np.ndarray]) -> Columnar:
+        """Full solution vectors, a row per scenario"""
+        values = np.empty((len(self.scenarios), len(self.sparse.columns)))
+        for row, s in enumerate(self.scenarios):
+            values[row, self.first] = x
+            values[row, ~self.first] = ys[s]
+        return Columnar.of(self.sparse.columns, values, list(self.scenarios))
+
+    def equivalent(self) -> tuple:
+        """
+        Deterministic equivalent, the first stage columns come first,
+        followed by the second stage columns of each scenario
+
+        :returns: (c, A, row_lb, row_ub, lb, ub, integrality)
+        :rtype: tuple
+        """
+        sparse, F, S = self.sparse, self.first, ~self.first
+        first_rows = ~self.second_rows
+
+        blocks = [self.blocks[s] for s in self.scenarios]
+
+        A = vstack(
+            [
+                hstack(
+                    [
+                        sparse.A[first_rows][:, F],
+                        csr_matrix((first_rows.sum(), S.sum() * len(blocks))),
+                    ],
+                ),
+                hstack(
+                    [
+                        vstack([A_F for A_F, _, _, _ in blocks]),
+                        block_diag([A_S for _, A_S, _, _ in blocks]),
+                    ],
+                ),
+            ],
+            format="csr",
+        )
+
+        c = np.concatenate(
+            [sparse.c[F]]
+            + [self.probabilities[s] * sparse.c[S] for s in self.scenarios],
+        )
+        row_lb = np.concatenate(
+            [sparse.row_lb[first_rows]] + [row_lb for _, _, row_lb, _ in blocks],
+        )
+        row_ub = np.concatenate(
+            [sparse.row_ub[first_rows]] + [row_ub for _, _, _, row_ub in blocks],
+        )
+        n = len(blocks)
+        lb = np.concatenate([sparse.lb[F]] + [sparse.lb[S]] * n)
+        ub = np.concatenate([sparse.ub[F]] + [sparse.ub[S]] * n)
+        integrality = np.concatenate(
+            [sparse.integrality[F]] + [sparse.integrality[S]] * n,
+        )
+
+        return c, A, row_lb, row_ub, lb, ub, integrality
+
+    def solve(self) -> Stochastic:
+        """Solves the deterministic equivalent using HiGHS"""
+        c, A, row_lb, row_ub, lb, ub, integrality = self.equivalent()
+
+        result = milp(
+            c,
+            constraints=LinearConstraint(A, row_lb, row_ub),
+            bounds=Bounds(lb, ub),
+            integrality=integrality,
+        )
+        if result.x is None:
+            logger.warning(
+                "🛑 No solution found (%s). Check the model 🛑",
+                result.message,
+            )
+            return self
+
+        n_F = self.first.sum()
+        n_S = len(self.first) - n_F
+        ys = {
+            s: result.x[n_F + n * n_S : n_F + (n + 1) * n_S]
+            for n, s in enumerate(self.scenarios)
+        }
+        self.objective = float(result.fun)
+        self.solution = self._values(result.x[:n_F], ys)
+
+        logger.info(
+            "🎲  Deterministic equivalent over %d scenarios solved, expected cost %s",
+            len(self.scenarios),
+            self.objective,
+        )
+        return self
+
+    def benders(
+        self,
+        workers: int = 1,
+        tol: float = 1e-6,
+        iterations: int = 100,
+    ) -> Stochastic:
+        """
+        Solves by Benders decomposition (L-shaped method).
+        The master program decides the first stage,
+        the recourse program of each scenario gives an optimality cut.
+        If a recourse program is infeasible for the first stage decided,
+        its infeasibility is minimized instead and gives a feasibility cut.
+        Needs continuous second stage variables
+
+        :param workers: Number of processes to solve the recourse programs with. Defaults to 1 (serial).
+        :type workers: int
+        :param tol: Relative gap to stop at. Defaults to 1e-6.
+        :type tol: float
+        :param iterations: Most iterations. Defaults to 100.
+        :type iterations: int
+
+        :raises ValueError: if the second stage has integer variables,
+            a recourse program is unbounded or can not be solved,
+            or no feasible first stage is found within the iterations
+        """
+        sparse, S = self.sparse, ~self.first
+        if sparse.integrality[S].any():
+            raise ValueError(
+                "Benders decomposition needs a continuous second stage, use .solve()",
+            )
+
+        scenarios = list(self.scenarios)
+        master = _Master(self)
+
+        recourses = {
+            s: (sparse.c[S], A_F, A_S, row_lb, row_ub, sparse.lb[S], sparse.ub[S])
+            for s, (A_F, A_S, row_lb, row_ub) in self.blocks.items()
+        }
+
+        lower, upper = -np.inf, np.inf
+        x_best, ys_best = None, None
+
+        # second stage (recourse) programs held by each worker of the pool
+        with spawn(workers, {"recourses": recourses}) as pool:
+            for iteration in range(iterations):
+                x, bound = master.solve()
+                if bound is not None:
+                    lower = bound
+
+                args = [(s, x) for s in scenarios]
+                recourse = list(
+                    pool.map(_recourse, args) if pool else map(_recourse, args),
+                )
+
+                cost = self._cost(x, recourse)
+                if cost is not None and cost < upper:
+                    upper = cost
+                    x_best = x
+                    ys_best = {s: y for s, (_, _, _, y) in zip(scenarios, recourse)}
+
+                logger.info(
+                    "🎲  Benders iteration %d, bounds [%s, %s]",
+                    iteration,
+                    lower,
+                    upper,
+                )
+
+                if np.isfinite(upper - lower) and upper - lower <= tol * max(
+                    1.0,
+                    abs(upper),
+                ):
+                    break
+
+                master.cut(x, recourse)
+
+        if x_best is None:
+            raise ValueError(
+                f"No feasible first stage found in {iterations} iterations",
+            )
+
+        self.objective = float(upper)
+        self.solution = self._values(x_best, ys_best)
+        return self
+
+    def _cost(self, x: np.ndarray, recourse: list[tuple]) -> float | None:
+        """Expected cost of the first stage decision, None if a recourse is infeasible"""
+        if not all(feasible for feasible, _, _, _ in recourse):
+            return None
+        return self.sparse.c[self.first] @ x + sum(
+            self.probabilities[s] * q
+            for s, (_, q, _, _) in zip(self.scenarios, recourse)
+        )
+
+
+class _Master:
+    """
+    Master program of the Benders decomposition,
+    the first stage columns, then a cost (theta) per scenario
+
+    :param stochastic: Two-stage program being decomposed
+    :type stochastic: Stochastic
+    """
+
+    def __init__(self, stochastic: Stochastic):
+        sparse, F, S = stochastic.sparse, stochastic.first, ~stochastic.first
+        self.n_F, self.n_s = int(F.sum()), len(stochastic.scenarios)
+
+        first_rows = ~stochastic.second_rows
+        self.A = hstack(
+            [sparse.A[first_rows][:, F], csr_matrix((first_rows.sum(), self.n_s))],
+            format="csr",
+        )
+        self.c = np.concatenate(
+            [sparse.c[F], [stochastic.probabilities[s] for s in stochastic.scenarios]],
+        )
+        self.integrality = np.concatenate([sparse.integrality[F], np.zeros(self.n_s)])
+        self.row_lb, self.row_ub = sparse.row_lb[first_rows], sparse.row_ub[first_rows]
+        self.lb, self.ub = sparse.lb[F], sparse.ub[F]
+        self.cuts: list[csr_matrix] = []
+        self.cuts_ub: list[float] = []
+
+        # nonnegative costs and variables cost nothing less than 0 in recourse,
+        # else the cost of a scenario is free once it has an optimality cut
+        self.floor = (
+            0.0 if (sparse.c[S] >= 0).all() and (sparse.lb[S] >= 0).all() else -np.inf
+        )
+        self.bounded = np.full(self.n_s, np.isfinite(self.floor))
+
+    def solve(self) -> tuple[np.ndarray, float | None]:
+        """
+        Solves the master program with the cuts so far
+
+        :returns: first stage values, and the lower bound if every theta is bounded
+        :rtype: tuple[np.ndarray, float | None]
+
+        :raises ValueError: if the first stage is infeasible
+        """
+        A = vstack([self.A, *self.cuts], format="csr") if self.cuts else self.A
+        result = milp(
+            self.c,
+            constraints=LinearConstraint(
+                A,
+                np.concatenate([self.row_lb, np.full(len(self.cuts), -np.inf)]),
+                np.concatenate([self.row_ub, self.cuts_ub]),
+            ),
+            bounds=Bounds(
+                np.concatenate([self.lb, np.where(self.bounded, self.floor, 0)]),
+                np.concatenate([self.ub, np.where(self.bounded, np.inf, 0)]),
+            ),
+            integrality=self.integrality,
+        )
+        if result.x is None:
+            raise ValueError(f"First stage is infeasible: {result.message}")
+
+        return result.x[: self.n_F], result.fun if self.bounded.all() else None
+
+    def cut(self, x: np.ndarray, recourse: list[tuple]):
+        """
+        Adds a cut per scenario from its recourse program
+
+        :param x: First stage values the recourse programs were solved at
+        :type x: np.ndarray
+        :param recourse: (feasible, cost or infeasibility, subgradient, values) per scenario
+        :type recourse: list[tuple]
+        """
+        for n, (feasible, q, g, _) in enumerate(recourse):
+            row = np.zeros(self.n_F + self.n_s)
+            row[: self.n_F] = g
+            if feasible:
+                # optimality, theta_s >= q + g @ (x - x_hat)
+                row[self.n_F + n] = -1
+                self.bounded[n] = True
+            # else feasibility, the infeasibility q + g @ (x - x_hat) <= 0
+            self.cuts.append(csr_matrix(row))
+            self.cuts_ub.append(g @ x - q)
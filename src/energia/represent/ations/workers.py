@@ -0,0 +1,81 @@
+"""Workers"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+
+
+class Held:
+    """
+    What each worker of the pool holds, e.g. the compiled program.
+    Reads as {name: value}, each thread holds its own
+    so that concurrent serial runs do not overwrite each other
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def values(self) -> dict[str, Any]:
+        """{name: value} held by this thread"""
+        if not hasattr(self._local, "values"):
+            self._local.values = {}
+        return self._local.values
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+
+held = Held()
+
+
+def hold(values: dict[str, Any]):
+    """
+    Gives the worker its own copy of the values
+
+    :param values: {name: value} to hold
+    :type values: dict[str, Any]
+    """
+    held.values.update(values)
+
+
+@contextmanager
+def spawn(workers: int, values: dict[str, Any]) -> Iterator[ProcessPoolExecutor | None]:
+    """
+    Pool of processes, each holding its own copy of the values.
+    If serial, the values are held by this thread instead,
+    and let go (the ones they stood in for restored) on exit
+
+    :param workers: Number of processes, 1 or less is serial
+    :type workers: int
+    :param values: {name: value} to hold
+    :type values: dict[str, Any]
+
+    :returns: the pool, None if serial
+    :rtype: Iterator[ProcessPoolExecutor | None]
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=hold,
+            initargs=(values,),
+        ) as pool:
+            yield pool
+        return
+
+    # a nested run holds values under the same names
+    previous = {name: held[name] for name in values if name in held}
+    hold(values)
+    try:
+        yield None
+    finally:
+        for name in values:
+            held.values.pop(name, None)
+        held.values.update(previous)
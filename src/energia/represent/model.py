@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+import os
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Literal, Self, Type
@@ -44,34 +44,45 @@ from ..modeling.parameters.instruction import Instruction
 from ..modeling.variables.control import Control
 from ..modeling.variables.recipe import Recipe
 from ..modeling.variables.states import Consequence, State, Stream
+from ..utils.tracing import Tracer
+from .ations.balances import Balances
+from .ations.columnar import Columnar
+from .ations.dispositions import Dispositions
+from .ations.mappings import Mappings
+from .ations.pareto import pareto
 from .ations.graph import Graph
 from .ations.program import Program
 from .ations.scenario import Scenario
+from .ations.scenarios import run_scenarios
+from .ations.snapshot import restore, snapshot
+from .ations.stochastic import FIRST_STAGE, Stochastic
 
 logger = logging.getLogger("energia")
-logger.setLevel(logging.INFO)
 
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
-formatter = logging.Formatter("%(message)s")
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+# build messages are only formatted if the logger is listening at INFO
+# set the level of the "energia" logger higher to skip them entirely
+if logger.level == logging.NOTSET:
+    logger.setLevel(logging.INFO)
+
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(message)s")
+    ch.setFormatter(formatter)
+    logger.addHandler(ch)
 
 
 if TYPE_CHECKING:
     from enum import Enum
-    from typing import DefaultDict
+
+    import numpy as np
+    from pandas import DataFrame
 
     from .._core._component import _Component
-    from ..components.commodities.commodity import Commodity
     from ..modeling.indices.domain import Domain
     from ..modeling.indices.sample import Sample
     from ..modeling.variables.aspect import Aspect
-
-    BalanceType = DefaultDict[
-        Commodity,
-        DefaultDict[Location | Linkage, DefaultDict[Periods, list[Aspect]]],
-    ]
+    from .ations.sparse import Sparse
 
 
 @dataclass
@@ -87,6 +98,14 @@ class Model:
     :type default: bool
     :param capacitate: True if process capacities should be determined to bound operations.
     :type capacitate: bool
+    :param defer_maps: True if updates to map constraints are written in one pass when the program is finalized.
+    :type defer_maps: bool
+    :param solver: Solver used by default when optimizing, gurobi or highs. Defaults to gurobi.
+    :type solver: str
+    :param warm: True if re-solves for a new objective keep the solver model and warm start it.
+    :type warm: bool
+    :param trace: True if the steps taken to build the Model are counted and timed.
+    :type trace: bool
 
     :ivar added: List of added objects to the Model.
     :vartype added: list[str]
@@ -120,10 +139,16 @@ class Model:
     :vartype directory: dict[str, dict[str, Recipe]]
     :ivar classifiers: List of classifiers for the Model.
     :vartype classifiers: list[Enum]
-    :ivar grb: Dictionary which tells you what aspects of resource have GRB {loc: time: []} and {time: loc: []}.
-    :vartype grb: DefaultDict[Commodity,DefaultDict[Location | Linkage, DefaultDict[Periods, list[Aspect]]]]
-    :ivar dispositions: Dictionary which tells you what aspects of what component have been bound at what location and time.
-    :vartype dispositions: dict[Aspect, dict[Commodity | Process | Storage | Transport, dict[Location | Linkage, dict[Periods, list[Aspect]]]]]
+    :ivar balances: Ledger of general resource balances (GRB) {commodity: {space: {time: []}}}, written to the program when emitted.
+    :vartype balances: Balances
+    :ivar dispositions: Ledger which tells you what aspects of what component have been bound at what location and time.
+    :vartype dispositions: Dispositions
+    :ivar mappings: Ledger of children yet to be added to map constraints {name: []}.
+    :vartype mappings: Mappings
+    :ivar compiled: Sparse (matrix) form of the program, set when compiled.
+    :vartype compiled: Sparse | None
+    :ivar tracer: Counts and times the steps taken to build the Model.
+    :vartype tracer: Tracer
     :ivar maps: Maps of aspects to domains.
     :vartype maps: dict[Aspect, dict[Domain, dict[str, list[Domain]]]]
     :ivar maps_report: Maps of aspects to domains for reporting variables.
@@ -137,6 +162,10 @@ class Model:
     init: list[Callable[[Self]]] | None = None
     default: bool = True
     capacitate: bool = False
+    defer_maps: bool = True
+    solver: Literal["gurobi", "highs"] = "gurobi"
+    warm: bool = False
+    trace: bool = False
 
     def __post_init__(self):
 
@@ -217,6 +246,9 @@ class Model:
 
         self.reserved_names += zip(*self.familytree.values())
 
+        # components added, for quick lookups
+        self._added: set[str] = set()
+
         # --------------------------------------------------------------------
         # * Dimensions or Representation
         # --------------------------------------------------------------------
@@ -340,20 +372,21 @@ class Model:
         # have been set in what location and time
 
         # * General Resource Balances
-        self.balances: BalanceType = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(list))
-        )
+        self.balances: Balances = Balances()
         # Dictionary which tells you what aspects of what component
         # have been bound at what location and time
 
         # * Sample Dispositions
-        self.dispositions: dict[
-            Aspect,
-            dict[
-                Commodity | Process | Storage | Transport,
-                dict[Location | Linkage, dict[Periods, list[Aspect]]],
-            ],
-        ] = {}
+        self.dispositions: Dispositions = Dispositions()
+
+        # * Compiled (sparse) Program
+        self.compiled: Sparse | None = None
+
+        # * Build Tracer
+        self.tracer: Tracer = Tracer(enabled=self.trace)
+
+        # * Deferred Maps
+        self.mappings: Mappings = Mappings()
 
         # * Drawn Maps
         self.maps: dict[Aspect, dict[Domain, dict[str, list[Domain]]]] = {}
@@ -497,12 +530,13 @@ class Model:
         # every component is handed the model
         value.model = self
 
-        if name in self.added:
+        if name in self._added:
             # do not allow overriding of components
             # throw error if name already exists
             raise ValueError(f"{name} already defined")
             # added is the list of all components that have been added to the model
         self.added.append(name)
+        self._added.add(name)
 
         # if not subset:
         #     # ignore subsets
@@ -524,9 +558,8 @@ class Model:
             "locations",
             "linkages",
         ]:
-            setattr(
-                self.program, collection, getattr(self.program, collection) | value.I
-            )
+            # the index set is updated once, when the program is finalized
+            self.program.grow(collection, value.I.members)
 
         # set aspect samples on the components
         if aspects:
@@ -734,7 +767,7 @@ class Model:
         :param bi: Whether the linkage is bidirectional. Defaults to False.
         :type bi: bool, optional
         """
-        if source - sink:
+        if self.space.edges.get((source, sink)):
             # if source and sink are already linked
             raise ValueError(
                 f"A link already defined between {source} and {sink}.\n"
@@ -744,6 +777,129 @@ class Model:
         link = Linkage(source=source, sink=sink, dist=dist, bi=bi, auto=True)
         setattr(self, f"{source.name}-{sink.name}", link)
 
+    def add_locations(
+        self,
+        names: list[str] | np.ndarray | DataFrame,
+        coords: list[tuple[float, float]] | np.ndarray | None = None,
+        label: str = "",
+    ) -> list[Location]:
+        """
+        Adds Locations in bulk
+
+        :param names: Names of the Locations, or a DataFrame with a name column
+            (else the index) and optionally lat and lon columns
+        :type names: list[str] | np.ndarray | DataFrame
+        :param coords: (latitude, longitude) of each Location. Defaults to None.
+        :type coords: list[tuple[float, float]] | np.ndarray, optional
+        :param label: Label of the Locations. Defaults to "".
+        :type label: str, optional
+
+        :returns: the Locations added
+        :rtype: list[Location]
+        """
+        if hasattr(names, "columns"):
+            # DataFrame
+            frame = names
+            if coords is None and {"lat", "lon"} <= set(frame.columns):
+                coords = frame[["lat", "lon"]].to_numpy()
+            names = frame["name"] if "name" in frame.columns else frame.index
+
+        names = [str(name) for name in names]
+
+        if coords is not None:
+            coords = [tuple(float(c) for c in coord) for coord in coords]
+            if len(coords) != len(names):
+                raise ValueError(
+                    f"{len(names)} locations but {len(coords)} coordinates given",
+                )
+        else:
+            coords = [None] * len(names)
+
+        locations = []
+        for name, coord in zip(names, coords):
+            loc = Location(label=label, coords=coord)
+            setattr(self, name, loc)
+            locations.append(loc)
+
+        logger.info("📍  Added %d locations", len(locations))
+        return locations
+
+    def add_links(
+        self,
+        source: list[str | Location] | np.ndarray | DataFrame,
+        sink: list[str | Location] | np.ndarray | None = None,
+        dist: list[float] | np.ndarray | None = None,
+        bi: bool = False,
+    ) -> list[Linkage]:
+        """
+        Adds Linkages in bulk, as Model.Link does for one
+
+        :param source: Source Locations (or their names),
+            or a DataFrame with source, sink and optionally dist columns
+        :type source: list[str | Location] | np.ndarray | DataFrame
+        :param sink: Sink Locations (or their names), not given with a DataFrame.
+            Defaults to None.
+        :type sink: list[str | Location] | np.ndarray, optional
+        :param dist: Distance of each Linkage. Defaults to None.
+        :type dist: list[float] | np.ndarray, optional
+        :param bi: Whether the linkages are bidirectional. Defaults to False.
+        :type bi: bool, optional
+
+        :returns: the Linkages added, reverse linkages not included
+        :rtype: list[Linkage]
+
+        :raises ValueError: If a DataFrame is given with sink, or the pairs
+            are linked already or repeated. Nothing is added if so.
+        """
+        if hasattr(source, "columns"):
+            # DataFrame
+            if sink is not None:
+                raise ValueError("sink is read from the DataFrame, do not pass it too")
+            frame = source
+            sink = frame["sink"]
+            if dist is None and "dist" in frame.columns:
+                dist = frame["dist"]
+            source = frame["source"]
+
+        def _loc(loc: str | Location) -> Location:
+            if isinstance(loc, Location):
+                return loc
+            return getattr(self, str(loc))
+
+        sources = [_loc(loc) for loc in source]
+        sinks = [_loc(loc) for loc in sink]
+        if len(sources) != len(sinks):
+            raise ValueError(f"{len(sources)} sources but {len(sinks)} sinks given")
+
+        dists = [0] * len(sources) if dist is None else [float(d) for d in dist]
+        if len(dists) != len(sources):
+            raise ValueError(f"{len(sources)} linkages but {len(dists)} distances given")
+
+        # every pair is checked before any is added
+        # so that a failure does not leave some of them linked
+        pairs: set[tuple[Location, Location]] = set()
+        for src, snk in zip(sources, sinks):
+            for pair in [(src, snk), (snk, src)] if bi else [(src, snk)]:
+                if self.space.edges.get(pair):
+                    raise ValueError(
+                        f"A link already defined between {pair[0]} and {pair[1]}.\n"
+                        "For multiple linkages with different attributes, use model.named_link = Link(...)",
+                    )
+                if pair in pairs:
+                    raise ValueError(
+                        f"Link between {pair[0]} and {pair[1]} given more than once",
+                    )
+                pairs.add(pair)
+
+        links = []
+        for src, snk, d in zip(sources, sinks, dists):
+            link = Linkage(source=src, sink=snk, dist=d, bi=bi, auto=True)
+            setattr(self, f"{src.name}-{snk.name}", link)
+            links.append(link)
+
+        logger.info("🔗  Added %d linkages", len(links))
+        return links
+
     def TemporalScales(self, discretizations: list[int], names: list[str]):
         """
         This is an easy way to define multiple time periods (scales)
@@ -830,6 +986,28 @@ class Model:
         """Solution"""
         return self.program.output(n_sol=n_sol, slack=slack, compare=compare)
 
+    def compile(self, categories: tuple[str, ...] | None = None) -> Sparse:
+        """
+        Compiles the program of the Model into sparse matrices
+
+        :param categories: Only compile constraints in these categories. Defaults to None (all).
+        :type categories: tuple[str, ...] | None, optional
+
+        :return: objective, CSR constraint matrix, bounds and index maps
+        :rtype: Sparse
+        """
+        self.compiled = self.program.to_sparse(categories)
+        return self.compiled
+
+    def build_report(self) -> dict[str, dict[str, int | float]]:
+        """
+        Summary of where build time went, most expensive kind first
+
+        :return: {kind: {count, time, mean, share}}
+        :rtype: dict[str, dict[str, int | float]]
+        """
+        return self.tracer.report()
+
     # ------------------------------------------------------------------------
     # * Solution Prep, Generation, and  Handling
     # ------------------------------------------------------------------------
@@ -842,6 +1020,125 @@ class Model:
         self.network.locate(*operations)
 
     # * Optimization
+    def opt(
+        self,
+        using: Literal["gurobi", "highs"] | None = None,
+        warm: bool | None = None,
+    ):
+        """
+        Optimize the program for the objective set last
+
+        :param using: Solver backend. Defaults to None, which uses Model.solver.
+        :type using: Literal["gurobi", "highs"] | None, optional
+        :param warm: Warm start from the last solve. Defaults to None, which uses Model.warm.
+        :type warm: bool | None, optional
+
+        :returns: the program and the solver, False if no solution was found.
+            None if solved cold through gurobi, which gana does not report
+        :rtype: tuple[Program, str] | bool | None
+        """
+        return self.program.opt(using=using, warm=warm)
+
+    def pareto(
+        self,
+        objectives: list[Sample],
+        points: int = 10,
+        outputs: list[Aspect] | None = None,
+        workers: int = 1,
+    ) -> DataFrame:
+        """
+        Generates the Pareto front using the epsilon-constraint method
+
+        :param objectives: Samples to minimize, the first is the primary objective
+        :type objectives: list[Sample]
+        :param points: Number of epsilon values per secondary objective. Defaults to 10.
+        :type points: int
+        :param outputs: Aspects whose values are added to the frame. Defaults to None.
+        :type outputs: list[Aspect] | None
+        :param workers: Number of processes to solve the grid with. Defaults to 1 (serial).
+        :type workers: int
+
+        :return: a row per feasible grid point, a column per objective and output
+        :rtype: DataFrame
+        """
+        return pareto(self, objectives, points, outputs, workers)
+
+    def run_scenarios(
+        self,
+        scenarios: (
+            list[dict[tuple[Sample, str], float | list[float]]]
+            | dict[int, dict[tuple[Sample, str], float | list[float]]]
+        ),
+        workers: int = 1,
+    ) -> Columnar:
+        """
+        Solves the Model under many scenarios, sharing one compiled program.
+        A scenario gives new values to binds, e.g.
+        {(m.power.release(m.l0, m.q), "lb"): [...], (m.usd.spend(m.wf.operate), "calc"): 50}
+
+        :param scenarios: {(sample, rel): values} per scenario, keyed by ID if a dict
+        :type scenarios: list[dict] | dict[int, dict]
+        :param workers: Number of processes to solve with. Defaults to 1 (serial).
+        :type workers: int
+
+        :return: values of each aspect, a row per scenario (nan if infeasible)
+        :rtype: Columnar
+        """
+        return run_scenarios(self, scenarios, workers)
+
+    def stochastic(
+        self,
+        scenarios: (
+            list[dict[tuple[Sample, str], float | list[float]]]
+            | dict[int, dict[tuple[Sample, str], float | list[float]]]
+        ),
+        probabilities: list[float] | dict[int, float] | None = None,
+        first_stage: tuple[str, ...] = FIRST_STAGE,
+        benders: bool = False,
+        workers: int = 1,
+    ) -> Stochastic:
+        """
+        Solves the Model as a two-stage stochastic program.
+        Design aspects (first stage) are shared by all scenarios,
+        the others are indexed by scenario, the expected cost is minimized
+
+        :param scenarios: {(sample, rel): values} per scenario, keyed by ID if a dict
+        :type scenarios: list[dict] | dict[int, dict]
+        :param probabilities: Probability of each scenario. Defaults to None (equally likely).
+        :type probabilities: list[float] | dict[int, float] | None
+        :param first_stage: Aspects decided in the first stage. Defaults to capacity and inventory sizing.
+        :type first_stage: tuple[str, ...]
+        :param benders: Use Benders decomposition instead of the deterministic equivalent. Defaults to False.
+        :type benders: bool
+        :param workers: Number of processes to solve the scenarios with (Benders). Defaults to 1.
+        :type workers: int
+
+        :return: expected cost and the values of each aspect, a row per scenario
+        :rtype: Stochastic
+        """
+        program = Stochastic(self, scenarios, probabilities, first_stage)
+        if benders:
+            return program.benders(workers=workers)
+        return program.solve()
+
+    def rolling(self, window: int, overlap: int = 0, periods: Periods | None = None):
+        """
+        Optimizes the objective set last (e.g. m.usd.spend.obj()) over a rolling horizon.
+        Windows of the periods are solved in turn, each fixing its decisions
+        and carrying states (inventory) forward to the next
+
+        :param window: Periods in a window
+        :type window: int
+        :param overlap: Periods solved again by the next window. Defaults to 0.
+        :type overlap: int
+        :param periods: Periods to roll over. Defaults to None, the densest periods.
+        :type periods: Periods | None
+
+        :returns: the program and the solver, False if a window is infeasible
+        :rtype: tuple[Program, str] | bool
+        """
+        return self.program.rolling(window, overlap, periods)
+
     def solve(
         self,
         using: Literal[
@@ -898,15 +1195,97 @@ class Model:
         """
         return self.program.eval(*theta_vals, n_sol=n_sol, roundoff=roundoff)
 
+    def eval_many(
+        self, thetas: np.ndarray, n_sol: int = 0, workers: int = 1
+    ) -> np.ndarray:
+        """
+        Evaluate the multiparametric solution at many theta points at once
+
+        :param thetas: values for the parametric variables, one point per row
+        :type thetas: np.ndarray
+        :param n_sol: solution number to evaluate, defaults to 0
+        :type n_sol: int, optional
+        :param workers: number of processes to split the points across, defaults to 1
+        :type workers: int, optional
+
+        :return: values of the variables, one row per point (nan if infeasible)
+        :rtype: np.ndarray
+        """
+        return self.program.eval_many(thetas, n_sol=n_sol, workers=workers)
+
     # * Saving
-    def save(self, as_type: str = "dill"):
-        """Save the Model to a file"""
+    def save(self, as_type: Literal["dill", "npy", "parquet"] = "dill"):
+        """
+        Save the Model to a file
+
+        dill pickles the solutions to <name>.energia.
+        npy and parquet write the values of each aspect column-wise,
+        with a table indexing the columns, to a directory <name>.columns
+        of .npy files, or to <name>.parquet.
+        These can be read back (memory-mapped) using load_solution
+
+        :param as_type: Format to save in. Defaults to "dill".
+        :type as_type: Literal["dill", "npy", "parquet"]
+        """
         if as_type == "dill":
             with open(self.name + ".energia", "wb") as f:
                 dump(self.solution, f)
+        elif as_type in ("npy", "parquet"):
+            # multiparametric solutions are not columnar, only dill saves these
+            solutions = {
+                n: self.solution[n] for n in self.program.sol_types["MIP"]
+            }
+            columnar = Columnar.gather(solutions)
+            if as_type == "npy":
+                columnar.to_npy(f"{self.name}.columns")
+            else:
+                columnar.to_parquet(f"{self.name}.parquet")
         else:
             raise ValueError(f"Unknown type {as_type} for saving the model")
 
+    def snapshot(self, path: str | None = None):
+        """
+        Write the built Model to a file, so that it can be restored
+        without building it again.
+        The program goes along with the ledgers, i.e. dispositions, balances,
+        maps, cookbook, registry and convmatrix
+
+        :param path: File to write to. Defaults to <name>.snapshot.
+        :type path: str | None, optional
+        """
+        snapshot(self, path or f"{self.name}.snapshot")
+
+    @staticmethod
+    def restore(path: str) -> Model:
+        """
+        Restore a Model written by snapshot
+
+        :param path: File to read
+        :type path: str
+
+        :return: the Model, as it was built
+        :rtype: Model
+        """
+        return restore(path)
+
+    def load_solution(self, path: str | None = None, mmap: bool = True) -> Columnar:
+        """
+        Load solutions saved as npy or parquet
+
+        :param path: Directory or file to load. Defaults to <name>.columns, else <name>.parquet.
+        :type path: str | None, optional
+        :param mmap: Memory-map the values instead of reading them. Defaults to True.
+        :type mmap: bool, optional
+
+        :return: values of each aspect, a row per solution
+        :rtype: Columnar
+        """
+        if path is None:
+            path = f"{self.name}.columns"
+            if not os.path.exists(path):
+                path = f"{self.name}.parquet"
+        return Columnar.load(path, mmap=mmap)
+
     # ------------------------------------------------------------------------
     # * Default Components
     # ------------------------------------------------------------------------
@@ -980,6 +1359,13 @@ class Model:
             value.name = name
             self.units.append(value)
 
+        if isinstance(value, Periods) and self.time.aggregation is not None:
+            # representative periods are only made for the dense periods
+            raise ValueError(
+                f"{self} is aggregated into representative periods, "
+                f"{name} can not be nested in the horizon",
+            )
+
         # map to representation and collection
         for cls, updates in self.familytree.items():
             if isinstance(value, cls):
@@ -990,8 +1376,7 @@ class Model:
         # Special linkage instructions
         if isinstance(value, Linkage):
 
-            self.space.sources.append(value.source)
-            self.space.sinks.append(value.sink)
+            self.space.adjoin(value)
 
             if value.bi:
                 # if bidirectional, set the reverse linkage
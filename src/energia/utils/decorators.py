@@ -22,71 +22,135 @@ def timer(
     level=logging.INFO,
 ):
     """
-    Logs execution time and optionally shows a full computation using function arguments and result.
+    Counts and times the execution on the tracer of the Model (if any),
+    and logs a message if the logger is listening at the level.
+    The message is only formatted if it will be logged.
     """
 
     def decorator(func):
+        _kind = kind or func.__name__
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start = time.time()
+            tracer = getattr(getattr(args[0], "model", None), "tracer", None)
+            tracing = tracer is not None and tracer.enabled
+            logging_ = logger.isEnabledFor(level)
+
+            if not tracing and not logging_:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
             # returns the result if successful, else False
             result = func(*args, **kwargs)
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
 
             if result is not False:
+                if tracing:
+                    tracer.record(_kind, start, elapsed, result)
 
-                if kind == 'balance-update':
-
-                    msg = f"⚖   Updated {result[0].commodity} balance with {result[1]}{result[0]}"
-
-                elif kind == 'balance-init':
-
-                    msg = f"⚖   Initiated {result.commodity} balance in ({result.space}, {result.time})"
-
-                elif kind == 'map':
-                    msg = f"🧭  Mapped {(result[1] - result[2])[0]} for {result[0]} {result[1]} ⟺ {result[2]}"
-
-                elif kind == 'bind':
-                    sample = result[0]
-                    aspect = sample.aspect
-                    domain = sample.domain
-                    rel = result[1]
-
-                    if rel == "ub":
-                        rel = "≤"
-                    elif rel == "lb":
-                        rel = "≥"
-                    else:
-                        rel = "="
-
-                    msg = f"🔗  Bound [{rel}] {domain.primary} {aspect} in ({domain.space}, {domain.time})"
+                if logging_:
+                    logger.log(
+                        level,
+                        f"{message(kind, func, result):<75} ⏱ {elapsed:.4f} s",
+                    )
 
-                elif kind == 'assume-capacity':
-                    msg = f"💡  Assumed {result[0]} capacity unbounded in ({result[1]}, {result[2]})"
+            return result
 
-                elif kind == 'assume-operate':
-                    msg = f"💡  Assumed {result[0]} operate bounded by capacity in ({result[1]}, {result[2]})"
-
-                elif kind == 'assume-inventory':
-                    msg = f"💡  Assumed {result[0]} inventory bounded by capacity in ({result[1]}, {result[2]})"
-
-                elif kind == 'locate':
-                    msg = f"🌍  Located {result[0]} in {', '.join([str(s) for s in result[1]])}"
-
-                elif kind == 'production':
-                    msg = f"🏭  Operating streams introduced for {result[0]} in {', '.join([str(s) for s in result[1]])}"
+        return wrapper
 
-                elif kind == 'construction':
-                    msg = f"🏗   Construction streams introduced for {result[0]} in {', '.join([str(s) for s in result[1]])}"
+    return decorator
 
-                else:
-                    msg = f"  Executed {func.__name__}"
 
-                logger.log(
-                    level,
-                    f"{msg:<75} ⏱ {elapsed:.4f} s",
-                )
+# relations of bind constraints, as written in the messages
+RELATIONS = {"ub": "≤", "lb": "≥"}
+
+
+def _bind(result) -> tuple:
+    """(relation, primary, aspect, space, time) of a bind"""
+    sample, rel = result[0], result[1]
+    domain = sample.domain
+    return (
+        RELATIONS.get(rel, "="),
+        domain.primary,
+        sample.aspect,
+        domain.space,
+        domain.time,
+    )
+
+
+def _located(result) -> tuple:
+    """(operation, spaces) of a locate"""
+    return result[0], ", ".join([str(s) for s in result[1]])
+
+
+# {kind: (message, arguments of the message from the result)}
+MESSAGES = {
+    "balance-update": (
+        "⚖   Updated {0.commodity} balance with {1}{0}",
+        tuple,
+    ),
+    "balance-init": (
+        "⚖   Initiated {0.commodity} balance in ({0.space}, {0.time})",
+        lambda result: (result,),
+    ),
+    "map": (
+        "🧭  Mapped {0} for {1} {2} ⟺ {3}",
+        lambda result: ((result[1] - result[2])[0], *result),
+    ),
+    "bind": (
+        "🔗  Bound [{0}] {1} {2} in ({3}, {4})",
+        _bind,
+    ),
+    "rebind": (
+        "🔁  Updated [{0}] {1} {2} in ({3}, {4})",
+        _bind,
+    ),
+    "assume-capacity": (
+        "💡  Assumed {0} capacity unbounded in ({1}, {2})",
+        tuple,
+    ),
+    "assume-operate": (
+        "💡  Assumed {0} operate bounded by capacity in ({1}, {2})",
+        tuple,
+    ),
+    "assume-inventory": (
+        "💡  Assumed {0} inventory bounded by capacity in ({1}, {2})",
+        tuple,
+    ),
+    "locate": (
+        "🌍  Located {0} in {1}",
+        _located,
+    ),
+    "production": (
+        "🏭  Operating streams introduced for {0} in {1}",
+        _located,
+    ),
+    "construction": (
+        "🏗   Construction streams introduced for {0} in {1}",
+        _located,
+    ),
+    "optimize": (
+        "✅  {0} optimized using {1}. Display using .output()",
+        tuple,
+    ),
+}
+
+
+def message(kind: str | None, func, result) -> str:
+    """
+    Formats the log message for a traced function
 
-        return wrapper
+    :param kind: Kind of event
+    :type kind: str | None
+    :param func: Function that was traced
+    :type func: Callable
+    :param result: What the function returned
+    :type result: Any
 
-    return decorator
+    :returns: message
+    :rtype: str
+    """
+    if kind not in MESSAGES:
+        return f"  Executed {func.__name__}"
+    fmt, args = MESSAGES[kind]
+    return fmt.format(*args(result))
@@ -0,0 +1,95 @@
+"""Writes to gana functions in place
+
+Binds are updated (Bind.rewrite) and sums over representative periods
+are weighed (Map) without writing the constraints again.
+gana has no public way to do this, so its private fields are written here,
+and only here. These have been checked against one version of gana,
+others are refused rather than written to wrongly
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from importlib.metadata import version
+from typing import TYPE_CHECKING
+
+from gana.sets.cases import FCase
+
+if TYPE_CHECKING:
+    from gana.sets.function import F
+
+# the version of gana whose private fields are written
+GANA = "1.0.7"
+
+
+@cache
+def _checked():
+    """Checks, once, that the installed gana is the one written to"""
+    installed = version("gana")
+    if installed != GANA:
+        raise RuntimeError(
+            f"Constraints are updated in place for gana {GANA}, {installed} is installed",
+        )
+
+
+def _forget(f: F):
+    """Drops the matrices gana keeps for the function (and its parent)"""
+    f._matrix = {}
+    if f.parent is not None:
+        f.parent._matrix = {}
+
+
+def set_constant(f: F, B: float):
+    """
+    Sets the constant of a function (the right hand side of its row)
+
+    :param f: Function of a row
+    :type f: F
+    :param B: Constant
+    :type B: float
+    """
+    _checked()
+    f.B = B
+    if f.parent is not None:
+        # the parent keeps the constants of its rows
+        f.parent.B[f.pos] = B
+    _forget(f)
+
+
+def set_coefficient(f: F, n: int, a: float):
+    """
+    Sets the coefficient of a variable in a function
+
+    :param f: Function of a row
+    :type f: F
+    :param n: Position of the variable in the function
+    :type n: int
+    :param a: Coefficient
+    :type a: float
+    """
+    _checked()
+    f.A[n] = a
+    _forget(f)
+
+
+def weigh(f: F, weights: list[float]):
+    """
+    Weighs the terms of a sum (sigma)
+
+    :param f: Sum over an index
+    :type f: F
+    :param weights: Weight of each element of the index
+    :type weights: list[float]
+    """
+    _checked()
+    if f.case == FCase.SUM:
+        f.A = [list(weights) for _ in f.A]
+        for child in f._:
+            child.A = list(weights)
+            child._matrix = {}
+    else:
+        # sums of two are written as v_0 + v_1
+        for child in f._:
+            child.A = [a * w for a, w in zip(child.A, weights)]
+            child._matrix = {}
+    f._matrix = {}
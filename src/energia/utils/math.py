@@ -1,8 +1,14 @@
 """Utilities to perform mathematical operations"""
 
+from heapq import heapify, heappop, heappush
 from math import erf, exp, pi, sqrt
 
 import numpy
+from scipy.cluster.vq import kmeans2
+from scipy.spatial import cKDTree
+
+# mean radius of the earth, in km
+EARTH_RADIUS = 6371.0088
 
 
 def norm_constant(p, mu, sigma) -> float:
@@ -39,6 +45,90 @@ def find_euclidean_distance(a: list, b: list) -> float:
     return distance_
 
 
+def neighbours(
+    coords: numpy.ndarray,
+    k: int | None = None,
+    radius: float | None = None,
+    metric: str = "haversine",
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Finds pairs of neighbouring points using a KD-tree,
+    the k nearest to each point, those within a radius, or the k nearest within a radius
+
+    For haversine, points are (latitude, longitude) in degrees,
+    placed on the unit sphere, where the chord orders points as the great circle does
+
+    :param coords: a row of coordinates per point
+    :type coords: numpy.ndarray
+    :param k: number of nearest neighbours of each point, defaults to None
+    :type k: int, optional
+    :param radius: largest distance between neighbours (km for haversine), defaults to None
+    :type radius: float, optional
+    :param metric: haversine or euclidean, defaults to "haversine"
+    :type metric: str, optional
+
+    :returns: pairs (i, j) with i < j, and the distance between each
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    if k is None and radius is None:
+        raise ValueError("Give k, radius, or both")
+
+    coords = numpy.asarray(coords, dtype=float)
+    n = len(coords)
+
+    if metric == "haversine":
+        lat, lon = numpy.radians(coords[:, 0]), numpy.radians(coords[:, 1])
+        points = numpy.column_stack(
+            (
+                numpy.cos(lat) * numpy.cos(lon),
+                numpy.cos(lat) * numpy.sin(lon),
+                numpy.sin(lat),
+            )
+        )
+        # a distance on the surface, as a chord through the sphere
+        bound = (
+            None
+            if radius is None
+            else 2 * numpy.sin(min(radius / EARTH_RADIUS, pi) / 2)
+        )
+    elif metric == "euclidean":
+        points = coords
+        bound = radius
+    else:
+        raise ValueError(f"Unknown metric {metric}, use haversine or euclidean")
+
+    tree = cKDTree(points)
+
+    if k is None:
+        pairs = tree.query_pairs(bound, output_type="ndarray")
+    else:
+        # the nearest is the point itself
+        k_ = min(k + 1, n)
+        _, nearest = tree.query(
+            points,
+            k=k_,
+            distance_upper_bound=numpy.inf if bound is None else bound,
+        )
+        nearest = nearest.reshape(n, k_)
+        i = numpy.repeat(numpy.arange(n), k_)
+        j = nearest.ravel()
+        # misses (beyond the radius) are given as n
+        keep = (j < n) & (i != j)
+        pairs = numpy.unique(
+            numpy.sort(numpy.column_stack((i[keep], j[keep])), axis=1), axis=0
+        )
+
+    pairs = pairs.reshape(-1, 2).astype(int)
+    pairs = pairs[numpy.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    distances = numpy.linalg.norm(points[pairs[:, 0]] - points[pairs[:, 1]], axis=1)
+    if metric == "haversine":
+        # chord to great circle
+        distances = 2 * EARTH_RADIUS * numpy.arcsin(numpy.clip(distances / 2, 0, 1))
+
+    return pairs, distances
+
+
 def generate_connectivity_matrix(scale_len) -> numpy.array:
     """
     Generates a connectivity matrix to maintain chronology [..1,0,1..]
@@ -93,3 +183,94 @@ def normalize(data: list, how: str = "max") -> list:
 
     if how == "max":
         return [normalize(i) if isinstance(i, list) else i / max(data) for i in data]
+
+
+def cluster(features: numpy.ndarray, k: int, method: str = "kmeans") -> numpy.ndarray:
+    """
+    Clusters the rows of features, e.g. days of hourly profiles
+
+    kmeans clusters without regard to order,
+    hierarchical (Ward) only merges neighbouring rows,
+    so that chronology is maintained
+
+    :param features: a row per observation (e.g. day)
+    :type features: numpy.ndarray
+    :param k: number of clusters
+    :type k: int
+    :param method: kmeans or hierarchical, defaults to "kmeans"
+    :type method: str, optional
+
+    :returns: cluster of each row, numbered in order of first appearance
+    :rtype: numpy.ndarray
+    """
+    n = len(features)
+    if k >= n:
+        return numpy.arange(n)
+
+    if method == "kmeans":
+        _, labels = kmeans2(features, k, minit="++", seed=0)
+
+    elif method == "hierarchical":
+        labels = ward_chain(features, k)
+
+    else:
+        raise ValueError(f"Unknown method {method}, expected kmeans or hierarchical")
+
+    # clusters left empty are dropped
+    _, first = numpy.unique(labels, return_index=True)
+    order = {c: i for i, c in enumerate(labels[numpy.sort(first)])}
+    return numpy.array([order[c] for c in labels])
+
+
+def ward_chain(features: numpy.ndarray, k: int) -> numpy.ndarray:
+    """
+    Ward clustering of a sequence, where only neighbouring segments are merged.
+    Segments are kept as a linked list and the costs of merging neighbours in a heap,
+    entries made stale by a merge are skipped, so this is O(n log n)
+
+    :param features: a row per observation (e.g. day), in order
+    :type features: numpy.ndarray
+    :param k: number of clusters
+    :type k: int
+
+    :returns: cluster of each row, numbered in order
+    :rtype: numpy.ndarray
+    """
+    n = len(features)
+    sums = numpy.array(features, dtype=float)
+    sizes = numpy.ones(n)
+    # neighbours of each segment, n if there is none to the right
+    left, right = list(range(-1, n - 1)), list(range(1, n + 1))
+    # segments start at the row they are kept under
+    starts = numpy.ones(n, dtype=bool)
+    # bumped when a segment grows, to tell stale heap entries
+    versions = [0] * n
+
+    def entry(a: int, b: int) -> tuple[float, int, int, int, int]:
+        """Increase in the within cluster sum of squares if a and b merge"""
+        d = sums[a] / sizes[a] - sums[b] / sizes[b]
+        cost = sizes[a] * sizes[b] / (sizes[a] + sizes[b]) * float(d @ d)
+        return cost, a, b, versions[a], versions[b]
+
+    heap = [entry(a, a + 1) for a in range(n - 1)]
+    heapify(heap)
+
+    for _ in range(n - k):
+        while True:
+            _, a, b, v_a, v_b = heappop(heap)
+            if starts[a] and starts[b] and (versions[a], versions[b]) == (v_a, v_b):
+                break
+
+        # b is merged into a, its neighbour to the left
+        sums[a] += sums[b]
+        sizes[a] += sizes[b]
+        starts[b] = False
+        versions[a] += 1
+        right[a] = right[b]
+        if right[a] < n:
+            left[right[a]] = a
+            heappush(heap, entry(a, right[a]))
+        if left[a] >= 0:
+            heappush(heap, entry(left[a], a))
+
+    return numpy.cumsum(starts) - 1
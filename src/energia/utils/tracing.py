@@ -0,0 +1,114 @@
+"""Build tracing"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+
+class Event(NamedTuple):
+    """
+    A structured build event
+
+    :param kind: Kind of event, e.g. bind, map, balance-init
+    :type kind: str
+    :param start: Performance counter at the start of the event
+    :type start: float
+    :param elapsed: Time taken in seconds
+    :type elapsed: float
+    :param result: What the traced function returned, formatted only if read
+    :type result: Any
+    """
+
+    kind: str
+    start: float
+    elapsed: float
+    result: Any
+
+
+@dataclass
+class Tracer:
+    """
+    Counts and times the steps taken to build a Model
+
+    :param enabled: True if build steps are counted and timed. Defaults to False.
+    :type enabled: bool
+    :param size: Number of recent events to keep, none are kept if 0. Defaults to 0.
+    :type size: int
+
+    :ivar counts: Number of events of each kind.
+    :vartype counts: dict[str, int]
+    :ivar times: Cumulative time (s) spent on each kind of event.
+    :vartype times: dict[str, float]
+    :ivar events: Ring buffer of the most recent events, None if not kept.
+    :vartype events: deque[Event] | None
+    """
+
+    enabled: bool = False
+    size: int = 0
+
+    counts: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    times: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    events: deque[Event] | None = field(default=None)
+
+    def __post_init__(self):
+        self.keep(self.size)
+
+    def keep(self, size: int):
+        """
+        Keeps the most recent events in a ring buffer
+
+        :param size: Number of events to keep, 0 stops keeping events
+        :type size: int
+        """
+        self.size = size
+        self.events = deque(self.events or (), maxlen=size) if size else None
+
+    def record(self, kind: str, start: float, elapsed: float, result: Any = None):
+        """
+        Records an event
+
+        :param kind: Kind of event
+        :type kind: str
+        :param start: Performance counter at the start of the event
+        :type start: float
+        :param elapsed: Time taken in seconds
+        :type elapsed: float
+        :param result: What the traced function returned
+        :type result: Any
+        """
+        self.counts[kind] += 1
+        self.times[kind] += elapsed
+        if self.events is not None:
+            self.events.append(Event(kind, start, elapsed, result))
+
+    def clear(self):
+        """Resets the counters, timers and events"""
+        self.counts.clear()
+        self.times.clear()
+        if self.events is not None:
+            self.events.clear()
+
+    def report(self) -> dict[str, dict[str, int | float]]:
+        """
+        Summary of where build time went, most expensive kind first.
+        Times are inclusive, a locate includes the binds it writes
+
+        :returns: {kind: {count, time, mean, share}}
+        :rtype: dict[str, dict[str, int | float]]
+        """
+        total = sum(self.times.values())
+        return {
+            kind: {
+                "count": self.counts[kind],
+                "time": time,
+                "mean": time / self.counts[kind],
+                "share": time / total if total else 0.0,
+            }
+            for kind, time in sorted(
+                self.times.items(),
+                key=lambda x: x[1],
+                reverse=True,
+            )
+        }
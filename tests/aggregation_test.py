@@ -0,0 +1,94 @@
+"""Tests for time series aggregation"""
+
+import numpy as np
+import pytest
+
+from energia import Currency, Model, Periods, Process, Resource, Storage
+from energia.utils.math import cluster, ward_chain
+
+N, L = 6, 4
+RNG = np.random.default_rng(0)
+DEMAND = (0.4 + 0.3 * RNG.random(N * L)).round(3).tolist()
+WIND = (0.3 + 0.6 * RNG.random(N * L)).round(3).tolist()
+
+
+def build(k: int | None = None, method: str = "kmeans") -> Model:
+    m = Model("aggregated")
+    if k is None:
+        m.h = Periods()
+        m.y = (N * L) * m.h
+    else:
+        m.time.aggregate(
+            {"demand": DEMAND, "wind": WIND}, k=k, length=L, method=method, names=("h", "y")
+        )
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind"])
+    _ = m.wind.consume <= 100000
+    _ = m.power.release.prep(100) >= DEMAND
+    m.wf = Process()
+    _ = m.wf(m.power) == -1 * m.wind
+    _ = m.wf.capacity.x <= 500
+    _ = m.wf.capacity.x >= 10
+    _ = m.wf.operate.prep(norm=True) <= WIND
+    _ = m.usd.spend(m.wf.capacity) == 1000
+    _ = m.usd.spend(m.wf.operate) == 5
+    m.lii = Storage()
+    _ = m.lii(m.power) == 0.9
+    _ = m.lii.capacity.x <= 500
+    _ = m.lii.capacity.x >= 1
+    _ = m.usd.spend(m.lii.capacity) == 300
+    m.network.locate(m.wf, m.lii)
+    return m
+
+
+def test_cluster():
+    features = np.array([[0.0], [0.1], [5.0], [5.1], [0.2], [0.1]])
+    assert cluster(features, 2).tolist() == [0, 0, 1, 1, 0, 0]
+    # neighbours only, chronology is kept
+    assert cluster(features, 3, "hierarchical").tolist() == [0, 0, 1, 1, 2, 2]
+    assert cluster(features, 6).tolist() == list(range(6))
+
+
+def test_ward_chain():
+    # merges the neighbouring segments which add the least to the sum of squares
+    features = np.array([[0.0], [0.1], [5.0], [5.1], [0.2], [0.1], [9.0]])
+    assert ward_chain(features, 4).tolist() == [0, 0, 1, 1, 2, 2, 3]
+    assert ward_chain(features, 1).tolist() == [0] * 7
+    assert ward_chain(features, 7).tolist() == list(range(7))
+
+
+def test_nested_periods():
+    m = build(k=2)
+    with pytest.raises(ValueError):
+        m.d = L * m.h
+
+
+def test_reduce():
+    m = build(k=2)
+    aggregation = m.time.aggregation
+    assert len(m.h.weights) == aggregation.k * L
+    assert sum(m.h.weights) == N * L
+    reduced = aggregation.reduce(DEMAND)
+    assert len(reduced) == aggregation.k * L
+    # weighted, the totals are kept
+    assert sum(w * d for w, d in zip(m.h.weights, reduced)) == pytest.approx(
+        sum(DEMAND)
+    )
+
+
+@pytest.mark.parametrize("method", ["kmeans", "hierarchical"])
+def test_full_resolution(method):
+    # as many representative periods as periods is the full program
+    chronological = build()
+    chronological.usd.spend.opt(using="highs")
+    aggregated = build(k=N, method=method)
+    aggregated.usd.spend.opt(using="highs")
+    assert aggregated.program.obj() == pytest.approx(chronological.program.obj())
+
+
+def test_representative_periods():
+    m = build(k=2, method="hierarchical")
+    m.usd.spend.opt(using="highs")
+    assert m.program.optimized
+    # inventory is carried across all periods
+    assert len(m.solution[0]._["inventory_level"]["values"]) == N
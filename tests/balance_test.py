@@ -0,0 +1,24 @@
+"""Tests for the general resource balance (GRB) ledger"""
+
+import pytest
+
+from energia.library.examples.energy import scheduling
+
+
+@pytest.fixture
+def m():
+    return scheduling()
+
+
+def test_deferred_balance(m):
+    # terms added after the GRB was written wait to be emitted
+    assert "power_l0_q_grb" in m.balances.pending
+    n_cons = len(m.program.constraints)
+
+    # reading the program whole emits the pending terms
+    _ = m.program.cons()
+    assert not m.balances.pending
+    # the constraint is updated in place, not added again
+    assert len(m.program.constraints) == n_cons
+    assert m.program.power_l0_q_grb.category == "Balance"
+    assert m.power.cons
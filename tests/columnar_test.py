@@ -0,0 +1,49 @@
+"""Tests for saving and loading solutions column-wise"""
+
+import numpy as np
+import pytest
+
+from energia.library.examples.energy import supermarket
+
+
+@pytest.fixture
+def m(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _m = supermarket()
+    _m.solver = "highs"
+    _m.usd.spend.opt()
+    _m.co2_vent.release.opt()
+    return _m
+
+
+def test_npy(m):
+    m.save(as_type="npy")
+    loaded = m.load_solution()
+    assert isinstance(loaded.values, np.memmap)
+    assert len(loaded) == 2
+    for n in range(2):
+        for aspect, data in m.solution[n]._.items():
+            assert loaded[n][aspect]["values"] == pytest.approx(data["values"])
+            assert loaded[n][aspect]["index"] == data["index"]
+    assert loaded("release")[1] == pytest.approx(m.solution[1]._["release"]["values"])
+
+
+def test_npy_read(m):
+    m.save(as_type="npy")
+    mapped, read = m.load_solution(), m.load_solution(mmap=False)
+    assert not isinstance(read.values, np.memmap)
+    assert np.array_equal(mapped.values, read.values)
+
+
+def test_parquet(m):
+    pytest.importorskip("pyarrow")
+    m.save(as_type="parquet")
+    loaded = m.load_solution(f"{m.name}.parquet")
+    assert loaded("release") == pytest.approx(
+        np.array([m.solution[n]._["release"]["values"] for n in range(2)])
+    )
+
+
+def test_unknown(m):
+    with pytest.raises(ValueError):
+        m.save(as_type="csv")
@@ -0,0 +1,44 @@
+"""Shared fixtures"""
+
+import pytest
+
+from energia import Currency, Model, Periods, Process, Resource, Storage
+
+
+def _build(demand: list[float], price: float) -> Model:
+    m = Model("updated")
+    m.q = Periods()
+    m.y = 4 * m.q
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind", "solar"])
+    _ = m.solar.consume(m.q) <= 100
+    _ = m.wind.consume <= 400
+    _ = m.power.release.prep(180) >= demand
+    m.wf = Process()
+    _ = m.wf(m.power) == -1 * m.wind
+    _ = m.wf.capacity.x <= 100
+    _ = m.wf.capacity.x >= 10
+    _ = m.wf.operate.prep(norm=True) <= [0.9, 0.8, 0.5, 0.7]
+    _ = m.usd.spend(m.wf.capacity) == 990637 + 3354
+    _ = m.usd.spend(m.wf.operate) == price
+    m.pv = Process()
+    _ = m.pv(m.power) == -1 * m.solar
+    _ = m.pv.capacity.x <= 100
+    _ = m.pv.capacity.x >= 10
+    _ = m.pv.operate.prep(norm=True) <= [0.6, 0.8, 0.9, 0.7]
+    _ = m.usd.spend(m.pv.capacity) == 567000 + 872046
+    _ = m.usd.spend(m.pv.operate) == 90000
+    m.lii = Storage()
+    _ = m.lii(m.power) == 0.9
+    _ = m.lii.capacity.x <= 100
+    _ = m.lii.capacity.x >= 10
+    _ = m.usd.spend(m.lii.capacity) == 1302182 + 41432
+    _ = m.usd.spend(m.lii.inventory) == 2000
+    m.network.locate(m.wf, m.pv, m.lii)
+    return m
+
+
+@pytest.fixture
+def build():
+    """Builds a design and scheduling model for a demand and price of operating wind"""
+    return _build
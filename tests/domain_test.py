@@ -0,0 +1,50 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from energia import Currency, Location, Model, Periods, Process
+from energia.modeling.indices.domain import Domain
+
+
+@pytest.fixture
+def m():
+    m_ = Model()
+    m_.usd = Currency()
+    m_.wf = Process()
+    m_.goa = Location()
+    m_.h = Periods()
+    return m_
+
+
+def test_intern(m):
+    args = {'commodity': m.usd, 'location': m.goa, 'periods': m.h}
+    capacity = m.wf.capacity
+    # a list of the same samples, made afresh, gives the same Domain
+    domain = Domain.intern(**args, samples=[capacity])
+    assert Domain.intern(**args, samples=[capacity]) is domain
+    assert domain.change({}) is domain
+    assert not domain - Domain(**args, samples=[capacity])
+    assert Domain.intern(**args) is not domain
+
+    # the index is shared, so it can not be changed
+    assert domain.index == (m.usd, m.goa, m.h, capacity.aspect, m.wf)
+    assert isinstance(domain.index, tuple)
+
+    # shared Domains can not be changed in place
+    with pytest.raises(FrozenInstanceError):
+        domain.location = None
+    copy = domain.copy()
+    copy.location = None
+    assert copy.location is None and domain.location == m.goa
+    assert Domain.intern(**args, samples=[capacity]) is domain
+
+
+def test_shared_samples(m):
+    # samples indexed alike share the Domain, which is frozen
+    first, second = m.wf.operate(m.h), m.wf.operate(m.h)
+    assert first.domain is not second.domain
+    assert first.space == second.space == m.network
+    assert first.domain is second.domain
+    with pytest.raises(FrozenInstanceError):
+        first.domain.location = m.goa
+    assert second.domain.location == m.network
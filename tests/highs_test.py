@@ -0,0 +1,49 @@
+"""Tests for the HiGHS (scipy) solver backend"""
+
+import pytest
+
+from energia.library.examples.energy import design_scheduling, supermarket
+
+
+@pytest.fixture
+def m():
+    _m = supermarket()
+    _m.solver = "highs"
+    _m.usd.spend.opt()
+    _m.co2_vent.release.opt()
+    _m._.lb(sum(_m._.consume))
+    return _m
+
+
+def test_highs_moo(m):
+    assert len(m.solution) == 3
+    assert m.solution[0]._['release']['values'] == pytest.approx(
+        [1799.9856001185253, 2516.6666666717515, 999.9999999999854, 100.00000000018477]
+    )
+    assert m.solution[0]._['x_capacity']['values'] == pytest.approx(
+        [0.0, 1.0, 0.0, 0.0]
+    )
+    # co2 release is minimized in the second solve, spend has alternative optima
+    assert sum(m.solution[1]._['release']['values']) == pytest.approx(
+        sum([1799.9856001151993, 2516.6666666666665, 1000.0, 100.0])
+    )
+
+
+def test_highs_matches_gurobi():
+    a, b = design_scheduling(), design_scheduling()
+    a.usd.spend.opt(using="gurobi")
+    b.usd.spend.opt(using="highs")
+    assert b.program.obj() == pytest.approx(a.program.obj())
+    for aspect in ["capacity", "operate", "release"]:
+        assert b.solution[0]._[aspect]['values'] == pytest.approx(
+            a.solution[0]._[aspect]['values'], abs=1e-6
+        )
+
+
+def test_highs_returns():
+    m = design_scheduling()
+    m.usd.spend.obj()
+    assert m.program.opt(using="highs") == (m.program, "highs")
+    # returned all the way up
+    assert m.opt(using="highs") == (m.program, "highs")
+    assert m.usd.spend.opt(using="highs") == (m.program, "highs")
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
+from pandas import DataFrame
 
-from energia import Unit, Linkage, Location, Model
+from energia import Currency, Linkage, Location, Model, Resource, Transport, Unit
 
 
 @pytest.fixture
@@ -43,3 +45,116 @@ def test_link(m):
     assert m.htown.links(m.sd) == m.sd.links(m.htown) == [m.grid]
     assert m.htown.connected(m.sd)
     assert not m.htown.connected(m.mum)
+
+
+def test_adjacency(m):
+    assert list(m.space.out_edges(m.htown)) == [m.grid]
+    assert list(m.space.in_edges(m.htown)) == []
+    assert list(m.space.out_edges(m.ny)) == [m.sea]
+    assert list(m.space.in_edges(m.ny)) == [-m.sea]
+    assert m.space.edges[(m.mum, m.ny)] == [-m.sea]
+    assert m.ny - m.mum == m.sea
+    assert m.sd - m.htown is None
+    with pytest.raises(ValueError):
+        m.Link(m.htown, m.sd)
+    m.Link(m.sd, m.htown)
+    assert m.htown.links(m.sd, print_link=False) == [m.grid, m.space.linkages[-1]]
+
+
+def test_bulk():
+    looped = Model()
+    looped.declare(Location, ['a', 'b', 'c'])
+    looped.Link(looped.a, looped.b, dist=1)
+    looped.Link(looped.b, looped.c, dist=2)
+
+    bulk = Model()
+    locs = bulk.add_locations(
+        DataFrame({'name': ['a', 'b', 'c'], 'lat': [0, 1, 2], 'lon': [3, 4, 5]})
+    )
+    assert locs == [bulk.a, bulk.b, bulk.c]
+    assert bulk.b.coords == (1.0, 4.0)
+    links = bulk.add_links(np.array(['a', 'b']), [bulk.b, bulk.c], dist=[1, 2])
+    assert links == [bulk.space.linkages[0], bulk.space.linkages[1]]
+    bulk.add_links(DataFrame({'source': ['c'], 'sink': ['a'], 'dist': [3]}), bi=True)
+    assert [l.name for l in bulk.space.linkages] == ['a-b', 'b-c', 'c-a', 'a-c']
+    assert bulk.a.links(bulk.c, print_link=False) == [bulk.space.linkages[2], -bulk.space.linkages[2]]
+
+    with pytest.raises(ValueError):
+        bulk.add_links(['a'], ['b'])
+    with pytest.raises(ValueError):
+        bulk.add_locations(['d', 'e'], coords=[(0, 0)])
+
+    # elements are registered on the program as they would be one at a time
+    looped.Link(looped.c, looped.a, dist=3, bi=True)
+    assert {i.name for i in bulk.program.indices} == {
+        i.name for i in looped.program.indices
+    }
+
+
+def test_bulk_atomic():
+    m = Model()
+    m.declare(Location, ['a', 'b', 'c'])
+    m.Link(m.b, m.c)
+
+    # nothing is linked if any pair fails
+    with pytest.raises(ValueError):
+        m.add_links(['a', 'b'], ['b', 'c'])
+    with pytest.raises(ValueError):
+        m.add_links(['a', 'c', 'a'], ['b', 'a', 'b'])
+    with pytest.raises(ValueError):
+        m.add_links(['a', 'b'], ['b', 'a'], bi=True)
+    with pytest.raises(ValueError):
+        m.add_links(DataFrame({'source': ['a'], 'sink': ['b']}), ['c'])
+    assert [l.name for l in m.space.linkages] == ['b-c']
+
+    m.add_links(['a', 'c'], ['b', 'a'])
+    assert [l.name for l in m.space.linkages] == ['b-c', 'a-b', 'c-a']
+
+
+def test_connect():
+    m = Model()
+    m.add_locations(
+        ['htown', 'dallas', 'austin', 'ny'],
+        coords=[(29.76, -95.37), (32.78, -96.80), (30.27, -97.74), (40.71, -74.01)],
+    )
+    links = m.space.connect(radius=400)
+    assert [(l.source, l.sink) for l in links] == [
+        (m.htown, m.dallas),
+        (m.htown, m.austin),
+        (m.dallas, m.austin),
+    ]
+    # great circle distance in km
+    assert links[0].dist == pytest.approx(362, rel=0.01)
+
+    # linked locations are skipped
+    links = m.space.connect(k=1, bi=True)
+    assert [(l.source, l.sink) for l in links] == [(m.dallas, m.ny)]
+    assert m.ny.connected(m.dallas)
+    assert len(m.space.linkages) == 5
+
+    with pytest.raises(ValueError):
+        m.space.connect()
+
+
+@pytest.mark.parametrize("by", ["linkage", "transport", "location"])
+def test_locate_transport(by):
+    m = Model()
+    m.declare(Location, ['a', 'b', 'c'])
+    m.usd = Currency()
+    m.r = Resource()
+    m.add_links(['a', 'a', 'b'], ['b', 'c', 'c'], dist=[1, 2, 3])
+    m.channel = Transport()
+    _ = m.channel(m.r) == 1.0
+    for link in m.space.linkages:
+        _ = m.usd.spend(m.channel.operate, link) == 90
+    leaving = [m.a - m.b, m.a - m.c]
+
+    # a location is read as all the linkages leaving it
+    if by == "linkage":
+        m.channel.locate(*leaving)
+    elif by == "transport":
+        m.channel.locate(m.a)
+    else:
+        m.a.locate(m.channel)
+
+    assert [s for s, _ in m.channel.space_times] == leaving
@@ -72,3 +72,34 @@ def test_loc(m):
     assert not m.earth.isin
 
     assert list(m.usa.all()) == [m.cali, m.la, m.sd, m.tx, m.cstat, m.htown]
+
+
+def test_hierarchy(m):
+    assert m.network == m.earth
+    assert m.space.hierarchy[0] == [m.earth]
+    assert m.space.hierarchy[3] == [m.htown, m.cstat, m.sd, m.la]
+    assert m.space.split(m.usa) == ([m.tx, m.cali], m.earth)
+    assert m.space.split(m.htown) == ([], m.tx)
+    assert m.space.split(m.earth) == ([m.usa, m.eu, m.ind], None)
+    assert set(m.space.descendants[m.usa]) == set(m.usa.all())
+    # compiled again as locations are added
+    m.mars = Location()
+    m.solar = m.earth + m.mars
+    assert m.network == m.solar
+    assert m.space.split(m.earth)[1] == m.solar
+    assert m.htown.hierarchy == 4
+
+
+def test_index_sets(m):
+    # grown as locations are added, frozen when read or when finalized
+    assert [i.name for i in m.program.locations] == [loc.name for loc in m.space.locations]
+    m.mars = Location()
+    assert [i.name for i in m.program.locations][-1] == 'mars'
+    m.venus = Location()
+    m.program.finalize()
+    names = [i.name for i in m.program.indices]
+    assert [loc.name for loc in m.space.locations] == [
+        n for n in names if n in {loc.name for loc in m.space.locations}
+    ]
+    assert names[-2:] == ['mars', 'venus']
+    assert [i.name for i in m.program.locations][-2:] == ['mars', 'venus']
@@ -0,0 +1,22 @@
+"""Tests for the deferred map constraint ledger"""
+
+import pytest
+
+from energia.library.examples.supply_chain import seattle_topeka
+
+
+@pytest.fixture
+def m():
+    return seattle_topeka()
+
+
+def test_deferred_maps(m):
+    # children mapped after the map constraint was written wait to be emitted
+    assert m.mappings
+    n_cons = len(m.program.constraints)
+
+    # reading the program whole writes each parent sum once
+    _ = m.program.cons()
+    assert not m.mappings
+    # the constraints are updated in place, not added again
+    assert len(m.program.constraints) == n_cons
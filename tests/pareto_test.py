@@ -0,0 +1,31 @@
+"""Tests for the epsilon-constraint Pareto front"""
+
+import pytest
+
+from energia.library.examples.energy import supermarket
+
+
+@pytest.fixture
+def m():
+    return supermarket()
+
+
+def test_pareto(m):
+    front = m.pareto([m.usd.spend, m.co2_vent.release], points=4, outputs=[m.capacity])
+    assert len(front) == 4
+    assert list(front.columns[:2]) == ["usd.spend", "co2_vent.release"]
+    assert "capacity(st,supermarket,t0[0])" in front.columns
+    # release is bounded between its ideal and nadir value
+    assert front["co2_vent.release"].min() == pytest.approx(1799.9856001151993)
+    assert front["usd.spend"].min() == pytest.approx(167714.31528571434)
+
+
+def test_pareto_parallel(m):
+    serial = m.pareto([m.usd.spend, m.co2_vent.release], points=3)
+    parallel = m.pareto([m.usd.spend, m.co2_vent.release], points=3, workers=2)
+    assert parallel.values == pytest.approx(serial.values)
+
+
+def test_pareto_one_objective(m):
+    with pytest.raises(ValueError):
+        m.pareto([m.usd.spend])
@@ -0,0 +1,113 @@
+"""Tests for batched evaluation of multiparametric solutions"""
+
+import dill
+import numpy as np
+import pytest
+from ppopt.mp_solvers.solve_mpqp import mpqp_algorithm, solve_mpqp
+from ppopt.mplp_program import MPLP_Program
+
+from energia import Model
+from energia.represent.ations.regions import BoxTree, Regions
+
+
+@pytest.fixture
+def solution():
+    # min -3x1 - 8x2
+    # s.t. x1 + x2 <= 13 + θ1, 5x1 - 4x2 <= 20, -8x1 + 22x2 <= 121 + θ2, 4x1 + x2 >= 8
+    A = np.array([[1, 1], [5, -4], [-8, 22], [-4, -1], [-1, 0], [0, -1]], dtype=float)
+    b = np.array([[13], [20], [121], [-8], [0], [0]], dtype=float)
+    F = np.array([[1, 0], [0, 0], [0, 1], [0, 0], [0, 0], [0, 0]], dtype=float)
+    c = np.array([[-3], [-8]], dtype=float)
+    A_t = np.array([[-1, 0], [0, -1], [1, 0], [0, 1]], dtype=float)
+    b_t = np.array([[0], [0], [100], [100]], dtype=float)
+    program = MPLP_Program(A, b, c, np.zeros((2, 2)), A_t, b_t, F)
+    return solve_mpqp(program, mpqp_algorithm.combinatorial)
+
+
+def test_evaluate(solution):
+    thetas = np.random.default_rng(0).uniform(-10, 100, (500, 2))
+    regions = Regions(solution, chunk=64)
+    x = regions.evaluate(thetas)
+
+    for theta, row in zip(thetas, x):
+        expected = solution.evaluate(theta.reshape(-1, 1))
+        if expected is None:
+            assert np.isnan(row).all()
+        else:
+            assert row == pytest.approx(expected.ravel())
+
+
+def test_evaluate_many(solution):
+    thetas = np.random.default_rng(1).uniform(0, 100, (200, 2))
+    regions = Regions(solution, chunk=16)
+    assert np.allclose(
+        regions.evaluate_many(thetas, workers=2), regions.evaluate(thetas)
+    )
+
+
+def test_eval_many_thetas():
+    m = Model()
+    with pytest.raises(ValueError):
+        m.eval_many(np.zeros((3, 2)))
+
+
+def test_locate_point(solution):
+    regions = Regions(solution)
+    for theta in np.random.default_rng(2).uniform(-10, 100, (300, 2)):
+        region = solution.get_region(theta.reshape(-1, 1))
+        located = regions.locate_point(theta)
+        if region is None:
+            assert located == -1
+        else:
+            assert solution.critical_regions[located] is region
+
+
+def test_boxes(solution):
+    regions = Regions(solution)
+    assert (regions.lo <= regions.hi).all()
+    thetas = np.random.default_rng(3).uniform(0, 100, (300, 2))
+    for theta, r in zip(thetas, regions.locate(thetas)):
+        if r >= 0:
+            assert (regions.lo[r] - 1e-6 <= theta).all()
+            assert (theta <= regions.hi[r] + 1e-6).all()
+
+
+def test_serialized(solution):
+    regions = Regions(solution)
+    solution.regions = regions
+    loaded = dill.loads(dill.dumps(solution))
+    theta = np.array([20.0, 50.0])
+    assert loaded.regions.locate_point(theta) == regions.locate_point(theta)
+    assert np.allclose(loaded.regions.lo, regions.lo)
+
+
+def test_box_tree():
+    # a 64 x 64 grid of disjoint boxes
+    side = 64
+    i, j = np.meshgrid(np.arange(side), np.arange(side), indexing='ij')
+    lo = np.column_stack([i.ravel(), j.ravel()]).astype(float)
+    tree = BoxTree(lo, lo + 1)
+
+    visits = []
+    for point in np.random.default_rng(4).uniform(0, side, (200, 2)):
+        found = tree.query(point, point)
+        assert list(found) == [int(point[0]) * side + int(point[1])]
+        visits.append(tree.visited)
+    # a lookup descends the tree, it does not scan the boxes
+    assert max(visits) <= 4 * np.log2(side * side)
+
+    # boxes that meet a box
+    assert list(tree.query(np.array([0.5, 0.5]), np.array([1.5, 0.5]))) == [0, side]
+
+
+def test_locate_prefiltered(solution):
+    # a chunk only checks the regions whose box meets its own
+    regions = Regions(solution, chunk=8)
+    thetas = np.random.default_rng(5).uniform(0, 100, (64, 2))
+    located = regions.locate(thetas)
+    for theta, r in zip(thetas, located):
+        assert r == regions.locate_point(theta)
+    # points outside every box check no region at all
+    outside = np.full(2, -5.0)
+    assert not len(regions.tree.query(outside, outside, regions.tol))
+    assert (regions.locate(np.full((3, 2), -5.0)) == -1).all()
@@ -0,0 +1,98 @@
+"""Tests for the rolling horizon"""
+
+import logging
+
+import numpy as np
+import pytest
+
+from energia import Currency, Model, Periods, Process, Resource, Storage
+from energia.represent.ations.rolling import rolling, windows
+
+DEMAND = [0.5, 0.6, 0.7, 0.3]
+
+
+@pytest.fixture
+def m(build):
+    _m = build(DEMAND, 49)
+    _m.usd.spend.obj()
+    return _m
+
+
+def test_windows():
+    assert windows(4, 4) == [(0, 4, 4)]
+    assert windows(4, 2) == [(0, 2, 2), (2, 4, 4)]
+    assert windows(4, 2, 1) == [(0, 1, 2), (1, 2, 3), (2, 4, 4)]
+    with pytest.raises(ValueError):
+        windows(4, 2, 2)
+
+
+def test_whole_horizon(m, build):
+    # a single window is the monolithic program
+    assert m.rolling(window=4) == (m.program, "highs (rolling over q, window of 4)")
+    rebuilt = build(DEMAND, 49)
+    rebuilt.usd.spend.opt(using="highs")
+    assert m.program.obj() == pytest.approx(rebuilt.program.obj())
+    assert m.solution[0]._["inventory"]["values"] == pytest.approx(
+        rebuilt.solution[0]._["inventory"]["values"]
+    )
+
+
+def test_overlapping_windows(m, build):
+    x, objective = rolling(m.program, m.q, window=2, overlap=1)
+    sparse = m.program.sparse()
+
+    # the stitched solution is feasible for the whole horizon
+    Ax = sparse.A @ x
+    assert np.all(Ax <= sparse.row_ub + 1e-6)
+    assert np.all(Ax >= sparse.row_lb - 1e-6)
+
+    rebuilt = build(DEMAND, 49)
+    rebuilt.usd.spend.opt(using="highs")
+    assert objective >= rebuilt.program.obj() - 1e-6
+
+
+def test_infeasible_window(m):
+    # without overlap, storage is not charged ahead of the third quarter
+    assert m.rolling(window=2) is False
+    assert not m.program.optimized
+
+
+def test_long_horizon(caplog):
+    # an hourly year, each window slices only the periods near it
+    hours = 8760
+    m = Model("long")
+    m.h = Periods()
+    m.y = hours * m.h
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind"])
+    _ = m.wind.consume <= 1e6
+    _ = m.power.release.prep(80) >= list(
+        0.5 + 0.2 * np.sin(np.arange(hours) / 24 * 2 * np.pi),
+    )
+    m.wf = Process()
+    _ = m.wf(m.power) == -1 * m.wind
+    _ = m.wf.capacity.x <= 100
+    _ = m.wf.capacity.x >= 10
+    _ = m.wf.operate.prep(norm=True) <= [0.9] * hours
+    _ = m.usd.spend(m.wf.capacity) == 1000
+    _ = m.usd.spend(m.wf.operate) == 49
+    m.lii = Storage()
+    _ = m.lii(m.power) == 0.9
+    _ = m.lii.capacity.x <= 100
+    _ = m.lii.capacity.x >= 10
+    _ = m.usd.spend(m.lii.capacity) == 1300
+    _ = m.usd.spend(m.lii.inventory) == 1
+    m.network.locate(m.wf, m.lii)
+    m.usd.spend.obj()
+
+    with caplog.at_level(logging.INFO, logger="energia"):
+        assert m.rolling(window=168) == (
+            m.program,
+            "highs (rolling over h, window of 168)",
+        )
+
+    solved = [r.created for r in caplog.records if r.getMessage().startswith("🪟")]
+    assert len(solved) == len(windows(hours, 168))
+    # time per window stays flat along the horizon
+    took = np.diff(solved)
+    assert np.median(took[-10:]) < 2 * np.median(took[:10])
@@ -0,0 +1,122 @@
+"""Tests for updating binds in place"""
+
+import pytest
+
+from energia.represent.ations.workers import held, spawn
+from energia.utils import functions
+
+
+@pytest.mark.parametrize("using", ["highs", "gurobi"])
+def test_set(using, build):
+    m = build([0.6, 0.7, 0.8, 0.3], 49)
+    m.warm = True
+    m.usd.spend.opt(using=using)
+    n_cons = len(m.program.constraints)
+
+    m.scenario.set(m.power.release.prep(180), "lb", [0.5, 0.9, 0.8, 0.4])
+    m.scenario.set(m.usd.spend(m.wf.operate), "calc", 30000)
+    assert len(m.program.constraints) == n_cons
+
+    m.usd.spend.opt(using=using)
+
+    rebuilt = build([0.5, 0.9, 0.8, 0.4], 30000)
+    rebuilt.usd.spend.opt(using=using)
+
+    assert m.solution[1]._["release"]["values"] == pytest.approx(
+        rebuilt.solution[0]._["release"]["values"]
+    )
+    assert sum(m.solution[1]._["spend"]["values"]) == pytest.approx(
+        sum(rebuilt.solution[0]._["spend"]["values"])
+    )
+    assert sum(m.solution[1]._["spend"]["values"]) != pytest.approx(
+        sum(m.solution[0]._["spend"]["values"])
+    )
+
+
+def test_set_cold(build):
+    # without warm starts, the refreshed program is written for gurobi again
+    m = build([0.6, 0.7, 0.8, 0.3], 49)
+    m.usd.spend.opt(using="gurobi")
+
+    m.scenario.set(m.power.release.prep(180), "lb", [0.5, 0.9, 0.8, 0.4])
+    m.scenario.set(m.usd.spend(m.wf.operate), "calc", 30000)
+    m.usd.spend.opt(using="gurobi")
+
+    rebuilt = build([0.5, 0.9, 0.8, 0.4], 30000)
+    rebuilt.usd.spend.opt(using="gurobi")
+
+    assert sum(m.solution[1]._["spend"]["values"]) == pytest.approx(
+        sum(rebuilt.solution[0]._["spend"]["values"])
+    )
+    assert m.solution[1]._["release"]["values"] == pytest.approx(
+        rebuilt.solution[0]._["release"]["values"]
+    )
+
+
+def test_set_unbound(build):
+    m = build([0.6, 0.7, 0.8, 0.3], 49)
+    with pytest.raises(ValueError):
+        m.scenario.set(m.power.release, "ub", [1, 1, 1, 1])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_scenarios(workers, build):
+    m = build([0.6, 0.7, 0.8, 0.3], 49)
+    m.usd.spend.obj()
+    demands = [[0.6, 0.7, 0.8, 0.3], [0.5, 0.9, 0.8, 0.4]]
+    prices = [49, 30000]
+
+    results = m.run_scenarios(
+        {
+            n: {
+                (m.power.release.prep(180), "lb"): demand,
+                (m.usd.spend(m.wf.operate), "calc"): price,
+            }
+            for n, (demand, price) in enumerate(zip(demands, prices), start=10)
+        },
+        workers=workers,
+    )
+    # the model is left as it is, and nothing is held after
+    assert not m.solution
+    assert "compiled" not in held
+
+    assert list(results.solutions) == [10, 11]
+    for row, (demand, price) in enumerate(zip(demands, prices)):
+        rebuilt = build(demand, price)
+        rebuilt.usd.spend.opt(using="highs")
+        assert results("release")[row] == pytest.approx(
+            rebuilt.solution[0]._["release"]["values"]
+        )
+        assert results[10 + row]["spend"]["values"].sum() == pytest.approx(
+            sum(rebuilt.solution[0]._["spend"]["values"])
+        )
+
+
+def test_spawn_serial():
+    # held while serial, and let go on exit, nested runs included
+    with spawn(1, {"compiled": 1}) as pool:
+        assert pool is None
+        with spawn(1, {"compiled": 2}):
+            assert held["compiled"] == 2
+        assert held["compiled"] == 1
+    assert "compiled" not in held
+
+
+def test_zero_coefficient(build):
+    # a price of zero drops the variable from the row, it can not be updated
+    m = build([0.6, 0.7, 0.8, 0.3], 0)
+    m.usd.spend.obj()
+    with pytest.raises(ValueError, match="zero"):
+        m.run_scenarios([{(m.usd.spend(m.wf.operate), "calc"): 30000}])
+    with pytest.raises(ValueError, match="zero"):
+        m.scenario.set(m.usd.spend(m.wf.operate), "calc", 30000)
+
+
+def test_set_other_gana(monkeypatch, build):
+    # constraints are only updated in place for the gana they were checked against
+    m = build([0.6, 0.7, 0.8, 0.3], 49)
+    monkeypatch.setattr(functions, "version", lambda _: "0.0.0")
+    functions._checked.cache_clear()
+    with pytest.raises(RuntimeError, match=functions.GANA):
+        m.scenario.set(m.usd.spend(m.wf.operate), "calc", 30000)
+    functions._checked.cache_clear()
@@ -0,0 +1,60 @@
+"""Tests for snapshotting and restoring built models"""
+
+import sys
+
+import pytest
+
+from energia import Model
+from energia.library.examples.energy import design_scheduling
+
+
+@pytest.fixture
+def m(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return design_scheduling()
+
+
+def test_restore(m):
+    m.snapshot()
+    restored = Model.restore(f"{m.name}.snapshot")
+
+    assert restored is not m
+    assert len(restored.program.constraints) == len(m.program.constraints)
+    assert set(restored.cookbook) == set(m.cookbook)
+    assert restored.balances.keys() and (
+        {c.name for c in restored.balances} == {c.name for c in m.balances}
+    )
+
+    m.usd.spend.opt(using="highs")
+    restored.usd.spend.opt(using="highs")
+    assert restored.program.obj() == pytest.approx(m.program.obj())
+
+
+def test_restore_solved(m):
+    # the gurobi model kept for warm starts is not written
+    m.warm = True
+    m.usd.spend.opt()
+    m.snapshot("solved.snapshot")
+    restored = Model.restore("solved.snapshot")
+
+    assert restored.solution[0]._["capacity"]["values"] == pytest.approx(
+        m.solution[0]._["capacity"]["values"]
+    )
+    restored.usd.spend.opt()
+    assert restored.solution[1]._["capacity"]["values"] == pytest.approx(
+        m.solution[0]._["capacity"]["values"]
+    )
+
+
+def test_restore_build(m):
+    # nothing process-wide is changed to walk the model
+    limit = sys.getrecursionlimit()
+    m.snapshot()
+    restored = Model.restore(f"{m.name}.snapshot")
+    assert sys.getrecursionlimit() == limit
+
+    # the restored model is built on as the original
+    for _m in (m, restored):
+        _ = _m.wf.capacity <= 100
+        _m.usd.spend.opt(using="highs")
+    assert restored.program.obj() == pytest.approx(m.program.obj())
@@ -0,0 +1,50 @@
+"""Tests for the compiled (sparse) form of the program"""
+
+import numpy as np
+import pytest
+
+from energia.library.examples.energy import design_scheduling
+from energia.represent.ations.sparse import Sparse
+
+
+@pytest.fixture
+def m():
+    return design_scheduling()
+
+
+def test_compile(m):
+    s = m.compile()
+    p = m.program
+    rows = p.leqcons() + p.eqcons()
+    assert s.shape == (len(rows), len(p.variables))
+    assert m.compiled is s
+
+    # rows read back to the constraints they were compiled from
+    for cons in rows[:5]:
+        n = s.row_index[cons.name]
+        assert s.rows[n] is cons
+        assert np.isclose(s.row_ub[n], cons.B)
+        for col, a in cons.matrix.items():
+            assert s.A[n, col] == pytest.approx(a)
+
+    assert (s.eq == np.array([not c.leq for c in rows])).all()
+    assert s.integrality.sum() == len(p.bnrvars())
+
+
+def test_compile_categories(m):
+    s = m.compile(("Binds",))
+    assert {c.category for c in s.rows} == {"Binds"}
+    assert s.shape[1] == len(m.program.variables)
+
+
+def test_objective_sign(m):
+    minimize = m.usd.spend.objective()
+    maximize = m.usd.spend.objective(maximize=True)
+    s = m.compile()
+    c_min = Sparse.objective(minimize, s.shape[1])
+    c_max = Sparse.objective(maximize, s.shape[1])
+    # minimized as is, maximized as the negative
+    assert c_min.any()
+    assert (c_max == -c_min).all()
+    for p, a in zip(minimize.P, minimize.C):
+        assert c_min[p] == pytest.approx(a)
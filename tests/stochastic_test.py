@@ -0,0 +1,78 @@
+"""Tests for two-stage stochastic programs"""
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from energia.represent.ations.stochastic import _recourse
+from energia.represent.ations.workers import spawn
+from energia.represent.classifiers import Uncertainty
+
+DEMANDS = [[0.6, 0.7, 0.8, 0.3], [0.3, 0.9, 0.8, 0.6]]
+
+
+@pytest.fixture
+def m(build):
+    _m = build(DEMANDS[0], 49)
+    _m.usd.spend.obj()
+    return _m
+
+
+@pytest.fixture
+def scenarios(m):
+    return [{(m.power.release.prep(180), "lb"): demand} for demand in DEMANDS]
+
+
+def test_one_scenario(m, scenarios, build):
+    # a single scenario is the deterministic program
+    program = m.stochastic(scenarios[:1])
+    rebuilt = build(DEMANDS[0], 49)
+    rebuilt.usd.spend.opt(using="highs")
+    assert program.objective == pytest.approx(rebuilt.program.obj())
+    assert Uncertainty.STOCHASTIC in program.classifiers["uncertainty"]
+    # the model is left as it is
+    assert Uncertainty.STOCHASTIC not in m.classifiers["uncertainty"]
+
+
+def test_first_stage_shared(m, scenarios):
+    program = m.stochastic(scenarios, probabilities=[0.3, 0.7])
+    capacity = program.solution("capacity")
+    assert capacity[0] == pytest.approx(capacity[1])
+    # each scenario meets its own demand
+    release = program.solution("release")
+    assert (release[0] != pytest.approx(release[1]))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_benders(m, scenarios, workers):
+    equivalent = m.stochastic(scenarios)
+    benders = m.stochastic(scenarios, benders=True, workers=workers)
+    assert benders.objective == pytest.approx(equivalent.objective, rel=1e-6)
+
+
+def test_probabilities(m, scenarios):
+    with pytest.raises(ValueError):
+        m.stochastic(scenarios, probabilities=[0.5, 0.6])
+
+
+def _held_recourse(c, A_F, A_S, row_ub, lb, ub):
+    """Solves a recourse program of one scenario, held as in benders"""
+    A_F, A_S = csr_matrix(A_F, dtype=float), csr_matrix(A_S, dtype=float)
+    row_ub = np.array(row_ub, dtype=float)
+    recourse = (np.array(c, dtype=float), A_F, A_S, -np.inf * row_ub, row_ub, lb, ub)
+    with spawn(1, {"recourses": {0: recourse}}):
+        return _recourse((0, np.array([1.0])))
+
+
+def test_recourse_status():
+    # y + x <= 1 with y >= 2 is infeasible, the infeasibility gives the cut
+    feasible, infeasibility, cut, y = _held_recourse(
+        [1], [[1]], [[1]], [1], np.array([2.0]), np.array([np.inf])
+    )
+    assert not feasible and y is None
+    assert infeasibility == pytest.approx(2)
+    assert cut == pytest.approx([1])
+
+    # min -y with y unbounded gives no cut
+    with pytest.raises(ValueError, match="could not be solved"):
+        _held_recourse([-1], [[1]], [[0]], [5], np.array([0.0]), np.array([np.inf]))
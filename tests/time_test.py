@@ -95,3 +95,18 @@ def test_period(m):
 
     with pytest.raises(ValueError):
         m.y.howmany(m.s)
+
+
+def test_tree():
+    m = Model()
+    m.h = Periods()
+    m.d = m.h * 24
+    m.y = m.d * 365
+    m.w = m.d * 7
+    assert m.time.sorted_periods == [m.h, m.d, m.w, m.y]
+    assert m.time.tree == {8760: m.h, 365: m.d, 52: m.w, 1: m.y}
+    # compiled again as periods are added
+    m.q = m.d * 90
+    assert m.time.sorted_periods == [m.h, m.d, m.w, m.q, m.y]
+    assert m.time.tree[4] == m.q
+    assert m.y > m.q > m.d
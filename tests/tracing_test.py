@@ -0,0 +1,67 @@
+"""Tests for build tracing"""
+
+import logging
+
+import pytest
+
+from energia import Currency, Model, Periods, Process, Resource
+from energia.library.examples.energy import scheduling
+from energia.utils.decorators import timer
+
+
+@pytest.fixture
+def m():
+    m = Model("traced", trace=True)
+    m.q = Periods()
+    m.y = 4 * m.q
+    m.usd = Currency()
+    m.wind, m.power = Resource(), Resource()
+    _ = m.wind.consume <= 400
+    _ = m.power.release.prep(100) >= [0.6, 0.7, 1, 0.3]
+    m.wf = Process()
+    _ = m.wf(m.power) == -1 * m.wind
+    _ = m.wf.operate.prep(200, norm=False) <= [0.9, 0.8, 0.5, 0.7]
+    _ = m.usd.spend(m.wf.operate) == [4000, 4200, 4300, 3900]
+    m.network.locate(m.wf)
+    return m
+
+
+def test_opt_in():
+    # nothing is traced unless asked for
+    m = scheduling()
+    assert not m.tracer.enabled
+    assert not m.tracer.counts
+
+
+def test_build_report(m):
+    report = m.build_report()
+    assert report["bind"]["count"] > 0
+    assert report["locate"]["count"] == 1
+    assert sum(r["share"] for r in report.values()) == pytest.approx(1)
+
+
+def test_tracer_events(m):
+    # no events are kept by default
+    assert m.tracer.events is None
+    m.tracer.keep(2)
+    _ = m.wind.consume(m.network, m.q) <= 1000
+    # the ring buffer keeps only the most recent events
+    assert len(m.tracer.events) == 2
+    assert m.tracer.events[-1].kind == "bind"
+
+    m.tracer.clear()
+    assert not m.tracer.counts and not m.tracer.events
+
+
+@pytest.mark.parametrize("level", [logging.DEBUG, logging.CRITICAL])
+def test_timer_returns(level):
+    # the result is returned whether it is logged or not
+    logger = logging.getLogger("energia.test")
+    logger.setLevel(level)
+
+    @timer(logger, kind="test", level=logging.INFO)
+    def traced(_, x):
+        return x
+
+    assert traced(None, 1) == 1
+    assert traced(None, False) is False
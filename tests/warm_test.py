@@ -0,0 +1,37 @@
+"""Tests for warm started re-optimization over sequential objectives"""
+
+import pytest
+
+from energia.library.examples.energy import supermarket
+
+
+@pytest.fixture(params=["gurobi", "highs"])
+def m(request):
+    _m = supermarket()
+    _m.solver = request.param
+    _m.warm = True
+    return _m
+
+
+def test_warm_moo(m):
+    m.usd.spend.opt()
+    solver_model = m.formulation[0]
+    m.co2_vent.release.opt()
+    m._.lb(sum(m._.consume))
+
+    # the solver model (or sparse form) is built once and re-used
+    assert all(m.formulation[n] is solver_model for n in range(3))
+    assert [o.X for o in m.program.objectives] == pytest.approx(
+        [167714.31528571434, 1799.9856001151993, 32.14260000205713]
+    )
+    assert m.solution[2]._['consume']['values'] == pytest.approx(
+        [0.0, 0.0, 32.14260000205713, 0.0, 0.0]
+    )
+
+
+def test_warm_invalidated(m):
+    m.usd.spend.opt()
+    assert m.program.cache
+    # a new constraint changes the structure, the compiled forms are dropped
+    _ = m.co2_vent.release(m.network, m.horizon) <= 2000
+    assert not m.program.cache